@@ -15,13 +15,16 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from app.config import settings
 from app.database import Base
-from app.models import User, DailyEntry  # noqa - Import models for autogenerate
+from app.models import (  # noqa - Import models for autogenerate
+    User, DailyEntry, UserRollup, UserMonthlyRollup, NoteTerm, NoteTermDaily, DataReset, BackgroundJob,
+    SystemDailyStats, SystemStatsDirtyDay, SignupCohort, CohortRetention,
+)
 
 # this is the Alembic Config object
 config = context.config
 
 # Override sqlalchemy.url with our DATABASE_URL from .env
-config.set_main_option("sqlalchemy.url", settings.database_url)
+config.set_main_option("sqlalchemy.url", settings.async_database_url)
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
@@ -56,7 +59,7 @@ def do_run_migrations(connection: Connection) -> None:
 async def run_async_migrations() -> None:
     """Run migrations in async mode."""
     configuration = config.get_section(config.config_ini_section, {})
-    configuration["sqlalchemy.url"] = settings.database_url
+    configuration["sqlalchemy.url"] = settings.async_database_url
 
     connectable = async_engine_from_config(
         configuration,
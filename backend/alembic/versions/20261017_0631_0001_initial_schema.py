@@ -0,0 +1,68 @@
+"""initial schema
+
+The original users and daily_entries tables, as created by create_tables.py
+before rollups and the term index existed. Databases that were set up with
+that script already have this schema; mark them with `alembic stamp 0001`
+and upgrade from there.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 06:31:10.935665+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('supabase_user_id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_entry_date', sa.Date(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_last_entry_date'), 'users', ['last_entry_date'], unique=False)
+    op.create_index(op.f('ix_users_supabase_user_id'), 'users', ['supabase_user_id'], unique=True)
+    op.create_table('daily_entries',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('entry_date', sa.Date(), nullable=False),
+    sa.Column('casual_leisure_hours', sa.Float(), nullable=False),
+    sa.Column('casual_leisure_note', sa.String(), nullable=True),
+    sa.Column('serious_leisure_hours', sa.Float(), nullable=False),
+    sa.Column('serious_leisure_note', sa.String(), nullable=True),
+    sa.Column('project_leisure_hours', sa.Float(), nullable=False),
+    sa.Column('project_leisure_note', sa.String(), nullable=True),
+    sa.Column('total_hours', sa.Float(), sa.Computed('casual_leisure_hours + serious_leisure_hours + project_leisure_hours'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.CheckConstraint('casual_leisure_hours + serious_leisure_hours + project_leisure_hours > 0', name='total_hours_positive'),
+    sa.CheckConstraint('casual_leisure_hours >= 0', name='casual_hours_positive'),
+    sa.CheckConstraint('project_leisure_hours >= 0', name='project_hours_positive'),
+    sa.CheckConstraint('serious_leisure_hours >= 0', name='serious_hours_positive'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'entry_date', name='unique_user_date')
+    )
+    op.create_index(op.f('ix_daily_entries_entry_date'), 'daily_entries', ['entry_date'], unique=False)
+    op.create_index(op.f('ix_daily_entries_user_id'), 'daily_entries', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_daily_entries_user_id'), table_name='daily_entries')
+    op.drop_index(op.f('ix_daily_entries_entry_date'), table_name='daily_entries')
+    op.drop_table('daily_entries')
+    op.drop_index(op.f('ix_users_supabase_user_id'), table_name='users')
+    op.drop_index(op.f('ix_users_last_entry_date'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
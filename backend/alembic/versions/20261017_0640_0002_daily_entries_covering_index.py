@@ -0,0 +1,66 @@
+"""daily_entries covering index
+
+Adds (user_id, entry_date DESC) INCLUDE (hour columns) so per-user date-range
+queries (overview, trends, history totals) are index-only scans. Built with
+CREATE INDEX CONCURRENTLY, which can't run inside a transaction, so it runs in
+an autocommit block and does not lock out entry writes while it builds.
+
+Index-only scans also need the visibility map to be current; autovacuum keeps
+it up to date, or run `VACUUM (ANALYZE) daily_entries` after a large import.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 06:40:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'idx_daily_entries_user_date_hours'
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index behind; drop it so the
+        # migration can simply be re-run
+        invalid = op.get_bind().execute(
+            sa.text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ),
+            {"name": INDEX_NAME}
+        ).first()
+        if invalid:
+            op.drop_index(INDEX_NAME, table_name='daily_entries', postgresql_concurrently=True)
+
+        op.create_index(
+            INDEX_NAME,
+            'daily_entries',
+            ['user_id', sa.text('entry_date DESC')],
+            unique=False,
+            postgresql_include=[
+                'casual_leisure_hours',
+                'serious_leisure_hours',
+                'project_leisure_hours',
+                'total_hours',
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name='daily_entries',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,28 @@
+"""users data_version
+
+Per-user counter bumped on every entry write; read endpoints derive their
+ETag from it. Adding a NOT NULL column with a constant default is a
+metadata-only change on PostgreSQL 11+.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 07:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,97 @@
+"""reset generations and data reset jobs
+
+Resets hide entries by bumping users.reset_generation; daily_entries gets
+the generation each row was written in, and data_resets tracks the
+background purge of hidden rows. Both new columns are NOT NULL with a
+constant default, a metadata-only change on PostgreSQL 11+.
+
+The covering index is rebuilt with reset_generation included so filtered
+per-user reads stay index-only: the new index is built CONCURRENTLY before
+the old one (from 0002) is dropped, so reads are never without one.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 07:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+OLD_INDEX = 'idx_daily_entries_user_date_hours'
+NEW_INDEX = 'idx_daily_entries_user_date_live'
+HOUR_COLUMNS = ['casual_leisure_hours', 'serious_leisure_hours', 'project_leisure_hours', 'total_hours']
+
+
+def _build_index(name: str, include: list) -> None:
+    """CREATE INDEX CONCURRENTLY, dropping an INVALID leftover of a failed build first."""
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name}
+    ).first()
+    if invalid:
+        op.drop_index(name, table_name='daily_entries', postgresql_concurrently=True)
+
+    op.create_index(
+        name,
+        'daily_entries',
+        ['user_id', sa.text('entry_date DESC')],
+        unique=False,
+        postgresql_include=include,
+        postgresql_concurrently=True,
+        if_not_exists=True,
+    )
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('reset_generation', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('daily_entries', sa.Column('reset_generation', sa.Integer(), server_default='0', nullable=False))
+    op.create_table(
+        'data_resets',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('reset_generation', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('total_entries', sa.Integer(), nullable=False),
+        sa.Column('deleted_entries', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_data_resets_user_id'), 'data_resets', ['user_id'], unique=False)
+    op.create_index(
+        'idx_data_resets_active',
+        'data_resets',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'running')")
+    )
+
+    with op.get_context().autocommit_block():
+        _build_index(NEW_INDEX, HOUR_COLUMNS + ['reset_generation'])
+        op.drop_index(OLD_INDEX, table_name='daily_entries', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _build_index(OLD_INDEX, HOUR_COLUMNS)
+        op.drop_index(NEW_INDEX, table_name='daily_entries', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_index('idx_data_resets_active', table_name='data_resets', postgresql_where=sa.text("status IN ('pending', 'running')"))
+    op.drop_index(op.f('ix_data_resets_user_id'), table_name='data_resets')
+    op.drop_table('data_resets')
+    op.drop_column('daily_entries', 'reset_generation')
+    op.drop_column('users', 'reset_generation')
@@ -0,0 +1,61 @@
+"""background jobs
+
+Durable queue for the in-process job runner (app/services/job_runner.py).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 08:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('queue', sa.String(length=32), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('dedupe_key', sa.String(length=128), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_background_jobs_due',
+        'background_jobs',
+        ['queue', 'run_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        'uq_background_jobs_active_dedupe',
+        'background_jobs',
+        ['dedupe_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+    op.create_index('idx_background_jobs_finished', 'background_jobs', ['finished_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_background_jobs_finished', table_name='background_jobs')
+    op.drop_index('uq_background_jobs_active_dedupe', table_name='background_jobs', postgresql_where=sa.text("status IN ('queued', 'running')"))
+    op.drop_index('idx_background_jobs_due', table_name='background_jobs', postgresql_where=sa.text("status = 'queued'"))
+    op.drop_table('background_jobs')
@@ -0,0 +1,64 @@
+"""system stats and cohorts
+
+Precomputed system-wide daily stats and weekly signup-cohort retention for
+the admin dashboard, plus the dirty-day marks that drive their incremental
+refresh. Run `python rebuild_system_stats.py` once to backfill.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 08:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'system_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('active_users', sa.Integer(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('casual_total', sa.Float(), nullable=False),
+        sa.Column('serious_total', sa.Float(), nullable=False),
+        sa.Column('project_total', sa.Float(), nullable=False),
+        sa.Column('new_users', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table(
+        'system_stats_dirty_days',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table(
+        'signup_cohorts',
+        sa.Column('cohort_week', sa.Date(), nullable=False),
+        sa.Column('users', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('cohort_week')
+    )
+    op.create_table(
+        'cohort_retention',
+        sa.Column('cohort_week', sa.Date(), nullable=False),
+        sa.Column('week_offset', sa.Integer(), nullable=False),
+        sa.Column('active_users', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('cohort_week', 'week_offset')
+    )
+    op.create_index(op.f('ix_users_created_at'), 'users', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_created_at'), table_name='users')
+    op.drop_table('cohort_retention')
+    op.drop_table('signup_cohorts')
+    op.drop_table('system_stats_dirty_days')
+    op.drop_table('system_daily_stats')
@@ -0,0 +1,91 @@
+"""rollup and term index tables
+
+Per-user rollups (user_rollups, user_monthly_rollups) and the admin word
+cloud's term index (note_terms, note_term_daily), which the initial revision
+doesn't include. Rollups are backfilled here from live entries; run
+`python rebuild_term_index.py` once to backfill the term index (notes are
+tokenized in Python). Tables that already exist are left alone.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Entries hidden by a reset (awaiting purge) are not counted
+ROLLUP_BACKFILL = """
+INSERT INTO {table} (user_id, {group_columns}entry_count, casual_total, serious_total, project_total)
+SELECT e.user_id, {group_values}count(*), sum(e.casual_leisure_hours),
+       sum(e.serious_leisure_hours), sum(e.project_leisure_hours)
+FROM daily_entries e JOIN users u ON u.id = e.user_id AND e.reset_generation = u.reset_generation
+GROUP BY e.user_id{group_by}
+"""
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'note_term_daily' not in existing:
+        op.create_table('note_term_daily',
+        sa.Column('category', sa.String(length=16), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('term', sa.String(length=64), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('category', 'day', 'term')
+        )
+    if 'note_terms' not in existing:
+        op.create_table('note_terms',
+        sa.Column('category', sa.String(length=16), nullable=False),
+        sa.Column('term', sa.String(length=64), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('last_seen', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('category', 'term')
+        )
+        op.create_index('idx_note_terms_category_count', 'note_terms', ['category', 'count'], unique=False)
+    if 'user_monthly_rollups' not in existing:
+        op.create_table('user_monthly_rollups',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('casual_total', sa.Float(), nullable=False),
+        sa.Column('serious_total', sa.Float(), nullable=False),
+        sa.Column('project_total', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'month')
+        )
+        op.execute(ROLLUP_BACKFILL.format(
+            table='user_monthly_rollups',
+            group_columns='month, ',
+            group_values="date_trunc('month', e.entry_date)::date, ",
+            group_by=", date_trunc('month', e.entry_date)",
+        ))
+    if 'user_rollups' not in existing:
+        op.create_table('user_rollups',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('casual_total', sa.Float(), nullable=False),
+        sa.Column('serious_total', sa.Float(), nullable=False),
+        sa.Column('project_total', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+        )
+        op.execute(ROLLUP_BACKFILL.format(table='user_rollups', group_columns='', group_values='', group_by=''))
+
+
+def downgrade() -> None:
+    op.drop_table('user_rollups')
+    op.drop_table('user_monthly_rollups')
+    op.drop_index('idx_note_terms_category_count', table_name='note_terms')
+    op.drop_table('note_terms')
+    op.drop_table('note_term_daily')
@@ -2,74 +2,153 @@
 Admin API endpoints for system-wide analytics.
 Requires admin password authentication.
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, func, tuple_
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Union
+from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_read_db, pool_metrics, read_router
 from app.dependencies import verify_admin_password
 from app.models.user import User
 from app.models.daily_entry import DailyEntry
-from app.schemas.admin import UserStatsResponse, WordCloudResponse
+from app.models.user_rollup import UserRollup
+from app.models.background_job import BackgroundJob
+from app.models.system_stats import SystemDailyStats, SignupCohort, CohortRetention
+from app.schemas.admin import (
+    UserStatsResponse, WordCloudResponse, WordCloudTermsResponse, TermWeight, BackgroundJobResponse,
+    SystemDayStats, SystemDailyStatsResponse, CohortResponse
+)
+from app.services.term_index_service import term_index_service, CATEGORY_NOTES
+from app.services.user_cache import user_cache
+from app.services.stats_cache import stats_cache
+from app.services.job_runner import job_runner
+from app.services.system_stats_service import utc_today, week_start
+from app.services.live_entries import all_live_entries
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursor
+from app.utils.fast_json import fast_json_enabled, dumps, json_bytes_response
 
 
 router = APIRouter()
 
+MAX_USERS_PAGE_SIZE = 1000
+MAX_WORD_CLOUD_TERMS = 500
+MAX_DAILY_STATS_DAYS = 731
+
 
 @router.get("/users-stats", response_model=List[UserStatsResponse])
 async def get_all_users_stats(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_USERS_PAGE_SIZE, description="Page size (omit for all users)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    sort: str = Query("created_at", pattern="^(created_at|total_hours)$", description="Sort key (descending)"),
     _: None = Depends(verify_admin_password),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get statistics for all users with their entry data.
 
     Requires X-Admin-Password header for authentication.
 
+    - limit: Page size; when more users remain, X-Next-Cursor is set on the response
+    - cursor: Opaque keyset cursor for the next page
+    - sort: 'created_at' (newest first) or 'total_hours' (most hours first)
+
     Returns:
         List of user statistics including entry counts and cumulative hours
     """
-    # 1. Get all users
-    result = await db.execute(select(User).order_by(User.created_at.desc()))
-    users = result.scalars().all()
+    cursor_values = None
+    if cursor:
+        try:
+            sort_value, cursor_id = decode_cursor(cursor, 2)
+            sort_value = datetime.fromisoformat(sort_value) if sort == "created_at" else float(sort_value)
+            cursor_id = UUID(cursor_id)
+        except (InvalidCursor, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        cursor_values = (sort_value, cursor_id)
+
+    fetch_limit = limit + 1 if limit else None
+
+    # 1. Select users; when sorting by signup date the page is cut here so
+    #    only that page's rollups are joined
+    users = select(User.id, User.email, User.created_at)
+    if sort == "created_at":
+        if cursor_values:
+            users = users.where(tuple_(User.created_at, User.id) < tuple_(*cursor_values))
+        users = users.order_by(User.created_at.desc(), User.id.desc()).limit(fetch_limit)
+    users = users.subquery()
+
+    # 2. Join each user's running totals (user_rollups, one row per user)
+    totals = (
+        select(
+            users.c.id.label("user_id"),
+            users.c.email,
+            users.c.created_at,
+            func.coalesce(UserRollup.entry_count, 0).label("entry_count"),
+            func.coalesce(UserRollup.casual_total, 0.0).label("casual_total"),
+            func.coalesce(UserRollup.serious_total, 0.0).label("serious_total"),
+            func.coalesce(UserRollup.project_total, 0.0).label("project_total"),
+        )
+        .select_from(users)
+        .outerjoin(UserRollup, UserRollup.user_id == users.c.id)
+        .subquery()
+    )
+    total_hours = (totals.c.casual_total + totals.c.serious_total + totals.c.project_total).label("total_hours")
+    sort_column = totals.c.created_at if sort == "created_at" else total_hours
+
+    query = select(totals, total_hours)
+    if sort == "total_hours" and cursor_values:
+        query = query.where(tuple_(total_hours, totals.c.user_id) < tuple_(*cursor_values))
+    query = query.order_by(sort_column.desc(), totals.c.user_id.desc()).limit(fetch_limit)
+
+    result = await db.execute(query)
+    rows = result.all()
 
-    user_stats = []
-    for user in users:
-        # 2. Get all entries for this user
-        entries_result = await db.execute(
-            select(DailyEntry).where(DailyEntry.user_id == user.id)
+    # 3. Emit a cursor when there is another page
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            last.created_at if sort == "created_at" else last.total_hours,
+            last.user_id
         )
-        entries = entries_result.scalars().all()
-
-        # 3. Aggregate totals
-        casual_total = sum(e.casual_leisure_hours for e in entries)
-        serious_total = sum(e.serious_leisure_hours for e in entries)
-        project_total = sum(e.project_leisure_hours for e in entries)
-
-        user_stats.append(UserStatsResponse(
-            user_id=user.id,
-            email=user.email,
-            created_at=user.created_at,
-            entry_count=len(entries),
-            casual_total=casual_total,
-            serious_total=serious_total,
-            project_total=project_total,
-            total_hours=casual_total + serious_total + project_total,
-            leisure_distribution={
-                "casual": casual_total,
-                "serious": serious_total,
-                "project": project_total
+
+    users_stats = [
+        {
+            "user_id": row.user_id,
+            "email": row.email,
+            "created_at": row.created_at,
+            "entry_count": row.entry_count,
+            "casual_total": row.casual_total,
+            "serious_total": row.serious_total,
+            "project_total": row.project_total,
+            "total_hours": row.total_hours,
+            "leisure_distribution": {
+                "casual": row.casual_total,
+                "serious": row.serious_total,
+                "project": row.project_total
             }
-        ))
+        }
+        for row in rows
+    ]
+    if fast_json_enabled():
+        return json_bytes_response(dumps(users_stats), response.headers)
 
-    return user_stats
+    return [UserStatsResponse(**user_stats) for user_stats in users_stats]
 
 
-@router.get("/word-cloud-data", response_model=WordCloudResponse)
+@router.get("/word-cloud-data", response_model=Union[WordCloudResponse, WordCloudTermsResponse])
 async def get_word_cloud_data(
+    mode: str = Query("text", pattern="^(text|terms)$", description="'text' (raw notes) or 'terms' (top-N from the term index)"),
+    top_n: int = Query(100, ge=1, le=MAX_WORD_CLOUD_TERMS, description="Terms per category in 'terms' mode"),
+    start_date: Optional[date] = Query(None, description="'terms' mode: only count entries on or after this date"),
+    end_date: Optional[date] = Query(None, description="'terms' mode: only count entries on or before this date"),
     _: None = Depends(verify_admin_password),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get aggregated text from all users' notes for word cloud generation.
@@ -77,11 +156,26 @@ async def get_word_cloud_data(
 
     Requires X-Admin-Password header for authentication.
 
+    - mode=text: every note concatenated per category (original behaviour)
+    - mode=terms: the top_n most frequent terms per category with weights,
+      read from the term index, optionally limited to start_date..end_date
+
     Returns:
-        Three separate text strings, one per leisure type
+        Three separate text strings, one per leisure type, or three term lists
     """
-    # Get all entries
-    result = await db.execute(select(DailyEntry))
+    if mode == "terms":
+        categories = {}
+        for category in CATEGORY_NOTES:
+            terms = await term_index_service.top_terms(db, category, top_n, start_date, end_date)
+            top_count = terms[0][1] if terms else 0
+            categories[category] = [
+                TermWeight(term=term, count=count, weight=round(count / top_count, 4))
+                for term, count in terms
+            ]
+        return WordCloudTermsResponse(**categories, start_date=start_date, end_date=end_date)
+
+    # Get all entries (except those hidden by a reset and awaiting purge)
+    result = await db.execute(select(DailyEntry).where(all_live_entries()))
     entries = result.scalars().all()
 
     # Aggregate notes by category
@@ -106,3 +200,162 @@ async def get_word_cloud_data(
         serious_notes_count=len(serious_notes),
         project_notes_count=len(project_notes)
     )
+
+
+@router.get("/pool-stats")
+async def get_pool_stats(_: None = Depends(verify_admin_password)) -> Dict[str, Any]:
+    """
+    Get database connection pool status and checkout-time metrics, plus
+    read replica lag, routing decisions and pool (under "replica").
+
+    Requires X-Admin-Password header for authentication.
+    """
+    return {**pool_metrics.snapshot(), "replica": read_router.snapshot()}
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(_: None = Depends(verify_admin_password)) -> Dict[str, Any]:
+    """
+    Get hit ratio, size and eviction counters of the in-process caches.
+
+    Requires X-Admin-Password header for authentication.
+    """
+    return {
+        "user_cache": user_cache.stats(),
+        "statistics_cache": stats_cache.stats(),
+    }
+
+
+@router.get("/jobs/queues")
+async def get_job_queues(
+    _: None = Depends(verify_admin_password),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get background job queue depth and latency (all processes).
+    Read from the primary: a lagging replica would show finished jobs as pending.
+
+    - queued / due / running: current depth; oldest_due_seconds is how long the oldest due job has waited
+    - wait_* / run_*: p50 and p95 of queue wait and run time over jobs finished in the last hour
+
+    Requires X-Admin-Password header for authentication.
+    """
+    return await job_runner.queue_stats(db)
+
+
+@router.get("/jobs", response_model=List[BackgroundJobResponse])
+async def get_jobs(
+    _: None = Depends(verify_admin_password),
+    db: AsyncSession = Depends(get_db),
+    queue: Optional[str] = Query(None, description="Only jobs of this queue"),
+    job_status: Optional[str] = Query(
+        None, alias="status", pattern="^(queued|running|done|failed)$", description="Only jobs with this status"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Maximum jobs returned, newest first")
+):
+    """
+    List recent background jobs, e.g. ?status=failed to inspect errors.
+
+    Requires X-Admin-Password header for authentication.
+    """
+    query = select(BackgroundJob).order_by(BackgroundJob.created_at.desc()).limit(limit)
+    if queue is not None:
+        query = query.where(BackgroundJob.queue == queue)
+    if job_status is not None:
+        query = query.where(BackgroundJob.status == job_status)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+@router.get("/daily-stats", response_model=SystemDailyStatsResponse)
+async def get_daily_stats(
+    _: None = Depends(verify_admin_password),
+    db: AsyncSession = Depends(get_read_db),
+    start_date: Optional[date] = Query(None, description="First day (default: 29 days before end_date)"),
+    end_date: Optional[date] = Query(None, description="Last day (default: today, UTC)")
+):
+    """
+    Get system-wide activity per day: active users, entries, hours per category and signups.
+
+    Read from system_daily_stats, which a background job refreshes every
+    SYSTEM_STATS_INTERVAL_SECONDS.
+
+    Requires X-Admin-Password header for authentication.
+    """
+    end_date = end_date or utc_today()
+    start_date = start_date or end_date - timedelta(days=29)
+    if start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+    if (end_date - start_date).days >= MAX_DAILY_STATS_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {MAX_DAILY_STATS_DAYS} days"
+        )
+
+    result = await db.execute(
+        select(SystemDailyStats).where(SystemDailyStats.day >= start_date, SystemDailyStats.day <= end_date)
+    )
+    stored = {row.day: row for row in result.scalars()}
+
+    days = []
+    for offset in range((end_date - start_date).days + 1):
+        day = start_date + timedelta(days=offset)
+        row = stored.get(day)
+        days.append(SystemDayStats(
+            day=day,
+            active_users=row.active_users if row else 0,
+            entry_count=row.entry_count if row else 0,
+            casual_total=round(row.casual_total, 2) if row else 0.0,
+            serious_total=round(row.serious_total, 2) if row else 0.0,
+            project_total=round(row.project_total, 2) if row else 0.0,
+            total_hours=round(row.total_hours, 2) if row else 0.0,
+            new_users=row.new_users if row else 0
+        ))
+
+    return SystemDailyStatsResponse(
+        start_date=start_date,
+        end_date=end_date,
+        days=days,
+        updated_at=max((row.updated_at for row in stored.values()), default=None)
+    )
+
+
+@router.get("/cohorts", response_model=List[CohortResponse])
+async def get_cohorts(
+    _: None = Depends(verify_admin_password),
+    db: AsyncSession = Depends(get_read_db),
+    weeks: int = Query(12, ge=1, le=104, description="Signup weeks to include, ending with the current week")
+):
+    """
+    Get weekly signup cohorts and the share of each cohort with an entry in each following week.
+
+    Read from signup_cohorts and cohort_retention, which a background job
+    refreshes every SYSTEM_STATS_INTERVAL_SECONDS.
+
+    Requires X-Admin-Password header for authentication.
+    """
+    current_week = week_start(utc_today())
+    first_week = current_week - timedelta(weeks=weeks - 1)
+
+    cohorts = await db.execute(
+        select(SignupCohort).where(SignupCohort.cohort_week >= first_week).order_by(SignupCohort.cohort_week)
+    )
+    cells = await db.execute(
+        select(CohortRetention.cohort_week, CohortRetention.week_offset, CohortRetention.active_users)
+        .where(CohortRetention.cohort_week >= first_week)
+    )
+    active: Dict[Tuple[date, int], int] = {
+        (row.cohort_week, row.week_offset): row.active_users for row in cells
+    }
+
+    response = []
+    for cohort in cohorts.scalars():
+        elapsed = (current_week - cohort.cohort_week).days // 7
+        counts = [active.get((cohort.cohort_week, offset), 0) for offset in range(elapsed + 1)]
+        response.append(CohortResponse(
+            cohort_week=cohort.cohort_week,
+            users=cohort.users,
+            active_users=counts,
+            retention=[round(count / cohort.users, 4) if cohort.users else 0.0 for count in counts]
+        ))
+    return response
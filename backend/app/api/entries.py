@@ -2,27 +2,57 @@
 Daily entry API endpoints.
 Handles submission and retrieval of daily leisure activity entries.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pydantic import ValidationError
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 from math import ceil
-from app.database import get_db
+from uuid import UUID
+import csv
+import io
+import json
+import uuid
+from types import SimpleNamespace
+from app.database import get_db, read_router
 from app.models.user import User
 from app.models.daily_entry import DailyEntry
 from app.schemas.entry import (
     DailyEntryCreate,
     DailyEntryResponse,
     CanSubmitResponse,
-    EntryListResponse
+    EntryListResponse,
+    CalendarResponse,
+    BulkEntryRequest,
+    BulkEntryResult,
+    BulkEntryResponse
 )
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, check_not_modified, get_data_state, get_user_read_db
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursor
+from app.utils.bitmap import encode_presence, encode_float32
+from app.utils.fast_json import fast_json_enabled, dumps, rows_to_dicts, json_bytes_response
+from app.services.user_cache import user_cache
+from app.services.rollup_service import rollup_service
+from app.services.term_index_service import term_index_service
+from app.services.data_version_service import data_version_service, DataState
+from app.services.system_stats_service import system_stats_service
+from app.services.stats_cache import stats_cache
+from app.services.reset_service import reset_service
+from app.services.live_entries import live_entries, current_generation
 
 router = APIRouter(prefix="/entries", tags=["Daily Entries"])
 
+# Export uses the same columns, in the same order, as DailyEntryResponse
+EXPORT_COLUMNS = list(DailyEntryResponse.model_fields)
+# History and export select just these columns instead of full ORM objects
+ENTRY_COLUMNS = [getattr(DailyEntry, column) for column in EXPORT_COLUMNS]
+EXPORT_BATCH_SIZE = 500
 
-@router.get("/can-submit", response_model=CanSubmitResponse)
+
+@router.get("/can-submit", response_model=CanSubmitResponse, dependencies=[Depends(check_not_modified)])
 async def can_submit_today(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -36,7 +66,7 @@ async def can_submit_today(
     # Check if user already has an entry for today
     result = await db.execute(
         select(DailyEntry).where(
-            DailyEntry.user_id == current_user.id,
+            live_entries(current_user.id),
             DailyEntry.entry_date == today
         )
     )
@@ -79,52 +109,201 @@ async def submit_today_entry(
             detail=str(e)
         )
 
-    # Check if user already submitted for this date
-    result = await db.execute(
-        select(DailyEntry).where(
-            DailyEntry.user_id == current_user.id,
-            DailyEntry.entry_date == entry_date
+    # One statement: insert unless the date is taken. Only if the insert
+    # returned a row, the same statement also bumps the user's data version,
+    # sets last_entry_date (today's entry only) and marks the date for the
+    # system stats refresh. The unique (user_id, entry_date) constraint
+    # decides duplicates, so concurrent submissions can't both succeed.
+    entries = DailyEntry.__table__
+    new_entry = (
+        pg_insert(entries)
+        .values(
+            id=uuid.uuid4(),
+            user_id=current_user.id,
+            entry_date=entry_date,
+            casual_leisure_hours=entry_data.casual_leisure_hours,
+            casual_leisure_note=entry_data.casual_leisure_note,
+            serious_leisure_hours=entry_data.serious_leisure_hours,
+            serious_leisure_note=entry_data.serious_leisure_note,
+            project_leisure_hours=entry_data.project_leisure_hours,
+            project_leisure_note=entry_data.project_leisure_note,
+            reset_generation=current_generation(current_user.id),
         )
+        .on_conflict_do_nothing(index_elements=[entries.c.user_id, entries.c.entry_date])
+        .returning(*(entries.c[column] for column in EXPORT_COLUMNS))
+        .cte("new_entry")
     )
-    existing_entry = result.scalar_one_or_none()
+    is_today = entry_date == date.today()
+    user_values = {"last_entry_date": entry_date} if is_today else {}
+    touch_user = (
+        data_version_service.bump_statement(current_user.id, **user_values)
+        .where(exists(select(new_entry.c.id)))
+        .cte("touch_user")
+    )
+    mark_day = system_stats_service.mark_days_statement(select(new_entry.c.entry_date)).cte("mark_day")
 
-    if existing_entry:
+    try:
+        statement = select(new_entry).add_cte(touch_user, mark_day)
+        result = await db.execute(statement)
+        entry = result.one_or_none()
+        # The date may still be held by an entry hidden by a reset and not purged yet
+        if entry is None and await reset_service.purge_dates(db, current_user.id, [entry_date]):
+            result = await db.execute(statement)
+            entry = result.one_or_none()
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"You have already submitted an entry for {entry_date}. Only one entry per day is allowed."
+            )
+
+        # Keep running totals and the note term index in the same transaction as the insert
+        await rollup_service.apply_entries(db, current_user.id, [entry])
+        await term_index_service.apply_entries(db, [entry])
+        await db.commit()
+        await stats_cache.invalidate_user(current_user.id)
+        if is_today:
+            user_cache.invalidate_user(current_user.id)
+        return DailyEntryResponse.model_validate(entry)
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"You have already submitted an entry for {entry_date}. Only one entry per day is allowed."
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create entry: {str(e)}"
         )
 
-    # Create new entry
-    new_entry = DailyEntry(
-        user_id=current_user.id,
-        entry_date=entry_date,
-        casual_leisure_hours=entry_data.casual_leisure_hours,
-        casual_leisure_note=entry_data.casual_leisure_note,
-        serious_leisure_hours=entry_data.serious_leisure_hours,
-        serious_leisure_note=entry_data.serious_leisure_note,
-        project_leisure_hours=entry_data.project_leisure_hours,
-        project_leisure_note=entry_data.project_leisure_note,
-    )
 
-    db.add(new_entry)
+@router.post("/bulk", response_model=BulkEntryResponse)
+async def submit_bulk_entries(
+    request: BulkEntryRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import a batch of entries (e.g. retroactive entries from a spreadsheet).
+
+    Each item follows the same rules as POST /entries/today. Valid items are
+    inserted with INSERT ... ON CONFLICT (user_id, entry_date) DO NOTHING and
+    every item gets a result: 'accepted', 'conflict' (an entry already exists
+    for that date, or the date repeats within the batch) or 'invalid'.
+    """
+    today = date.today()
+    results = [None] * len(request.entries)
+    rows = []
+    row_indexes = []
+    seen_dates = set()
+
+    # 1. Validate each item independently
+    for index, item in enumerate(request.entries):
+        try:
+            entry_data = DailyEntryCreate.model_validate(item)
+            entry_data.validate_total()
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            results[index] = BulkEntryResult(
+                index=index,
+                status="invalid",
+                detail=f"{field}: {error['msg']}" if field else error["msg"]
+            )
+            continue
+        except ValueError as e:
+            results[index] = BulkEntryResult(index=index, status="invalid", detail=str(e))
+            continue
 
-    # Update user's last_entry_date only if this is today's entry
-    if entry_date == date.today():
-        current_user.last_entry_date = entry_date
+        entry_date = entry_data.entry_date if entry_data.entry_date else today
+        if entry_date in seen_dates:
+            results[index] = BulkEntryResult(
+                index=index,
+                status="conflict",
+                entry_date=entry_date,
+                detail=f"Duplicate entry for {entry_date} in this batch."
+            )
+            continue
+        seen_dates.add(entry_date)
 
+        rows.append({
+            "id": uuid.uuid4(),
+            "user_id": current_user.id,
+            "entry_date": entry_date,
+            "casual_leisure_hours": entry_data.casual_leisure_hours,
+            "casual_leisure_note": entry_data.casual_leisure_note,
+            "serious_leisure_hours": entry_data.serious_leisure_hours,
+            "serious_leisure_note": entry_data.serious_leisure_note,
+            "project_leisure_hours": entry_data.project_leisure_hours,
+            "project_leisure_note": entry_data.project_leisure_note,
+        })
+        row_indexes.append(index)
+
+    # 2. Insert valid rows; existing dates are skipped by the unique constraint
+    inserted_ids = set()
     try:
+        if rows:
+            # Core executemany: SQLAlchemy batches the rows into multi-VALUES
+            # statements (insertmanyvalues) from one cached compiled statement
+            entries = DailyEntry.__table__
+            stmt = (
+                pg_insert(entries)
+                .values(reset_generation=current_generation(current_user.id))
+                .on_conflict_do_nothing(index_elements=[entries.c.user_id, entries.c.entry_date])
+                .returning(entries.c.id)
+            )
+            result = await db.execute(stmt, rows)
+            inserted_ids.update(result.scalars().all())
+
+            # Dates held by entries hidden by a reset (not purged yet): free them and retry
+            skipped = [row for row in rows if row["id"] not in inserted_ids]
+            if skipped and await reset_service.purge_dates(db, current_user.id, [row["entry_date"] for row in skipped]):
+                result = await db.execute(stmt, skipped)
+                inserted_ids.update(result.scalars().all())
+
+        accepted_rows = [row for row in rows if row["id"] in inserted_ids]
+        accepted = [SimpleNamespace(**row) for row in accepted_rows]
+        await rollup_service.apply_entries(db, current_user.id, accepted)
+        await term_index_service.apply_entries(db, accepted)
+        await system_stats_service.mark_days(db, (row["entry_date"] for row in accepted_rows))
+        submitted_today = any(row["entry_date"] == today for row in accepted_rows)
+        if accepted_rows:
+            user_values = {"last_entry_date": today} if submitted_today else {}
+            await data_version_service.bump(db, current_user.id, **user_values)
+
         await db.commit()
-        await db.refresh(new_entry)
-        return DailyEntryResponse.model_validate(new_entry)
     except Exception as e:
         await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create entry: {str(e)}"
+            detail=f"Failed to import entries: {str(e)}"
         )
 
+    if accepted_rows:
+        await stats_cache.invalidate_user(current_user.id)
+    if submitted_today:
+        user_cache.invalidate_user(current_user.id)
+
+    # 3. Report per-item outcomes
+    for index, row in zip(row_indexes, rows):
+        if row["id"] in inserted_ids:
+            results[index] = BulkEntryResult(
+                index=index, status="accepted", entry_date=row["entry_date"], id=row["id"]
+            )
+        else:
+            results[index] = BulkEntryResult(
+                index=index,
+                status="conflict",
+                entry_date=row["entry_date"],
+                detail=f"You have already submitted an entry for {row['entry_date']}."
+            )
 
-@router.get("/today", response_model=DailyEntryResponse)
+    return BulkEntryResponse(
+        accepted=sum(1 for r in results if r.status == "accepted"),
+        conflicts=sum(1 for r in results if r.status == "conflict"),
+        invalid=sum(1 for r in results if r.status == "invalid"),
+        results=results
+    )
+
+
+@router.get("/today", response_model=DailyEntryResponse, dependencies=[Depends(check_not_modified)])
 async def get_today_entry(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -137,7 +316,7 @@ async def get_today_entry(
 
     result = await db.execute(
         select(DailyEntry).where(
-            DailyEntry.user_id == current_user.id,
+            live_entries(current_user.id),
             DailyEntry.entry_date == today
         )
     )
@@ -152,56 +331,268 @@ async def get_today_entry(
     return DailyEntryResponse.model_validate(entry)
 
 
-@router.get("/history", response_model=EntryListResponse)
+@router.get("/calendar", response_model=CalendarResponse)
+async def get_calendar(
+    year: Optional[int] = Query(None, ge=1900, le=2100, description="Calendar year (defaults to the current year)"),
+    totals: bool = Query(False, description="Also return total hours per day"),
+    current_user: User = Depends(get_current_user),
+    etag: str = Depends(check_not_modified),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    Get the days of a year on which the user submitted an entry.
+
+    Presence is a base64 bitmap with one bit per day (a full year is 46
+    bytes), built from a single index-only scan of (user_id, entry_date).
+    Responses are cached until the user's next write.
+
+    - year: Calendar year (defaults to the current year)
+    - totals: Add per-day total hours as a base64 little-endian float32 array
+    """
+    year = year or date.today().year
+    params = {"year": year, "totals": totals}
+    cached = await stats_cache.get(current_user.id, "calendar", etag, params, CalendarResponse)
+    if cached is not None:
+        return cached
+
+    first_day = date(year, 1, 1)
+    days = (date(year + 1, 1, 1) - first_day).days
+
+    # Selected and filtered columns are all in idx_daily_entries_user_date_live
+    columns = [DailyEntry.entry_date, DailyEntry.total_hours] if totals else [DailyEntry.entry_date]
+    result = await db.execute(
+        select(*columns).where(
+            live_entries(current_user.id),
+            DailyEntry.entry_date >= first_day,
+            DailyEntry.entry_date < date(year + 1, 1, 1)
+        )
+    )
+    rows = result.all()
+    offsets = [(row.entry_date - first_day).days for row in rows]
+
+    calendar = CalendarResponse(
+        year=year,
+        days=days,
+        entry_count=len(rows),
+        presence=encode_presence(offsets, days)
+    )
+    if totals:
+        day_totals = [0.0] * days
+        for offset, row in zip(offsets, rows):
+            day_totals[offset] = row.total_hours
+        calendar.totals = encode_float32(day_totals)
+
+    await stats_cache.set(current_user.id, "calendar", etag, params, calendar)
+    return calendar
+
+
+@router.get("/history", response_model=EntryListResponse, dependencies=[Depends(check_not_modified)])
 async def get_entry_history(
+    response: Response,
     period: Optional[str] = Query(None, description="Filter period: 'week', 'month', or None for all"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Include total and total_pages"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get user's entry history with optional filtering and pagination.
 
+    Entries are ordered newest first on (entry_date, id). Two paging modes:
+
+    - cursor: Keyset paging; pass next_cursor of the previous page (page is ignored)
+    - page: Page number (1-indexed, OFFSET based; kept for the web frontend)
+
     - period: 'week' (last 7 days), 'month' (last 30 days), or None (all time)
-    - page: Page number (1-indexed)
     - page_size: Number of entries per page (max 100)
+    - include_total: Set to false to skip counting; all-time totals come from
+      the user's rollup row, period totals from a bounded index range count
     """
+    cursor_values = None
+    if cursor:
+        try:
+            cursor_date, cursor_id = decode_cursor(cursor, 2)
+            cursor_values = (date.fromisoformat(cursor_date), UUID(cursor_id))
+        except (InvalidCursor, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
     # Build base query
-    query = select(DailyEntry).where(DailyEntry.user_id == current_user.id)
+    query = select(*ENTRY_COLUMNS).where(live_entries(current_user.id))
 
     # Apply date filter
     today = date.today()
+    start_date = None
     if period == "week":
         start_date = today - timedelta(days=7)
-        query = query.where(DailyEntry.entry_date >= start_date)
     elif period == "month":
         start_date = today - timedelta(days=30)
+    if start_date:
         query = query.where(DailyEntry.entry_date >= start_date)
 
-    # Order by date descending (newest first)
-    query = query.order_by(DailyEntry.entry_date.desc())
-
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = None
+    if include_total:
+        if start_date is None:
+            rollup = await rollup_service.get_user_rollup(db, current_user.id)
+            total = rollup.entry_count if rollup else 0
+        else:
+            total_result = await db.execute(
+                select(func.count())
+                .select_from(DailyEntry)
+                .where(live_entries(current_user.id), DailyEntry.entry_date >= start_date)
+            )
+            total = total_result.scalar()
 
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    # Order by date descending (newest first); id breaks ties for the cursor
+    query = query.order_by(DailyEntry.entry_date.desc(), DailyEntry.id.desc())
+
+    # Apply pagination, fetching one extra row to know if another page exists
+    if cursor_values:
+        query = query.where(tuple_(DailyEntry.entry_date, DailyEntry.id) < tuple_(*cursor_values))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
 
     # Execute query
     result = await db.execute(query)
-    entries = result.scalars().all()
+    entries = result.all()
+
+    next_cursor = None
+    if len(entries) > page_size:
+        entries = entries[:page_size]
+        next_cursor = encode_cursor(entries[-1].entry_date, entries[-1].id)
 
     # Calculate total pages
-    total_pages = ceil(total / page_size) if total > 0 else 0
+    total_pages = None
+    if total is not None:
+        total_pages = ceil(total / page_size) if total > 0 else 0
+
+    page_fields = {
+        "total": total,
+        "page": None if cursor_values else page,
+        "page_size": page_size,
+        "total_pages": None if cursor_values else total_pages,
+        "next_cursor": next_cursor,
+    }
+    if fast_json_enabled():
+        # Rows already have the DailyEntryResponse fields; serialize them in one go
+        return json_bytes_response(dumps({"entries": rows_to_dicts(entries), **page_fields}), response.headers)
 
     return EntryListResponse(
         entries=[DailyEntryResponse.model_validate(entry) for entry in entries],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
+        **page_fields
     )
+
+
+@router.get("/export")
+async def export_entries(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: 'ndjson' or 'csv'"),
+    start_date: Optional[date] = Query(None, description="Only include entries on or after this date"),
+    end_date: Optional[date] = Query(None, description="Only include entries on or before this date"),
+    current_user: User = Depends(get_current_user),
+    etag: str = Depends(check_not_modified),
+    data_state: DataState = Depends(get_data_state)
+):
+    """
+    Export the user's full entry history, oldest first.
+
+    Rows are streamed from a server-side cursor, so memory use stays flat
+    regardless of history length.
+
+    - format: 'ndjson' (one JSON object per line) or 'csv' (with header row)
+    - start_date / end_date: Optional inclusive date range
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+    query = (
+        select(*ENTRY_COLUMNS)
+        .where(live_entries(current_user.id))
+        .order_by(DailyEntry.entry_date.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if start_date:
+        query = query.where(DailyEntry.entry_date >= start_date)
+    if end_date:
+        query = query.where(DailyEntry.entry_date <= end_date)
+
+    # Replica once it has the user's last write, else the primary
+    sessions = read_router.route(data_state.changed_at)
+    if format == "csv":
+        # BOM so spreadsheet apps detect UTF-8 (Hebrew notes)
+        body = _stream_export(sessions, query, _csv_chunk, header="\ufeff" + _csv_row(EXPORT_COLUMNS))
+        media_type = "text/csv; charset=utf-8"
+    else:
+        body = _stream_export(sessions, query, _ndjson_chunk)
+        media_type = "application/x-ndjson"
+
+    filename = f"time-tracker-export-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+        }
+    )
+
+
+async def _stream_export(sessions, query, render_chunk, header: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Yield rendered batches of rows from a server-side cursor.
+
+    Uses its own session from `sessions` (primary or replica factory, see
+    ReadRouter.route): request-scoped dependencies are closed before a
+    streaming response body is consumed.
+    """
+    if header is not None:
+        yield header
+    async with sessions() as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield render_chunk(rows)
+
+
+def _export_value(value):
+    """Convert a column value to a JSON/CSV friendly primitive."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _ndjson_chunk(rows) -> str:
+    """Render rows as newline-delimited JSON objects."""
+    return "".join(
+        json.dumps(
+            {column: _export_value(value) for column, value in zip(EXPORT_COLUMNS, row)},
+            ensure_ascii=False
+        ) + "\n"
+        for row in rows
+    )
+
+
+def _csv_row(values) -> str:
+    """Render a single CSV line."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+def _csv_chunk(rows) -> str:
+    """Render rows as CSV lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if value is None else _export_value(value) for value in row])
+    return buffer.getvalue()
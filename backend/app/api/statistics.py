@@ -2,33 +2,81 @@
 Statistics API endpoints.
 Handles calculation and retrieval of user statistics.
 """
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, func, cast, literal_column, Date, DateTime
 from datetime import date, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
+from uuid import UUID
 from app.database import get_db
 from app.models.user import User
 from app.models.daily_entry import DailyEntry
-from app.schemas.statistics import OverallStats, CategoryStats, TrendData
-from app.dependencies import get_current_user
+from app.schemas.statistics import OverallStats, CategoryStats, TrendData, ResetJobResponse
+from app.dependencies import get_current_user, check_not_modified, get_user_read_db
+from app.services.user_cache import user_cache
+from app.services.rollup_service import rollup_service
+from app.services.stats_cache import stats_cache
+from app.services.reset_service import reset_service
+from app.services.live_entries import live_entries
+from app.utils.fast_json import fast_json_enabled, dumps, json_bytes_response
 
 router = APIRouter(prefix="/statistics", tags=["Statistics"])
 
+# generate_series step per trends granularity
+GRANULARITY_STEPS = {
+    "day": "INTERVAL '1 day'",
+    "week": "INTERVAL '1 week'",
+    "month": "INTERVAL '1 month'",
+}
+
+# Supported rolling average windows (days)
+ROLLING_WINDOWS = (7, 30)
+
 
 @router.get("/overview", response_model=OverallStats)
 async def get_statistics_overview(
     period: Optional[str] = Query(None, description="Filter period: 'week', 'month', or None for all"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    etag: str = Depends(check_not_modified),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get overall statistics for the user.
 
     - period: 'week' (last 7 days), 'month' (last 30 days), or None (all time)
     """
-    # Build base query
-    query = select(DailyEntry).where(DailyEntry.user_id == current_user.id)
+    params = {"period": period}
+    cached = await stats_cache.get(current_user.id, "overview", etag, params, OverallStats)
+    if cached is not None:
+        return cached
+
+    overview = await _query_overview(db, current_user.id, period)
+    await stats_cache.set(current_user.id, "overview", etag, params, overview)
+    return overview
+
+
+async def _query_overview(db: AsyncSession, user_id: UUID, period: Optional[str]) -> OverallStats:
+    """Compute the overview response from user_rollups or a period aggregate."""
+    if period not in ("week", "month"):
+        # All-time totals are kept incrementally in user_rollups
+        rollup = await rollup_service.get_user_rollup(db, user_id)
+        if rollup is None:
+            return _build_overall_stats(0, 0.0, 0.0, 0.0, period)
+        return _build_overall_stats(
+            rollup.entry_count,
+            rollup.casual_total,
+            rollup.serious_total,
+            rollup.project_total,
+            period
+        )
+
+    # Aggregate in SQL; note columns are never read
+    query = select(
+        func.count().label("entry_count"),
+        func.coalesce(func.sum(DailyEntry.casual_leisure_hours), 0.0).label("casual_total"),
+        func.coalesce(func.sum(DailyEntry.serious_leisure_hours), 0.0).label("serious_total"),
+        func.coalesce(func.sum(DailyEntry.project_leisure_hours), 0.0).label("project_total"),
+    ).where(live_entries(user_id))
 
     # Apply date filter
     today = date.today()
@@ -39,11 +87,27 @@ async def get_statistics_overview(
         start_date = today - timedelta(days=30)
         query = query.where(DailyEntry.entry_date >= start_date)
 
-    # Get all entries
     result = await db.execute(query)
-    entries = result.scalars().all()
+    stats = result.one()
+
+    return _build_overall_stats(
+        stats.entry_count,
+        stats.casual_total,
+        stats.serious_total,
+        stats.project_total,
+        period
+    )
+
 
-    if not entries:
+def _build_overall_stats(
+    entry_count: int,
+    casual_total: float,
+    serious_total: float,
+    project_total: float,
+    period: Optional[str]
+) -> OverallStats:
+    """Build the overview response (with averages) from a count and per-category sums."""
+    if not entry_count:
         # Return zero stats
         return OverallStats(
             casual_leisure=CategoryStats(total_hours=0, average_hours=0.0, entry_count=0),
@@ -55,13 +119,7 @@ async def get_statistics_overview(
             period=period
         )
 
-    # Calculate statistics
-    entry_count = len(entries)
-
-    casual_total = sum(e.casual_leisure_hours for e in entries)
-    serious_total = sum(e.serious_leisure_hours for e in entries)
-    project_total = sum(e.project_leisure_hours for e in entries)
-    total_hours = sum(e.total_hours for e in entries)
+    total_hours = casual_total + serious_total + project_total
 
     return OverallStats(
         casual_leisure=CategoryStats(
@@ -88,75 +146,204 @@ async def get_statistics_overview(
 
 @router.get("/trends", response_model=TrendData)
 async def get_trends(
+    response: Response,
     days: int = Query(30, ge=7, le=365, description="Number of days to include in trends"),
+    granularity: str = Query("day", pattern="^(day|week|month)$", description="Bucket size: 'day', 'week' or 'month'"),
+    rolling: Optional[int] = Query(None, description="Add 7- or 30-day rolling averages (granularity=day only)"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    etag: str = Depends(check_not_modified),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get trend data for charts.
 
-    - days: Number of days to include (7-365)
+    The series is dense: every bucket from the start of the range to today is
+    present, with 0 hours where there are no entries. Buckets are built in SQL
+    (generate_series + date_trunc), so the payload size depends only on days
+    and granularity, not on history length.
+
+    - days: Number of days to include (7-365); the first week/month bucket may be partial
+    - granularity: 'day', 'week' (ISO weeks, starting Monday) or 'month'
+    - rolling: 7 or 30 for trailing averages of daily hours (window functions)
     """
+    if rolling is not None and rolling not in ROLLING_WINDOWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="rolling must be 7 or 30"
+        )
+    if rolling is not None and granularity != "day":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="rolling averages require granularity=day"
+        )
+
+    params = {"days": days, "granularity": granularity, "rolling": rolling}
+    if fast_json_enabled():
+        # Cached and fresh payloads are sent as-is, without building a TrendData
+        body = await stats_cache.get_raw(current_user.id, "trends", etag, params)
+        if body is None:
+            body = dumps(await _query_trends_content(db, current_user.id, days, granularity, rolling)).decode()
+            await stats_cache.set_raw(current_user.id, "trends", etag, params, body)
+        return json_bytes_response(body.encode(), response.headers)
+
+    cached = await stats_cache.get(current_user.id, "trends", etag, params, TrendData)
+    if cached is not None:
+        return cached
+
+    trends = await _query_trends(db, current_user.id, days, granularity, rolling)
+    await stats_cache.set(current_user.id, "trends", etag, params, trends)
+    return trends
+
+
+async def _query_trends(
+    db: AsyncSession,
+    user_id: UUID,
+    days: int,
+    granularity: str,
+    rolling: Optional[int]
+) -> TrendData:
+    """Build the gap-filled trend series (and rolling averages) in one query."""
+    return TrendData(**await _query_trends_content(db, user_id, days, granularity, rolling))
+
+
+async def _query_trends_content(
+    db: AsyncSession,
+    user_id: UUID,
+    days: int,
+    granularity: str,
+    rolling: Optional[int]
+) -> Dict[str, Any]:
+    """The trends payload as plain lists, with the same fields as TrendData."""
     today = date.today()
     start_date = today - timedelta(days=days)
+    # Rolling windows need the days before the range so the first points are complete
+    series_start = start_date - timedelta(days=rolling - 1) if rolling else start_date
+
+    # 1. Every bucket in the range
+    step = literal_column(GRANULARITY_STEPS[granularity])
+    series = select(
+        cast(
+            func.generate_series(
+                func.date_trunc(granularity, cast(series_start, DateTime)),
+                func.date_trunc(granularity, cast(today, DateTime)),
+                step
+            ),
+            Date
+        ).label("bucket")
+    ).subquery()
 
-    # Get entries for the period
-    result = await db.execute(
-        select(DailyEntry)
+    # 2. Per-bucket sums (only indexed columns, so an index-only scan)
+    entry_bucket = cast(func.date_trunc(granularity, cast(DailyEntry.entry_date, DateTime)), Date)
+    sums = (
+        select(
+            entry_bucket.label("bucket"),
+            func.count().label("entry_count"),
+            func.sum(DailyEntry.casual_leisure_hours).label("casual_hours"),
+            func.sum(DailyEntry.serious_leisure_hours).label("serious_hours"),
+            func.sum(DailyEntry.project_leisure_hours).label("project_hours"),
+            func.sum(DailyEntry.total_hours).label("total_hours"),
+        )
         .where(
-            DailyEntry.user_id == current_user.id,
-            DailyEntry.entry_date >= start_date
+            live_entries(user_id),
+            DailyEntry.entry_date >= series_start,
+            DailyEntry.entry_date <= today
         )
-        .order_by(DailyEntry.entry_date.asc())
+        .group_by(entry_bucket)
+        .subquery()
     )
-    entries = result.scalars().all()
-
-    # Build trend data
-    dates = []
-    casual_hours = []
-    serious_hours = []
-    project_hours = []
-    total_hours = []
-
-    for entry in entries:
-        dates.append(entry.entry_date.isoformat())
-        casual_hours.append(entry.casual_leisure_hours)
-        serious_hours.append(entry.serious_leisure_hours)
-        project_hours.append(entry.project_leisure_hours)
-        total_hours.append(entry.total_hours)
-
-    return TrendData(
-        dates=dates,
-        casual_hours=casual_hours,
-        serious_hours=serious_hours,
-        project_hours=project_hours,
-        total_hours=total_hours
+
+    # 3. Gap-fill with a left join, then add rolling averages over the dense series
+    columns = ["casual_hours", "serious_hours", "project_hours", "total_hours"]
+    filled = [func.coalesce(sums.c[name], 0.0).label(name) for name in columns]
+    averages = []
+    if rolling:
+        averages = [
+            func.avg(func.coalesce(sums.c[name], 0.0))
+            .over(order_by=series.c.bucket, rows=(-(rolling - 1), 0))
+            .label(f"rolling_{name}")
+            for name in columns
+        ]
+    dense = (
+        select(
+            series.c.bucket,
+            func.coalesce(sums.c.entry_count, 0).label("entry_count"),
+            *filled,
+            *averages
+        )
+        .select_from(series)
+        .outerjoin(sums, sums.c.bucket == series.c.bucket)
+        .subquery()
     )
+    query = select(dense).order_by(dense.c.bucket)
+    if rolling:
+        query = query.where(dense.c.bucket >= start_date)
+
+    result = await db.execute(query)
+    rows = result.all()
+
+    trends = {
+        "dates": [row.bucket.isoformat() for row in rows],
+        "casual_hours": [row.casual_hours for row in rows],
+        "serious_hours": [row.serious_hours for row in rows],
+        "project_hours": [row.project_hours for row in rows],
+        "total_hours": [row.total_hours for row in rows],
+        "entry_counts": [row.entry_count for row in rows],
+        "granularity": granularity,
+        "rolling": None,
+    }
+    if rolling:
+        trends["rolling"] = {
+            "window": rolling,
+            **{name: [round(float(getattr(row, f"rolling_{name}")), 2) for row in rows] for name in columns}
+        }
+    return trends
 
 
-@router.delete("/reset", status_code=204)
+@router.delete("/reset", response_model=ResetJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def reset_user_data(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Delete all entries for the current user.
     This action cannot be undone!
-    """
-    # Delete all user's entries
-    await db.execute(
-        delete(DailyEntry)
-        .where(DailyEntry.user_id == current_user.id)
-    )
-
-    # Reset user's last_entry_date
-    current_user.last_entry_date = None
 
+    Entries disappear from every endpoint immediately; the rows are deleted
+    in the background in batches. Poll /statistics/reset/{job_id} for
+    progress. Repeating the request while the purge runs returns the same job.
+    """
     try:
-        await db.commit()
+        job = await reset_service.start_reset(db, current_user.id)
+        await stats_cache.invalidate_user(current_user.id)
     except Exception as e:
         await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to reset data: {str(e)}"
         )
+
+    user_cache.invalidate_user(current_user.id)
+    response.headers["Location"] = str(request.url_for("get_reset_status", job_id=job.id))
+    return ResetJobResponse.model_validate(job)
+
+
+@router.get("/reset/{job_id}", response_model=ResetJobResponse)
+async def get_reset_status(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the progress of a data reset.
+
+    - status: 'pending', 'running', 'done' or 'failed' (entries stay hidden either way)
+    """
+    job = await reset_service.get_job(db, current_user.id, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reset job not found"
+        )
+    return ResetJobResponse.model_validate(job)
@@ -3,7 +3,14 @@ Configuration management for the Time Tracker application.
 Loads environment variables and provides app settings.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Dict, List, Optional
+
+
+def _async_url(url: str) -> str:
+    """Convert a database URL to async format (postgresql+asyncpg)."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
 
 
 class Settings(BaseSettings):
@@ -15,16 +22,90 @@ class Settings(BaseSettings):
     @property
     def async_database_url(self) -> str:
         """Convert database URL to async format (postgresql+asyncpg)."""
-        url = self.database_url
-        if url.startswith("postgresql://"):
-            return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        return url
+        return _async_url(self.database_url)
+
+    # Read replica (optional). Read-only GET endpoints use it when set and
+    # fresh enough; writes and read-your-writes paths always use the primary.
+    database_replica_url: Optional[str] = None
+    db_replica_max_lag_seconds: float = 30.0  # Reads fall back to the primary while the replica is further behind
+    db_replica_check_seconds: float = 5.0  # How often the replica's replay position is read
+
+    @property
+    def async_database_replica_url(self) -> Optional[str]:
+        """Replica URL in async format, or None when no replica is configured."""
+        return _async_url(self.database_replica_url) if self.database_replica_url else None
+
+    # Connection pool strategy
+    # "nullpool": no pooling, no prepared statements (pgbouncer transaction mode)
+    # "queuepool": pooled connections, no prepared statements (pgbouncer session mode)
+    # "queuepool_prepared": pooled connections with asyncpg prepared statement cache (direct Postgres)
+    db_pool_strategy: str = "nullpool"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # Used by "queuepool_prepared" only
+    db_pool_warmup: int = 0  # Connections to pre-open on startup
 
     # Supabase
     supabase_url: str
     supabase_anon_key: str
     supabase_service_key: str
 
+    # Token verification
+    # "remote": validate every token with Supabase /auth/v1/user
+    # "local": verify JWT signature, expiry and audience in-process
+    auth_verification_mode: str = "remote"
+    supabase_jwt_secret: Optional[str] = None  # Project JWT secret (HS256 projects)
+    supabase_jwt_audience: str = "authenticated"
+    auth_remote_fallback: bool = True  # Fall back to /user when a token can't be checked locally
+    auth_jwks_refresh_seconds: int = 600
+
+    # Supabase HTTP client (shared, keep-alive)
+    supabase_http2: bool = True
+    supabase_max_connections: int = 50
+    supabase_max_keepalive_connections: int = 20
+    supabase_keepalive_expiry: float = 30.0
+    supabase_timeout: float = 10.0  # Default per-call timeout (seconds)
+    supabase_connect_timeout: float = 5.0
+    supabase_user_timeout: float = 3.0  # Token validation is on the request hot path
+
+    # Authenticated user cache (token -> user snapshot)
+    user_cache_enabled: bool = True
+    user_cache_size: int = 1024
+    user_cache_ttl_seconds: int = 60
+
+    # Statistics response cache (overview/trends), keyed by user data version
+    stats_cache_enabled: bool = True
+    stats_cache_size: int = 4096
+    stats_cache_ttl_seconds: int = 300
+
+    # Background jobs (in-process runner over the durable background_jobs table)
+    jobs_enabled: bool = True  # Run workers and periodic jobs in this process
+    job_queues: str = "default:2,maintenance:1"  # Comma-separated name:concurrency
+    job_poll_interval_seconds: float = 5.0
+    job_max_attempts: int = 5
+    job_retry_base_seconds: float = 10.0  # Backoff doubles per attempt from here
+    job_retry_max_seconds: float = 3600.0
+    job_lease_seconds: int = 900  # A job running longer is assumed lost (crashed worker) and requeued
+    job_retention_hours: int = 168  # Finished jobs are deleted after this
+
+    # Background purge of reset data (entries are hidden at once, deleted in batches)
+    reset_purge_batch_size: int = 1000
+    reset_purge_interval_seconds: float = 30.0  # Periodic sweep for jobs left by restarts or other workers
+    reset_purge_max_attempts: int = 5
+
+    # System-wide daily stats and cohort retention (admin dashboard), refreshed by a periodic job
+    system_stats_interval_seconds: float = 300.0
+
+    # Fast JSON path (orjson, column rows instead of per-row models) for list-heavy endpoints
+    fast_json_enabled: bool = False
+
+    # Prometheus metrics (middleware, DB/Supabase timing and /metrics are only installed when enabled)
+    metrics_enabled: bool = False
+    metrics_path: str = "/metrics"
+
     # FastAPI
     environment: str = "development"
     debug: bool = True
@@ -50,6 +131,21 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def job_queue_concurrency(self) -> Dict[str, int]:
+        """Parse job queues from comma-separated name:concurrency pairs."""
+        queues = {}
+        for item in self.job_queues.split(","):
+            name, _, concurrency = item.strip().partition(":")
+            if name:
+                queues[name] = max(int(concurrency or 1), 1)
+        return queues
+
+    @property
+    def use_local_token_verification(self) -> bool:
+        """Check if tokens should be verified locally instead of via Supabase."""
+        return self.auth_verification_mode.lower() == "local"
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
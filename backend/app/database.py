@@ -1,20 +1,141 @@
 """
 Database configuration and session management.
-Sets up async SQLAlchemy engine and session factory.
+Sets up async SQLAlchemy engines (primary and optional read replica) and
+session factories, and routes read-only sessions between them.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+POOL_STRATEGIES = ("nullpool", "queuepool", "queuepool_prepared")
+
+
+class PoolMetrics:
+    """Counters for time spent waiting to check a connection out of the pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        # Extra callbacks per checkout (e.g. Prometheus histogram), see app.metrics
+        self.observers: List[Callable[[float], None]] = []
+        self.engine: Optional[AsyncEngine] = None  # Engine whose pool status is reported
+
+    def record_checkout(self, seconds: float) -> None:
+        """Record one checkout and how long it took."""
+        self.checkouts += 1
+        self.total_wait += seconds
+        if seconds > self.max_wait:
+            self.max_wait = seconds
+        for observer in self.observers:
+            observer(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters plus current pool status."""
+        return {
+            "strategy": settings.db_pool_strategy,
+            "checkouts": self.checkouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "status": self.engine.pool.status() if self.engine is not None else None,
+        }
+
+
+pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
+
+
+class _TimedCheckoutMixin:
+    """Times every pool checkout (includes connect time when a new connection is opened)."""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_checkout(time.perf_counter() - start)
+
+
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    """NullPool that records checkout time."""
+
+
+class TimedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout (wait) time."""
+
+
+class ReplicaNullPool(TimedNullPool):
+    """TimedNullPool for the read replica."""
+
+    metrics = replica_pool_metrics
+
+
+class ReplicaQueuePool(TimedQueuePool):
+    """TimedQueuePool for the read replica."""
+
+    metrics = replica_pool_metrics
+
+
+def _engine_options(replica: bool = False) -> Dict[str, Any]:
+    """Build create_async_engine pool options for the configured strategy."""
+    strategy = settings.db_pool_strategy.lower()
+    if strategy not in POOL_STRATEGIES:
+        raise ValueError(
+            f"Invalid DB_POOL_STRATEGY '{settings.db_pool_strategy}', expected one of {POOL_STRATEGIES}"
+        )
+
+    if strategy == "nullpool":
+        # No pooling at SQLAlchemy level (pgbouncer handles it) and no prepared
+        # statements, which pgbouncer transaction mode can't route
+        return {
+            "poolclass": ReplicaNullPool if replica else TimedNullPool,
+            "connect_args": {"statement_cache_size": 0},
+        }
+
+    statement_cache_size = settings.db_statement_cache_size if strategy == "queuepool_prepared" else 0
+    options = {
+        "poolclass": ReplicaQueuePool if replica else TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {"statement_cache_size": statement_cache_size},
+    }
+    if statement_cache_size == 0:
+        # SQLAlchemy's own asyncpg prepared statement cache must be off too
+        options["connect_args"]["prepared_statement_cache_size"] = 0
+    return options
+
+
 # Create async engine
-# Using pooler with NullPool to avoid prepared statement cache issues with pgbouncer
 engine = create_async_engine(
     settings.async_database_url,  # Use async URL (postgresql+asyncpg)
     echo=settings.debug,  # Log SQL queries in debug mode
-    poolclass=NullPool,  # No pooling at SQLAlchemy level (pgbouncer handles it)
-    connect_args={"statement_cache_size": 0}  # Disable prepared statements for pgbouncer
+    **_engine_options()
 )
+pool_metrics.engine = engine
+
+# Read-only replica, same pool strategy as the primary
+replica_engine: Optional[AsyncEngine] = None
+if settings.async_database_replica_url:
+    replica_engine = create_async_engine(
+        settings.async_database_replica_url,
+        echo=settings.debug,
+        **_engine_options(replica=True)
+    )
+    replica_pool_metrics.engine = replica_engine
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -25,11 +146,144 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# Commit time up to which the replica has applied everything: now() when it
+# has replayed all WAL it received, else its last replayed commit. A server
+# that is not in recovery counts as caught up.
+REPLICA_POSITION_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN now() ELSE pg_last_xact_replay_timestamp() END"
+)
+
+# A write's changed_at is its transaction start, not its commit; writes this
+# close to the replica position are treated as not yet replayed
+WRITE_VISIBILITY_MARGIN = timedelta(seconds=2)
+
+
+class ReadRouter:
+    """
+    Chooses the primary or the replica for read-only sessions.
+
+    A background task reads the replica's replay position every
+    DB_REPLICA_CHECK_SECONDS. A read goes to the replica only while it is at
+    most DB_REPLICA_MAX_LAG_SECONDS behind and, for per-user reads, has
+    replayed the user's last write; otherwise (and when no replica is
+    configured or it can't be reached) it goes to the primary.
+    """
+
+    def __init__(self, replica_engine: Optional[AsyncEngine], pool_metrics: PoolMetrics):
+        self.replica_engine = replica_engine
+        self.pool_metrics = pool_metrics  # Checkout metrics of the replica's pool
+        self.replica_sessions = None
+        if replica_engine is not None:
+            self.replica_sessions = async_sessionmaker(
+                replica_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autocommit=False,
+                autoflush=False
+            )
+        self.replayed_until: Optional[datetime] = None  # Primary commits before this are visible on the replica
+        self.checked_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.decisions: Dict[Tuple[str, str], int] = {}
+        # Extra callbacks per decision, called with (target, reason), see app.metrics
+        self.observers: List[Callable[[str, str], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def lag_seconds(self) -> Optional[float]:
+        """
+        How far the replica may be behind the primary, or None if unknown.
+        Measured from the last check, so it keeps growing while checks fail to run.
+        """
+        if self.replayed_until is None:
+            return None
+        return max((datetime.now(timezone.utc) - self.replayed_until).total_seconds(), 0.0)
+
+    def route(self, changed_at: Optional[datetime] = None) -> async_sessionmaker:
+        """
+        Pick the session factory for a read-only request and record the decision.
+
+        Args:
+            changed_at: Time of the user's last write that the response must
+                reflect; None when any state within the lag limit will do
+
+        Returns:
+            The replica's session factory or AsyncSessionLocal
+        """
+        if self.replica_sessions is None:
+            return self._decide("primary", "no_replica")
+
+        lag = self.lag_seconds()
+        if lag is None:
+            return self._decide("primary", "replica_unavailable")
+        if lag > settings.db_replica_max_lag_seconds:
+            return self._decide("primary", "replica_lagging")
+        if changed_at is not None and changed_at >= self.replayed_until - WRITE_VISIBILITY_MARGIN:
+            return self._decide("primary", "recent_write")
+        return self._decide("replica", "fresh")
+
+    def _decide(self, target: str, reason: str) -> async_sessionmaker:
+        key = (target, reason)
+        self.decisions[key] = self.decisions.get(key, 0) + 1
+        for observer in self.observers:
+            observer(target, reason)
+        return self.replica_sessions if target == "replica" else AsyncSessionLocal
+
+    async def check(self) -> None:
+        """Read the replica's replay position; on failure reads use the primary until a check succeeds."""
+        try:
+            async with self.replica_engine.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.execute(REPLICA_POSITION_SQL), timeout=settings.db_replica_check_seconds
+                )
+                self.replayed_until = result.scalar_one()
+            self.last_error = None
+        except Exception as e:
+            logger.warning("Read replica check failed: %s", e)
+            self.replayed_until = None
+            self.last_error = str(e) or type(e).__name__
+        self.checked_at = datetime.now(timezone.utc)
+
+    def start(self) -> None:
+        """Start polling the replica (call from the app lifespan); no-op without a replica."""
+        if self.replica_engine is None or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _poll(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.db_replica_check_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return replica state, lag and routing counters."""
+        lag = self.lag_seconds()
+        return {
+            "configured": self.replica_engine is not None,
+            "lag_seconds": round(lag, 3) if lag is not None else None,
+            "max_lag_seconds": settings.db_replica_max_lag_seconds,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "last_error": self.last_error,
+            "decisions": {f"{target}:{reason}": count for (target, reason), count in sorted(self.decisions.items())},
+            "pool": self.pool_metrics.snapshot() if self.replica_engine is not None else None,
+        }
+
+
+read_router = ReadRouter(replica_engine, replica_pool_metrics)
+
 # Base class for models
 Base = declarative_base()
 
 
-async def get_db() -> AsyncSession:
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
     Dependency function to get database session.
     Yields a session and ensures it's closed after use.
@@ -41,9 +295,51 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency function to get a session for read-only endpoints that
+    tolerate replica lag (up to DB_REPLICA_MAX_LAG_SECONDS).
+    Uses the primary when no replica is configured or it is behind.
+    """
+    async with read_router.route()() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def warm_up_pool(connections: int) -> int:
+    """
+    Pre-open pooled connections so the first requests don't pay connect time.
+
+    Args:
+        connections: Number of connections to open (capped at the pool size)
+
+    Returns:
+        Number of connections opened
+    """
+    if settings.db_pool_strategy.lower() == "nullpool" or connections <= 0:
+        return 0
+
+    connections = min(connections, settings.db_pool_size)
+    # Hold all connections at once so the pool opens N distinct ones
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)),
+        return_exceptions=True
+    )
+    held = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in held:
+        await conn.close()
+
+    errors = [error for error in results if isinstance(error, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(held)
+
+
 async def init_db():
     """Initialize database (create tables if not exists)."""
     async with engine.begin() as conn:
         # Import models to ensure they're registered
-        from app.models import user, daily_entry  # noqa
+        from app.models import user, daily_entry, user_rollup, note_term, data_reset, background_job, system_stats  # noqa
         await conn.run_sync(Base.metadata.create_all)
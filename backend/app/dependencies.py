@@ -2,13 +2,17 @@
 Dependency injection functions for FastAPI.
 Includes authentication and database session dependencies.
 """
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Optional
-from app.database import get_db
+from typing import AsyncIterator, Optional
+from datetime import date
+from app.database import get_db, read_router
 from app.models.user import User
 from app.services.auth_service import auth_service
+from app.services.token_verifier import get_token_expiry
+from app.services.user_cache import user_cache
+from app.services.data_version_service import data_version_service, etag_matches, DataState
 from app.config import settings
 
 
@@ -18,7 +22,8 @@ async def get_current_user(
 ) -> User:
     """
     Dependency to get current authenticated user.
-    Validates token with Supabase and retrieves user from database.
+    Validates token (locally or with Supabase) and retrieves user from database.
+    Recently seen tokens are served from the in-process user cache.
 
     Args:
         authorization: Authorization header with Bearer token
@@ -49,8 +54,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Validate token with Supabase
-    supabase_user = await auth_service.get_user_from_token(token)
+    # Serve recently resolved tokens without validation or a users-table query
+    cached_user = user_cache.get(token)
+    if cached_user is not None:
+        # Attach a copy to this request's session without emitting SQL
+        return await db.merge(cached_user, load=False)
+
+    # Validate token (local JWT check or Supabase, per settings)
+    supabase_user = await auth_service.verify_token(token)
     if not supabase_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,9 +82,79 @@ async def get_current_user(
             detail="User not found in database"
         )
 
+    user_cache.set(token, user, expires_at=get_token_expiry(token))
     return user
 
 
+async def get_data_state(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> DataState:
+    """
+    Dependency reading the user's data version and last write time from the
+    primary (once per request, shared by ETag checks and read routing).
+
+    Args:
+        current_user: Authenticated user
+        db: Database session (primary)
+
+    Returns:
+        The user's DataState
+    """
+    return await data_version_service.get_state(db, current_user.id) or DataState(0, None)
+
+
+async def check_not_modified(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    data_state: DataState = Depends(get_data_state)
+) -> str:
+    """
+    Dependency for conditional GETs on per-user read endpoints.
+    Sets a weak ETag derived from the user's data version and answers a
+    matching If-None-Match with 304 before the endpoint queries daily_entries.
+
+    Args:
+        response: Response whose headers receive ETag and Cache-Control
+        if_none_match: If-None-Match header sent by the client
+        current_user: Authenticated user
+        data_state: User's data version from the primary
+
+    Returns:
+        The ETag (endpoints returning a Response directly must set it themselves)
+
+    Raises:
+        HTTPException: 304 if the client's copy is current
+    """
+    etag = data_version_service.etag(current_user.id, data_state.version, date.today())
+    # no-cache: browsers may store the response but must revalidate every time
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return etag
+
+
+async def get_user_read_db(data_state: DataState = Depends(get_data_state)) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency to get a read-only session for the current user's data.
+    Uses the replica only once it has replayed the user's last write, so a
+    response always matches the ETag computed from the primary; otherwise
+    (and without a replica) the primary.
+
+    Args:
+        data_state: User's data version and last write time from the primary
+
+    Yields:
+        Database session on the replica or the primary
+    """
+    async with read_router.route(data_state.changed_at)() as session:
+        yield session
+
+
 async def verify_admin_password(
     x_admin_password: Optional[str] = Header(None, alias="X-Admin-Password")
 ) -> None:
@@ -1,18 +1,43 @@
 """
 Main FastAPI application.
-Initializes app, CORS, and registers API routes.
+Initializes app, CORS, lifespan resources, and registers API routes.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api import auth, entries, statistics, admin
+from app.database import engine, warm_up_pool, pool_metrics, read_router
+from app.services.auth_service import auth_service
+from app.services.job_runner import job_runner
+from app.utils.fast_json import default_response_class
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    await auth_service.start()
+    await warm_up_pool(settings.db_pool_warmup)
+    read_router.start()
+    if settings.jobs_enabled:
+        job_runner.start()
+    yield
+    await job_runner.stop()
+    await read_router.stop()
+    await auth_service.close()
+    await engine.dispose()
+    if read_router.replica_engine is not None:
+        await read_router.replica_engine.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Time Tracker API",
     description="API for tracking daily leisure activities",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan,
+    default_response_class=default_response_class()
 )
 
 # Configure CORS
@@ -22,8 +47,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Prometheus metrics; when disabled nothing is imported or installed
+if settings.metrics_enabled:
+    from app.metrics import setup_metrics
+    setup_metrics(app, engine, auth_service, pool_metrics, read_router)
+
 # Register routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(entries.router, prefix="/api/v1")
@@ -0,0 +1,188 @@
+"""
+Prometheus metrics for request latency, database and Supabase usage.
+Nothing here runs unless METRICS_ENABLED is set: setup_metrics() installs
+the middleware, engine event hooks, pool/Supabase/read-routing observers
+and the /metrics route.
+"""
+import contextvars
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+# [query count, DB seconds] of the request being handled
+_request_db: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar("request_db", default=None)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 100)
+
+
+class Metrics:
+    """Prometheus collectors, registered in a registry owned by this instance."""
+
+    def __init__(self):
+        self.registry = CollectorRegistry()
+
+        self.requests = Counter(
+            "http_requests_total", "HTTP requests by route and status",
+            ["method", "route", "status"], registry=self.registry
+        )
+        self.request_latency = Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route",
+            ["method", "route"], registry=self.registry
+        )
+        self.in_progress = Gauge(
+            "http_requests_in_progress", "HTTP requests currently being handled",
+            ["method"], registry=self.registry
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "SQL statements executed per request",
+            ["route"], buckets=QUERY_COUNT_BUCKETS, registry=self.registry
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_seconds", "Time spent executing SQL per request",
+            ["route"], registry=self.registry
+        )
+        self.queries = Counter(
+            "db_queries_total", "SQL statements executed (including outside requests)",
+            registry=self.registry
+        )
+        self.pool_wait = Histogram(
+            "db_pool_checkout_seconds", "Time to check a connection out of the pool (includes connect)",
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+            registry=self.registry
+        )
+        self.read_routing = Counter(
+            "db_read_routing_total", "Read-only sessions by target (primary/replica) and reason",
+            ["target", "reason"], registry=self.registry
+        )
+        self.replica_lag = Gauge(
+            "db_replica_lag_seconds", "How far the read replica may be behind the primary (NaN if unknown)",
+            registry=self.registry
+        )
+        self.supabase_latency = Histogram(
+            "supabase_request_duration_seconds", "Supabase Auth API call latency",
+            ["operation", "outcome"], registry=self.registry
+        )
+
+    def observe_supabase_call(self, operation: str, seconds: float, outcome: str) -> None:
+        """SupabaseAuthService call observer."""
+        self.supabase_latency.labels(operation, outcome).observe(seconds)
+
+    def observe_read_routing(self, target: str, reason: str) -> None:
+        """ReadRouter decision observer."""
+        self.read_routing.labels(target, reason).inc()
+
+    def render(self) -> bytes:
+        """Current values in the Prometheus text exposition format."""
+        return generate_latest(self.registry)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status and DB usage."""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        db_usage = [0, 0.0]
+        token = _request_db.set(db_usage)
+        in_progress = self.metrics.in_progress.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            _request_db.reset(token)
+
+            # Route template (e.g. /api/v1/entries/history) keeps label cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            self.metrics.requests.labels(method, route_path, str(status_code)).inc()
+            self.metrics.request_latency.labels(method, route_path).observe(elapsed)
+            self.metrics.request_queries.labels(route_path).observe(db_usage[0])
+            self.metrics.request_db_time.labels(route_path).observe(db_usage[1])
+
+
+def _instrument_engine(engine: AsyncEngine, metrics: Metrics) -> None:
+    """Count and time every statement, attributing it to the current request."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+        metrics.queries.inc()
+        db_usage = _request_db.get()
+        if db_usage is not None:
+            db_usage[0] += 1
+            db_usage[1] += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        starts = exception_context.connection.info.get("metrics_query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return float("nan") if value is None else value
+
+
+def setup_metrics(app: FastAPI, engine: AsyncEngine, auth_service, pool_metrics, read_router) -> Metrics:
+    """
+    Install metrics collection and the /metrics endpoint.
+    Must be called before the app starts (the Supabase client is built on startup).
+
+    Args:
+        app: FastAPI application
+        engine: Async engine whose statements are counted and timed
+        auth_service: SupabaseAuthService whose calls are timed
+        pool_metrics: PoolMetrics whose checkouts are observed
+        read_router: ReadRouter whose decisions and replica lag are reported;
+            replica statements and checkouts count like the primary's
+
+    Returns:
+        The Metrics instance holding the collectors
+    """
+    metrics = Metrics()
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    _instrument_engine(engine, metrics)
+    pool_metrics.observers.append(metrics.pool_wait.observe)
+    read_router.observers.append(metrics.observe_read_routing)
+    if read_router.replica_engine is not None:
+        _instrument_engine(read_router.replica_engine, metrics)
+        read_router.pool_metrics.observers.append(metrics.pool_wait.observe)
+        metrics.replica_lag.set_function(lambda: _nan_if_none(read_router.lag_seconds()))
+    auth_service.call_observer = metrics.observe_supabase_call
+
+    async def metrics_endpoint():
+        return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
+    app.add_api_route(settings.metrics_path, metrics_endpoint, methods=["GET"], include_in_schema=False)
+    return metrics
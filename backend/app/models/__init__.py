@@ -3,5 +3,13 @@ Models package - exports all database models.
 """
 from app.models.user import User
 from app.models.daily_entry import DailyEntry
+from app.models.user_rollup import UserRollup, UserMonthlyRollup
+from app.models.note_term import NoteTerm, NoteTermDaily
+from app.models.data_reset import DataReset
+from app.models.background_job import BackgroundJob
+from app.models.system_stats import SystemDailyStats, SystemStatsDirtyDay, SignupCohort, CohortRetention
 
-__all__ = ["User", "DailyEntry"]
+__all__ = [
+    "User", "DailyEntry", "UserRollup", "UserMonthlyRollup", "NoteTerm", "NoteTermDaily", "DataReset", "BackgroundJob",
+    "SystemDailyStats", "SystemStatsDirtyDay", "SignupCohort", "CohortRetention",
+]
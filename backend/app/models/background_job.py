@@ -0,0 +1,51 @@
+"""
+BackgroundJob model - durable queue for the in-process job runner.
+Jobs are rows, so queued and retrying work survives restarts; workers claim
+them with FOR UPDATE SKIP LOCKED, so several API processes can share a queue.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, UUID as SQLUUID, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.database import Base
+import uuid
+
+
+class BackgroundJob(Base):
+    """One run of a registered job handler."""
+
+    __tablename__ = "background_jobs"
+
+    id = Column(SQLUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    queue = Column(String(32), nullable=False)
+    name = Column(String(64), nullable=False)  # Registered handler
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))  # Handler keyword arguments
+    status = Column(String(16), nullable=False, default="queued")  # queued, running, done or failed
+    attempts = Column(Integer, nullable=False, default=0)  # Runs started so far
+    max_attempts = Column(Integer, nullable=False)
+    dedupe_key = Column(String(128), nullable=True)  # At most one queued/running job per key
+    error = Column(String, nullable=True)  # Last failure
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Not claimed before
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)  # Start of the latest attempt
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Workers claim the next due job of their queue
+        Index(
+            "idx_background_jobs_due",
+            "queue",
+            "run_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index(
+            "uq_background_jobs_active_dedupe",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        # Queue stats and retention scan finished jobs by age
+        Index("idx_background_jobs_finished", "finished_at"),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob(id={self.id}, queue={self.queue}, name={self.name}, status={self.status})>"
@@ -2,7 +2,7 @@
 DailyEntry model - represents daily leisure activity entries.
 Enforces one entry per user per day via UNIQUE constraint.
 """
-from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey, UUID as SQLUUID, UniqueConstraint, CheckConstraint, Computed
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey, UUID as SQLUUID, UniqueConstraint, CheckConstraint, Computed, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -39,6 +39,10 @@ class DailyEntry(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # The user's reset_generation when the entry was written; once the user
+    # resets, older rows are invisible until the reset purger deletes them
+    reset_generation = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Relationship to user
     user = relationship("User", back_populates="entries")
 
@@ -52,6 +56,21 @@ class DailyEntry(Base):
             "casual_leisure_hours + serious_leisure_hours + project_leisure_hours > 0",
             name="total_hours_positive"
         ),
+        # Per-user date-range reads (statistics, trends, history) are served
+        # from this index alone; created CONCURRENTLY by migration 0004
+        # (replacing idx_daily_entries_user_date_hours from 0002)
+        Index(
+            "idx_daily_entries_user_date_live",
+            "user_id",
+            entry_date.desc(),
+            postgresql_include=[
+                "casual_leisure_hours",
+                "serious_leisure_hours",
+                "project_leisure_hours",
+                "total_hours",
+                "reset_generation",
+            ],
+        ),
     )
 
     def __repr__(self):
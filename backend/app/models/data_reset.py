@@ -0,0 +1,40 @@
+"""
+DataReset model - a user's data reset and the progress of its purge.
+Resetting hides the user's entries at once (by bumping reset_generation);
+the background purger then deletes the hidden rows in batches and records
+progress here, so the work survives restarts.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UUID as SQLUUID, Index, text
+from sqlalchemy.sql import func
+from app.database import Base
+import uuid
+
+
+class DataReset(Base):
+    """Purge job for the entries hidden by one reset."""
+
+    __tablename__ = "data_resets"
+
+    id = Column(SQLUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(SQLUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    reset_generation = Column(Integer, nullable=False)  # Entries with a lower generation are deleted
+    status = Column(String(16), nullable=False, default="pending")  # pending, running, done or failed
+    total_entries = Column(Integer, nullable=False, default=0)  # Visible entries at reset time
+    deleted_entries = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)  # Failed purge attempts
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The purger polls for unfinished jobs
+        Index(
+            "idx_data_resets_active",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<DataReset(id={self.id}, user_id={self.user_id}, status={self.status})>"
@@ -0,0 +1,38 @@
+"""
+Note term models - term-frequency index over entry notes.
+Maintained incrementally on entry insert/reset for the admin word cloud.
+"""
+from sqlalchemy import Column, Integer, String, Date, Index
+from app.database import Base
+
+
+class NoteTerm(Base):
+    """All-time occurrence count of a term in one leisure category's notes."""
+
+    __tablename__ = "note_terms"
+
+    category = Column(String(16), primary_key=True)  # "casual", "serious" or "project"
+    term = Column(String(64), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    last_seen = Column(Date, nullable=True)  # Latest entry_date the term appeared on
+
+    __table_args__ = (
+        Index("idx_note_terms_category_count", "category", "count"),
+    )
+
+    def __repr__(self):
+        return f"<NoteTerm(category={self.category}, term={self.term}, count={self.count})>"
+
+
+class NoteTermDaily(Base):
+    """Occurrence count of a term in one category's notes for one entry date."""
+
+    __tablename__ = "note_term_daily"
+
+    category = Column(String(16), primary_key=True)
+    day = Column(Date, primary_key=True)
+    term = Column(String(64), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<NoteTermDaily(category={self.category}, day={self.day}, term={self.term}, count={self.count})>"
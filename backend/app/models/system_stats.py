@@ -0,0 +1,71 @@
+"""
+System statistics models - precomputed system-wide aggregates for the admin dashboard.
+Derived from daily_entries and users by the periodic "system_stats_refresh"
+job, which recomputes only the days marked in system_stats_dirty_days.
+"""
+from sqlalchemy import Column, Integer, Float, Date, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class SystemDailyStats(Base):
+    """Activity across all users on one entry date, plus that day's signups."""
+
+    __tablename__ = "system_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    active_users = Column(Integer, nullable=False, default=0)  # Users with an entry for the day
+    entry_count = Column(Integer, nullable=False, default=0)
+    casual_total = Column(Float, nullable=False, default=0.0)
+    serious_total = Column(Float, nullable=False, default=0.0)
+    project_total = Column(Float, nullable=False, default=0.0)
+    new_users = Column(Integer, nullable=False, default=0)  # Users created on the day (UTC)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def total_hours(self) -> float:
+        return self.casual_total + self.serious_total + self.project_total
+
+    def __repr__(self):
+        return f"<SystemDailyStats(day={self.day}, active_users={self.active_users}, entries={self.entry_count})>"
+
+
+class SystemStatsDirtyDay(Base):
+    """An entry date whose aggregates must be recomputed (marked by entry writes and purges)."""
+
+    __tablename__ = "system_stats_dirty_days"
+
+    day = Column(Date, primary_key=True)
+
+    def __repr__(self):
+        return f"<SystemStatsDirtyDay(day={self.day})>"
+
+
+class SignupCohort(Base):
+    """Users who signed up in one week (UTC, weeks start on Monday)."""
+
+    __tablename__ = "signup_cohorts"
+
+    cohort_week = Column(Date, primary_key=True)  # Monday of the signup week
+    users = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<SignupCohort(cohort_week={self.cohort_week}, users={self.users})>"
+
+
+class CohortRetention(Base):
+    """Users of a signup cohort with at least one entry dated in a later week."""
+
+    __tablename__ = "cohort_retention"
+
+    cohort_week = Column(Date, primary_key=True)
+    week_offset = Column(Integer, primary_key=True)  # 0 = signup week
+    active_users = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return (
+            f"<CohortRetention(cohort_week={self.cohort_week}, week_offset={self.week_offset}, "
+            f"active_users={self.active_users})>"
+        )
@@ -2,7 +2,7 @@
 User model - represents users in the database.
 Links to Supabase Auth via supabase_user_id.
 """
-from sqlalchemy import Column, String, DateTime, Date, UUID as SQLUUID
+from sqlalchemy import Column, String, DateTime, Date, Integer, UUID as SQLUUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -17,9 +17,11 @@ class User(Base):
     id = Column(SQLUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     supabase_user_id = Column(SQLUUID(as_uuid=True), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Signup stats and cohorts
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_entry_date = Column(Date, nullable=True, index=True)  # For daily limit check
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on every entry write (ETags)
+    reset_generation = Column(Integer, nullable=False, default=0, server_default="0")  # Entries from older generations are hidden
 
     # Relationship to daily entries
     entries = relationship("DailyEntry", back_populates="user", cascade="all, delete-orphan")
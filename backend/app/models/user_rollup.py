@@ -0,0 +1,49 @@
+"""
+Rollup models - running per-user totals derived from daily_entries.
+Maintained in the same transaction as entry inserts and resets so
+statistics can be read from a single row instead of scanning entries.
+"""
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, UUID as SQLUUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class UserRollup(Base):
+    """All-time entry count and per-category hour sums for one user."""
+
+    __tablename__ = "user_rollups"
+
+    user_id = Column(SQLUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entry_count = Column(Integer, nullable=False, default=0)
+    casual_total = Column(Float, nullable=False, default=0.0)
+    serious_total = Column(Float, nullable=False, default=0.0)
+    project_total = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def total_hours(self) -> float:
+        return self.casual_total + self.serious_total + self.project_total
+
+    def __repr__(self):
+        return f"<UserRollup(user_id={self.user_id}, entries={self.entry_count}, total={self.total_hours}h)>"
+
+
+class UserMonthlyRollup(Base):
+    """Entry count and per-category hour sums for one user in one calendar month."""
+
+    __tablename__ = "user_monthly_rollups"
+
+    user_id = Column(SQLUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    entry_count = Column(Integer, nullable=False, default=0)
+    casual_total = Column(Float, nullable=False, default=0.0)
+    serious_total = Column(Float, nullable=False, default=0.0)
+    project_total = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def total_hours(self) -> float:
+        return self.casual_total + self.serious_total + self.project_total
+
+    def __repr__(self):
+        return f"<UserMonthlyRollup(user_id={self.user_id}, month={self.month}, entries={self.entry_count})>"
@@ -2,8 +2,8 @@
 Pydantic schemas for admin endpoints.
 """
 from pydantic import BaseModel
-from typing import Dict
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
 from uuid import UUID
 
 
@@ -33,3 +33,64 @@ class WordCloudResponse(BaseModel):
     project_notes_count: int
 
     model_config = {"from_attributes": True}
+
+
+class TermWeight(BaseModel):
+    """A word cloud term with its occurrence count."""
+    term: str
+    count: int
+    weight: float  # count relative to the category's most frequent term (0-1]
+
+
+class WordCloudTermsResponse(BaseModel):
+    """Top-N weighted terms per leisure type, from the term index."""
+    casual: List[TermWeight]
+    serious: List[TermWeight]
+    project: List[TermWeight]
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class BackgroundJobResponse(BaseModel):
+    """A background job row, for the admin job list."""
+    id: UUID
+    queue: str
+    name: str
+    status: str  # "queued", "running", "done" or "failed"
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    run_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class SystemDayStats(BaseModel):
+    """Activity across all users on one day."""
+    day: date
+    active_users: int
+    entry_count: int
+    casual_total: float
+    serious_total: float
+    project_total: float
+    total_hours: float
+    new_users: int
+
+
+class SystemDailyStatsResponse(BaseModel):
+    """System-wide daily stats for a date range (days without activity are zeros)."""
+    start_date: date
+    end_date: date
+    days: List[SystemDayStats]
+    updated_at: Optional[datetime] = None  # Latest refresh of any day in the range
+
+
+class CohortResponse(BaseModel):
+    """Weekly retention of the users who signed up in one week."""
+    cohort_week: date  # Monday of the signup week
+    users: int
+    active_users: List[int]  # Index = weeks since signup week, up to the current week
+    retention: List[float]  # active_users / users
@@ -4,7 +4,10 @@ Schemas for daily entry requests and responses.
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import date, datetime
 from uuid import UUID
-from typing import Optional
+from typing import Any, Dict, Optional
+
+# Largest batch accepted by POST /entries/bulk
+MAX_BULK_ENTRIES = 5000
 
 
 class DailyEntryCreate(BaseModel):
@@ -71,9 +74,49 @@ class CanSubmitResponse(BaseModel):
 
 
 class EntryListResponse(BaseModel):
-    """Schema for paginated entry list."""
+    """Schema for paginated entry list.
+    page/total_pages are set in page-number mode only; total is omitted when
+    not requested. next_cursor is None on the last page."""
     entries: list[DailyEntryResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class CalendarResponse(BaseModel):
+    """Schema for a user's submission calendar for one year.
+    presence is a base64 bitmap: bit i (least significant bit first in each
+    byte) is set when day i of the year (0 = January 1) has an entry.
+    totals, when requested, is base64 of a little-endian float32 array
+    (a Float32Array of `days` total hours, 0 where there is no entry)."""
+    year: int
+    days: int  # 365 or 366
+    entry_count: int
+    presence: str
+    totals: Optional[str] = None
+
+
+class BulkEntryRequest(BaseModel):
+    """Schema for a batch of retroactive entries.
+    Items are validated one by one (same rules as DailyEntryCreate) so a bad
+    item is reported instead of rejecting the whole batch."""
+    entries: list[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BULK_ENTRIES)
+
+
+class BulkEntryResult(BaseModel):
+    """Outcome of one item of a bulk import."""
+    index: int
+    status: str  # "accepted", "conflict" or "invalid"
+    entry_date: Optional[date] = None
+    id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+
+class BulkEntryResponse(BaseModel):
+    """Schema for bulk import results."""
+    accepted: int
+    conflicts: int
+    invalid: int
+    results: list[BulkEntryResult]
@@ -1,8 +1,10 @@
 """
 Schemas for statistics responses.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, computed_field
+from datetime import datetime
 from typing import Optional
+from uuid import UUID
 
 
 class CategoryStats(BaseModel):
@@ -23,10 +25,47 @@ class OverallStats(BaseModel):
     period: Optional[str] = None  # "week", "month", or "all"
 
 
+class RollingAverages(BaseModel):
+    """Trailing N-day averages of daily hours, aligned with TrendData.dates.
+    Days without an entry count as 0 hours."""
+    window: int  # Days in the window (7 or 30)
+    casual_hours: list[float]
+    serious_hours: list[float]
+    project_hours: list[float]
+    total_hours: list[float]
+
+
 class TrendData(BaseModel):
-    """Trend data for charts."""
-    dates: list[str]  # ISO format dates
+    """Trend data for charts: one point per day/week/month bucket, gaps filled with 0."""
+    dates: list[str]  # ISO format dates (first day of each bucket)
     casual_hours: list[float]
     serious_hours: list[float]
     project_hours: list[float]
     total_hours: list[float]
+    entry_counts: list[int] = []  # Entries in each bucket
+    granularity: str = "day"  # "day", "week" or "month"
+    rolling: Optional[RollingAverages] = None
+
+
+class ResetJobResponse(BaseModel):
+    """Progress of a data reset. Entries are hidden as soon as the reset is
+    accepted; deleted_entries counts rows purged in the background so far."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    status: str  # "pending", "running", "done" or "failed"
+    total_entries: int
+    deleted_entries: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Fraction of the purge completed (0.0 - 1.0)."""
+        if self.status == "done":
+            return 1.0
+        if not self.total_entries:
+            return 0.0
+        return round(min(self.deleted_entries / self.total_entries, 1.0), 4)
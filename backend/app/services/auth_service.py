@@ -2,9 +2,38 @@
 Authentication service - integrates with Supabase Auth.
 Handles OTP sending, verification, and token validation.
 """
+import time
 import httpx
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from app.config import settings
+from app.services.token_verifier import SupabaseTokenVerifier, TokenNotVerifiable
+
+
+# Called with (operation, seconds, outcome) after every Supabase request
+CallObserver = Callable[[str, float, str], None]
+
+
+class _ObservedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper reporting the duration and outcome of each request."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, observer: CallObserver):
+        self._transport = transport
+        self._observer = observer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Operation is the last path segment: user, otp, verify, token, jwks.json
+        operation = request.url.path.rsplit("/", 1)[-1]
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+            outcome = str(response.status_code)
+            return response
+        finally:
+            self._observer(operation, time.perf_counter() - start, outcome)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
 
 
 class SupabaseAuthService:
@@ -15,6 +44,50 @@ class SupabaseAuthService:
         self.anon_key = settings.supabase_anon_key
         self.service_key = settings.supabase_service_key
         self.auth_url = f"{self.supabase_url}/auth/v1"
+        self.token_verifier = SupabaseTokenVerifier(fetch_jwks=self.fetch_jwks)
+
+        # Shared keep-alive client, opened/closed by the app lifespan
+        self._client: Optional[httpx.AsyncClient] = None
+        # Set by app.metrics when metrics are enabled (before the client is built)
+        self.call_observer: Optional[CallObserver] = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client used for all Supabase calls."""
+        transport = httpx.AsyncHTTPTransport(
+            http2=settings.supabase_http2,
+            limits=httpx.Limits(
+                max_connections=settings.supabase_max_connections,
+                max_keepalive_connections=settings.supabase_max_keepalive_connections,
+                keepalive_expiry=settings.supabase_keepalive_expiry,
+            ),
+        )
+        if self.call_observer is not None:
+            transport = _ObservedTransport(transport, self.call_observer)
+
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                settings.supabase_timeout,
+                connect=settings.supabase_connect_timeout,
+            ),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client (created lazily if start() was not called)."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self) -> None:
+        """Open the shared HTTP client. Called from the app lifespan."""
+        _ = self.client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _get_headers(self, use_service_key: bool = False) -> Dict[str, str]:
         """Get headers for Supabase API requests."""
@@ -35,21 +108,20 @@ class SupabaseAuthService:
         Returns:
             Response from Supabase
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.auth_url}/otp",
-                headers=self._get_headers(),
-                json={
-                    "email": email,
-                    "create_user": True,  # Create user if doesn't exist
-                    "options": {
-                        "should_create_user": True,
-                        "email_redirect_to": None  # Disable magic link, force OTP
-                    }
+        response = await self.client.post(
+            f"{self.auth_url}/otp",
+            headers=self._get_headers(),
+            json={
+                "email": email,
+                "create_user": True,  # Create user if doesn't exist
+                "options": {
+                    "should_create_user": True,
+                    "email_redirect_to": None  # Disable magic link, force OTP
                 }
-            )
-            response.raise_for_status()
-            return response.json()
+            }
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def verify_otp(self, email: str, otp: str) -> Dict[str, Any]:
         """
@@ -62,18 +134,17 @@ class SupabaseAuthService:
         Returns:
             Dict with access_token, refresh_token, and user info
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.auth_url}/verify",
-                headers=self._get_headers(),
-                json={
-                    "email": email,
-                    "token": otp,
-                    "type": "email"
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(
+            f"{self.auth_url}/verify",
+            headers=self._get_headers(),
+            json={
+                "email": email,
+                "token": otp,
+                "type": "email"
+            }
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_user_from_token(self, access_token: str) -> Optional[Dict[str, Any]]:
         """
@@ -86,20 +157,57 @@ class SupabaseAuthService:
             User info if token is valid, None otherwise
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.auth_url}/user",
-                    headers={
-                        "apikey": self.anon_key,
-                        "Authorization": f"Bearer {access_token}",
-                    }
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            response = await self.client.get(
+                f"{self.auth_url}/user",
+                headers={
+                    "apikey": self.anon_key,
+                    "Authorization": f"Bearer {access_token}",
+                },
+                timeout=settings.supabase_user_timeout
+            )
+            if response.status_code == 200:
+                return response.json()
+            return None
         except httpx.HTTPError:
             return None
 
+    async def verify_token(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate access token using the configured verification mode.
+        In local mode the JWT is checked in-process; Supabase is only called
+        when the token can't be checked locally and the fallback is enabled.
+
+        Args:
+            access_token: JWT access token
+
+        Returns:
+            User info if token is valid, None otherwise
+        """
+        if not settings.use_local_token_verification:
+            return await self.get_user_from_token(access_token)
+
+        try:
+            return await self.token_verifier.verify(access_token)
+        except TokenNotVerifiable:
+            if settings.auth_remote_fallback:
+                return await self.get_user_from_token(access_token)
+            return None
+
+    async def fetch_jwks(self) -> Dict[str, Any]:
+        """
+        Fetch the project's JSON Web Key Set.
+
+        Returns:
+            JWKS document with the current signing keys
+        """
+        response = await self.client.get(
+            f"{self.auth_url}/.well-known/jwks.json",
+            headers={"apikey": self.anon_key},
+            timeout=settings.supabase_user_timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
     async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
         """
         Refresh access token using refresh token.
@@ -110,14 +218,13 @@ class SupabaseAuthService:
         Returns:
             New access_token and refresh_token
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.auth_url}/token?grant_type=refresh_token",
-                headers=self._get_headers(),
-                json={"refresh_token": refresh_token}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(
+            f"{self.auth_url}/token?grant_type=refresh_token",
+            headers=self._get_headers(),
+            json={"refresh_token": refresh_token}
+        )
+        response.raise_for_status()
+        return response.json()
 
 
 # Global service instance
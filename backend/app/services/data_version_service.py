@@ -0,0 +1,84 @@
+"""
+Data version service - per-user counter of entry changes.
+Bumped in the same transaction as every entry insert and reset, so a
+(user, version) pair identifies the state of a user's data and can be used
+as an ETag for read endpoints.
+"""
+import hashlib
+from datetime import date, datetime
+from typing import Any, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, Update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+
+class DataState(NamedTuple):
+    """A user's data version and when the users row last changed (bumps set updated_at)."""
+
+    version: int
+    changed_at: Optional[datetime]
+
+
+class DataVersionService:
+    """Reads and bumps users.data_version and derives ETags from it."""
+
+    async def bump(self, db: AsyncSession, user_id: UUID, **values: Any) -> None:
+        """
+        Mark the user's entries as changed.
+        Must run in the same transaction as the entry write.
+
+        Args:
+            db: Database session (not committed here)
+            user_id: User whose entries changed
+            values: Other users columns to set in the same UPDATE (e.g. last_entry_date)
+        """
+        await db.execute(self.bump_statement(user_id, **values))
+
+    @staticmethod
+    def bump_statement(user_id: UUID, **values: Any) -> Update:
+        """
+        The UPDATE behind bump(), for callers that embed it in a larger
+        statement (e.g. as a CTE next to the entry INSERT).
+        """
+        return (
+            update(User)
+            .where(User.id == user_id)
+            .values(data_version=User.data_version + 1, **values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_state(self, db: AsyncSession, user_id: UUID) -> Optional[DataState]:
+        """Read the user's data version and last change time in one primary-key lookup."""
+        result = await db.execute(select(User.data_version, User.updated_at).where(User.id == user_id))
+        row = result.one_or_none()
+        return DataState(row.data_version, row.updated_at) if row else None
+
+    @staticmethod
+    def etag(user_id: UUID, version: int, today: date) -> str:
+        """
+        Build a weak ETag for a user's data.
+
+        The date is part of the tag because some responses (today's entry,
+        week/month periods, trends) change at midnight without a write.
+        The user id is hashed in so two users' tags never collide in a
+        shared browser cache.
+        """
+        digest = hashlib.sha1(f"{user_id}:{version}:{today.isoformat()}".encode()).hexdigest()
+        return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+# Global service instance
+data_version_service = DataVersionService()
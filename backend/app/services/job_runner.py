@@ -0,0 +1,407 @@
+"""
+Job runner - in-process background jobs over the durable background_jobs table.
+
+Handlers are registered by name and enqueued as rows in the caller's
+transaction, so a job exists exactly when the change that needs it was
+committed (and local workers are woken on commit). Each configured queue runs
+a fixed number of workers that claim due jobs with FOR UPDATE SKIP LOCKED,
+so several processes can share the queues. A failed job is retried with
+exponential backoff until its max_attempts; a job left running by a crashed
+process is requeued once its lease expires. Periodic jobs are enqueued by a
+scheduler loop once per interval, deduplicated across processes.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, exists, func, case, extract, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.background_job import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Awaitable[Any]]
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("done", "failed")
+# Lease recovery and retention run at most this often (seconds)
+MAINTENANCE_INTERVAL = 60.0
+
+
+class JobDefinition:
+    """A registered handler and where its jobs run."""
+
+    def __init__(self, name: str, handler: Handler, queue: str, max_attempts: int):
+        self.name = name
+        self.handler = handler
+        self.queue = queue
+        self.max_attempts = max_attempts
+
+
+class PeriodicJob:
+    """A job enqueued once every `interval` seconds (wall clock, aligned to the epoch)."""
+
+    def __init__(self, name: str, interval: float, payload: Dict[str, Any]):
+        self.name = name
+        self.interval = interval
+        self.payload = payload
+        self.last_slot: Optional[int] = None
+
+    def current_slot(self) -> int:
+        return int(time.time() // self.interval)
+
+
+class JobRunner:
+    """Registry, enqueueing and in-process workers for background jobs."""
+
+    def __init__(self):
+        self.definitions: Dict[str, JobDefinition] = {}
+        self.periodic: List[PeriodicJob] = []
+        self.running = 0  # Jobs executing in this process
+        self._wake: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._last_maintenance = 0.0
+
+    def register(
+        self,
+        name: str,
+        handler: Handler,
+        queue: str = "default",
+        max_attempts: Optional[int] = None
+    ) -> None:
+        """
+        Register a handler. It is called with the job payload as keyword
+        arguments and opens its own sessions; raising marks the attempt failed.
+
+        Args:
+            name: Job name used when enqueueing
+            handler: Async callable
+            queue: Queue whose workers run the job
+            max_attempts: Attempts before the job is marked failed (default JOB_MAX_ATTEMPTS)
+        """
+        self.definitions[name] = JobDefinition(name, handler, queue, max_attempts or settings.job_max_attempts)
+
+    def every(self, name: str, interval_seconds: float, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Enqueue a registered job every `interval_seconds` while the runner is started."""
+        self.periodic.append(PeriodicJob(name, interval_seconds, payload or {}))
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        delay_seconds: float = 0,
+        dedupe_key: Optional[str] = None
+    ) -> Optional[UUID]:
+        """
+        Add a job in the caller's transaction (not committed here).
+
+        Args:
+            db: Database session
+            name: Registered job name
+            payload: JSON-serializable keyword arguments for the handler
+            delay_seconds: Earliest start, relative to now
+            dedupe_key: Skip the job if one with this key is already queued or running
+
+        Returns:
+            Id of the new job, or None when deduplicated
+        """
+        definition = self.definitions.get(name)
+        if definition is None:
+            raise ValueError(f"Unknown job: {name}")
+
+        run_at = func.now() + timedelta(seconds=delay_seconds) if delay_seconds else func.now()
+        result = await db.execute(
+            pg_insert(BackgroundJob)
+            .values(
+                id=uuid.uuid4(),
+                queue=definition.queue,
+                name=name,
+                payload=payload or {},
+                status="queued",
+                attempts=0,
+                max_attempts=definition.max_attempts,
+                dedupe_key=dedupe_key,
+                run_at=run_at
+            )
+            .on_conflict_do_nothing(
+                index_elements=[BackgroundJob.dedupe_key],
+                index_where=BackgroundJob.status.in_(ACTIVE_STATUSES)
+            )
+            .returning(BackgroundJob.id)
+        )
+        job_id = result.scalar_one_or_none()
+        if job_id is not None:
+            # Wake local workers once the job is visible to them
+            event.listen(db.sync_session, "after_commit", lambda _: self.notify(definition.queue), once=True)
+        return job_id
+
+    def notify(self, queue: str) -> None:
+        """Wake this process's workers of a queue instead of waiting for the next poll."""
+        wake = self._wake.get(queue)
+        if wake is not None:
+            wake.set()
+
+    # --- Execution ---
+
+    async def run_next(self, queue: str) -> bool:
+        """
+        Claim and run the next due job of a queue.
+
+        Returns:
+            False when no job was due
+        """
+        async with AsyncSessionLocal() as db:
+            due = (
+                select(BackgroundJob.id)
+                .where(
+                    BackgroundJob.queue == queue,
+                    BackgroundJob.status == "queued",
+                    BackgroundJob.run_at <= func.now()
+                )
+                .order_by(BackgroundJob.run_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == due)
+                .values(status="running", attempts=BackgroundJob.attempts + 1, started_at=func.now())
+                .returning(BackgroundJob.id, BackgroundJob.name, BackgroundJob.payload,
+                           BackgroundJob.attempts, BackgroundJob.max_attempts)
+                .execution_options(synchronize_session=False)
+            )
+            job = result.one_or_none()
+            await db.commit()
+        if job is None:
+            return False
+
+        self.running += 1
+        try:
+            definition = self.definitions.get(job.name)
+            if definition is None:
+                raise LookupError(f"No handler registered for job '{job.name}'")
+            await definition.handler(**job.payload)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without counting the attempt
+            await self._finish(job.id, status="queued", attempts=BackgroundJob.attempts - 1, started_at=None)
+            raise
+        except Exception as e:
+            logger.warning("Job %s (%s) failed on attempt %d: %s", job.name, job.id, job.attempts, e)
+            if job.attempts >= job.max_attempts:
+                await self._finish(job.id, status="failed", error=str(e), finished_at=func.now())
+            else:
+                delay = min(settings.job_retry_base_seconds * 2 ** (job.attempts - 1), settings.job_retry_max_seconds)
+                await self._finish(
+                    job.id, status="queued", error=str(e), run_at=func.now() + timedelta(seconds=delay)
+                )
+        else:
+            await self._finish(job.id, status="done", finished_at=func.now())
+        finally:
+            self.running -= 1
+        return True
+
+    async def _finish(self, job_id: UUID, **values: Any) -> None:
+        """Record the outcome of an attempt (unless the job was requeued after its lease expired)."""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id, BackgroundJob.status == "running")
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    # --- Scheduling and maintenance ---
+
+    async def enqueue_periodic(self) -> int:
+        """
+        Enqueue periodic jobs whose interval slot hasn't been enqueued yet.
+        The slot is part of the dedupe key and checked across all statuses,
+        so each slot runs once however many processes are scheduling.
+
+        Returns:
+            Number of jobs enqueued
+        """
+        enqueued = 0
+        async with AsyncSessionLocal() as db:
+            for periodic in self.periodic:
+                slot = periodic.current_slot()
+                if slot == periodic.last_slot:
+                    continue
+                dedupe_key = f"periodic:{periodic.name}:{slot}"
+                seen = await db.scalar(select(exists().where(BackgroundJob.dedupe_key == dedupe_key)))
+                if not seen and await self.enqueue(db, periodic.name, periodic.payload, dedupe_key=dedupe_key):
+                    enqueued += 1
+                periodic.last_slot = slot
+            await db.commit()
+        return enqueued
+
+    async def recover_expired(self) -> int:
+        """Requeue jobs running longer than JOB_LEASE_SECONDS (their worker is presumed dead)."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(
+                    BackgroundJob.status == "running",
+                    BackgroundJob.started_at < func.now() - timedelta(seconds=settings.job_lease_seconds)
+                )
+                .values(
+                    status=case(
+                        (BackgroundJob.attempts >= BackgroundJob.max_attempts, "failed"),
+                        else_="queued"
+                    ),
+                    error="Lease expired",
+                    run_at=func.now()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return result.rowcount
+
+    async def delete_finished(self) -> int:
+        """Delete finished jobs older than JOB_RETENTION_HOURS."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(BackgroundJob)
+                .where(
+                    BackgroundJob.status.in_(FINISHED_STATUSES),
+                    BackgroundJob.finished_at < func.now() - timedelta(hours=settings.job_retention_hours)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return result.rowcount
+
+    async def tick(self) -> None:
+        """One scheduler pass: periodic jobs, plus lease recovery and retention now and then."""
+        await self.enqueue_periodic()
+        if time.monotonic() - self._last_maintenance >= MAINTENANCE_INTERVAL:
+            self._last_maintenance = time.monotonic()
+            await self.recover_expired()
+            await self.delete_finished()
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        """Start the scheduler and the configured workers (call from the app lifespan)."""
+        if self._tasks:
+            return
+        queues = settings.job_queue_concurrency
+        for definition in self.definitions.values():
+            if definition.queue not in queues:
+                logger.warning("Job %s uses queue %s, which has no workers", definition.name, definition.queue)
+        for queue, concurrency in queues.items():
+            self._wake[queue] = asyncio.Event()
+            for _ in range(concurrency):
+                self._tasks.append(asyncio.create_task(self._work(queue)))
+        self._tasks.append(asyncio.create_task(self._schedule()))
+
+    async def stop(self) -> None:
+        """Stop all loops; running jobs are handed back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wake = {}
+
+    async def _work(self, queue: str) -> None:
+        wake = self._wake[queue]
+        while True:
+            try:
+                if await self.run_next(queue):
+                    continue
+            except Exception as e:
+                logger.warning("Job worker for queue %s failed: %s", queue, e)
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=settings.job_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+
+    async def _schedule(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.warning("Job scheduler failed: %s", e)
+            await asyncio.sleep(settings.job_poll_interval_seconds)
+
+    # --- Reporting ---
+
+    async def queue_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """
+        Depth and latency per queue, across all processes.
+        Wait is run_at to start of the last attempt, run time is start to
+        finish; both are over jobs finished in the last hour.
+
+        Returns:
+            Dict of queue name -> stats, plus this process's worker state
+        """
+        due = (BackgroundJob.status == "queued") & (BackgroundJob.run_at <= func.now())
+        recent = BackgroundJob.finished_at >= func.now() - timedelta(hours=1)
+        done_recently = (BackgroundJob.status == "done") & recent
+        wait_ms = extract("epoch", BackgroundJob.started_at - BackgroundJob.run_at) * 1000
+        run_ms = extract("epoch", BackgroundJob.finished_at - BackgroundJob.started_at) * 1000
+
+        def percentile(fraction: float, value):
+            return func.percentile_cont(fraction).within_group(value).filter(done_recently)
+
+        result = await db.execute(
+            select(
+                BackgroundJob.queue,
+                func.count().filter(BackgroundJob.status == "queued").label("queued"),
+                func.count().filter(due).label("due"),
+                func.count().filter(BackgroundJob.status == "running").label("running"),
+                func.count().filter(BackgroundJob.status == "failed").label("failed"),
+                func.max(extract("epoch", func.now() - BackgroundJob.run_at)).filter(due).label("oldest_due_seconds"),
+                func.count().filter(done_recently).label("done_last_hour"),
+                func.count().filter((BackgroundJob.status == "failed") & recent).label("failed_last_hour"),
+                percentile(0.5, wait_ms).label("wait_p50_ms"),
+                percentile(0.95, wait_ms).label("wait_p95_ms"),
+                percentile(0.5, run_ms).label("run_p50_ms"),
+                percentile(0.95, run_ms).label("run_p95_ms"),
+            ).group_by(BackgroundJob.queue)
+        )
+
+        concurrency = settings.job_queue_concurrency
+        queues: Dict[str, Any] = {}
+        for row in result:
+            stats = row._asdict()
+            name = stats.pop("queue")
+            queues[name] = {
+                key: round(float(value), 1) if key.endswith(("_ms", "_seconds")) and value is not None else value
+                for key, value in stats.items()
+            }
+            queues[name]["concurrency"] = concurrency.get(name, 0)
+        # Configured queues that have never had a job
+        for name, workers in concurrency.items():
+            if name not in queues:
+                queues[name] = {
+                    "queued": 0, "due": 0, "running": 0, "failed": 0, "oldest_due_seconds": None,
+                    "done_last_hour": 0, "failed_last_hour": 0, "wait_p50_ms": None, "wait_p95_ms": None,
+                    "run_p50_ms": None, "run_p95_ms": None, "concurrency": workers,
+                }
+
+        return {
+            "queues": queues,
+            "local": {
+                "started": bool(self._tasks),
+                "running": self.running,
+                "jobs": sorted(self.definitions),
+                "periodic": {periodic.name: periodic.interval for periodic in self.periodic},
+            },
+        }
+
+
+# Global instance
+job_runner = JobRunner()
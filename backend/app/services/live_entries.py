@@ -0,0 +1,30 @@
+"""
+Filters for the entries users can see.
+A reset hides a user's entries by bumping users.reset_generation; each entry
+keeps the generation it was written in, so only rows of the user's current
+generation are visible. Hidden rows stay in daily_entries until the reset
+purger (reset_service) deletes them.
+"""
+from uuid import UUID
+
+from sqlalchemy import select, and_
+
+from app.models.daily_entry import DailyEntry
+from app.models.user import User
+
+
+def current_generation(user_id: UUID):
+    """The user's reset generation as a scalar subquery (read in the same statement)."""
+    return select(User.reset_generation).where(User.id == user_id).scalar_subquery()
+
+
+def live_entries(user_id: UUID):
+    """Filter for a user's visible entries (rows hidden by a reset are excluded)."""
+    return and_(DailyEntry.user_id == user_id, DailyEntry.reset_generation == current_generation(user_id))
+
+
+def all_live_entries():
+    """Filter for every user's visible entries (for queries across users)."""
+    return DailyEntry.reset_generation == (
+        select(User.reset_generation).where(User.id == DailyEntry.user_id).scalar_subquery()
+    )
@@ -0,0 +1,212 @@
+"""
+Reset service - hides a user's entries instantly and purges them in the background.
+
+A reset bumps users.reset_generation. Every entry carries the generation it
+was written in, and reads only see rows of the user's current generation
+(see live_entries), so the data disappears in one small UPDATE. Rollups are
+cleared, the user's notes subtracted from the term index and their dates
+marked for the system stats refresh at once, so all of them only ever count
+visible entries.
+A DataReset job records the reset; the "reset_purge" background job deletes
+the hidden rows in bounded batches and tracks progress on the DataReset.
+Each batch is its own transaction and deleting hidden rows is idempotent,
+so an interrupted purge simply continues after a restart.
+"""
+from datetime import date
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.daily_entry import DailyEntry
+from app.models.data_reset import DataReset
+from app.models.user import User
+from app.services.data_version_service import data_version_service
+from app.services.job_runner import job_runner
+from app.services.live_entries import current_generation, live_entries
+from app.services.rollup_service import rollup_service
+from app.services.system_stats_service import system_stats_service
+from app.services.term_index_service import term_index_service
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class ResetService:
+    """Starts resets, reports their progress and purges hidden entries."""
+
+    async def start_reset(self, db: AsyncSession, user_id: UUID) -> DataReset:
+        """
+        Hide all of a user's entries and queue their deletion.
+        Idempotent: with nothing visible left and a purge still running, the
+        running job is returned instead of starting another reset.
+
+        Args:
+            db: Database session (committed here)
+            user_id: User whose data is reset
+
+        Returns:
+            The purge job
+        """
+        rollup = await rollup_service.get_user_rollup(db, user_id)
+        if rollup is None:
+            active = await db.execute(
+                select(DataReset)
+                .where(DataReset.user_id == user_id, DataReset.status.in_(ACTIVE_STATUSES))
+                .order_by(DataReset.created_at.desc())
+                .limit(1)
+            )
+            job = active.scalar_one_or_none()
+            if job is not None:
+                return job
+
+        # Still visible until the UPDATE below hides them
+        await term_index_service.remove_user(db, user_id)
+        await db.execute(
+            system_stats_service.mark_days_statement(select(DailyEntry.entry_date).where(live_entries(user_id)))
+        )
+
+        # One UPDATE: new generation (hides every entry), cleared last_entry_date, new ETag
+        result = await db.execute(
+            data_version_service.bump_statement(
+                user_id,
+                reset_generation=User.reset_generation + 1,
+                last_entry_date=None
+            ).returning(User.reset_generation)
+        )
+        generation = result.scalar_one()
+        await rollup_service.reset_user(db, user_id)
+
+        job = DataReset(
+            user_id=user_id,
+            reset_generation=generation,
+            status="pending",
+            total_entries=rollup.entry_count if rollup else 0,
+            deleted_entries=0,
+            attempts=0
+        )
+        db.add(job)
+        await job_runner.enqueue(db, "reset_purge")
+        await db.commit()
+        return job
+
+    async def get_job(self, db: AsyncSession, user_id: UUID, job_id: UUID) -> Optional[DataReset]:
+        """Get one of the user's reset jobs (None if missing or owned by someone else)."""
+        result = await db.execute(
+            select(DataReset).where(DataReset.id == job_id, DataReset.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def purge_dates(self, db: AsyncSession, user_id: UUID, dates: Iterable[date]) -> int:
+        """
+        Delete the user's hidden entries on specific dates right away, so new
+        entries for those dates don't collide with them on (user_id, entry_date).
+
+        Args:
+            db: Database session (not committed here)
+            user_id: Owner of the entries
+            dates: Entry dates about to be written
+
+        Returns:
+            Number of hidden entries deleted
+        """
+        result = await db.execute(
+            delete(DailyEntry)
+            .where(
+                DailyEntry.user_id == user_id,
+                DailyEntry.entry_date.in_(list(dates)),
+                DailyEntry.reset_generation != current_generation(user_id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def purge_batch(self, batch_size: int) -> Optional[UUID]:
+        """
+        Delete one batch of hidden entries for the oldest unfinished job.
+        The job row is locked (SKIP LOCKED) for the batch, so several workers
+        can run purgers without processing the same job at once.
+
+        Args:
+            batch_size: Maximum entries deleted in this transaction
+
+        Returns:
+            Id of the job worked on, or None when no job is waiting
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(DataReset)
+                .where(DataReset.status.in_(ACTIVE_STATUSES))
+                .order_by(DataReset.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if job is None:
+                return None
+
+            job_id = job.id
+            try:
+                batch = (
+                    select(DailyEntry.id)
+                    .where(
+                        DailyEntry.user_id == job.user_id,
+                        DailyEntry.reset_generation < job.reset_generation
+                    )
+                    .limit(batch_size)
+                )
+                deleted = await db.execute(
+                    delete(DailyEntry)
+                    .where(DailyEntry.id.in_(batch))
+                    .returning(DailyEntry.entry_date)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = deleted.all()
+                await system_stats_service.mark_days(db, (row.entry_date for row in rows))
+
+                job.deleted_entries += len(rows)
+                job.status = "running"
+                if len(rows) < batch_size:
+                    job.status = "done"
+                    job.finished_at = func.now()
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                await self._record_failure(db, job_id, e)
+                raise
+            return job_id
+
+    async def _record_failure(self, db: AsyncSession, job_id: UUID, error: Exception) -> None:
+        """Count a failed batch; give up on the job after reset_purge_max_attempts."""
+        job = await db.get(DataReset, job_id)
+        if job is None:
+            return
+        job.attempts += 1
+        job.error = str(error)
+        if job.attempts >= settings.reset_purge_max_attempts:
+            job.status = "failed"
+            job.finished_at = func.now()
+        await db.commit()
+
+    async def purge_pending(self, batch_size: Optional[int] = None) -> int:
+        """
+        Work through all waiting jobs until none is left.
+
+        Returns:
+            Number of batches processed
+        """
+        batch_size = batch_size or settings.reset_purge_batch_size
+        batches = 0
+        while await self.purge_batch(batch_size) is not None:
+            batches += 1
+        return batches
+
+
+# Global instance
+reset_service = ResetService()
+
+# Each reset enqueues a purge; the periodic run also picks up jobs whose purge failed or was cut short
+job_runner.register("reset_purge", reset_service.purge_pending, queue="maintenance")
+job_runner.every("reset_purge", settings.reset_purge_interval_seconds)
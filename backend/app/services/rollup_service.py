@@ -0,0 +1,222 @@
+"""
+Rollup service - maintains per-user running totals of daily entries.
+Entries are immutable once written and only removed by a full reset, so
+totals can be kept exact by incrementing on insert and clearing on reset.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, insert, or_, and_, cast, null, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.daily_entry import DailyEntry
+from app.models.user_rollup import UserRollup, UserMonthlyRollup
+from app.services.live_entries import all_live_entries
+
+# Tolerance when comparing float sums in the consistency check
+SUM_TOLERANCE = 1e-6
+
+
+def month_start(day: date) -> date:
+    """Return the first day of the month containing day."""
+    return day.replace(day=1)
+
+
+class RollupService:
+    """Keeps user_rollups and user_monthly_rollups in step with daily_entries."""
+
+    async def apply_entries(self, db: AsyncSession, user_id: UUID, entries: Iterable[Any]) -> None:
+        """
+        Add newly inserted entries to the user's rollups.
+        Must run in the same transaction as the entry INSERT.
+
+        Args:
+            db: Database session (not committed here)
+            user_id: Owner of the entries
+            entries: Objects with entry_date and the three *_leisure_hours attributes
+        """
+        months: Dict[date, List[float]] = defaultdict(lambda: [0, 0.0, 0.0, 0.0])
+        for entry in entries:
+            bucket = months[month_start(entry.entry_date)]
+            bucket[0] += 1
+            bucket[1] += entry.casual_leisure_hours
+            bucket[2] += entry.serious_leisure_hours
+            bucket[3] += entry.project_leisure_hours
+
+        if not months:
+            return
+
+        totals = [sum(bucket[i] for bucket in months.values()) for i in range(4)]
+        await db.execute(self._upsert(
+            UserRollup,
+            [UserRollup.user_id],
+            [{
+                "user_id": user_id,
+                "entry_count": totals[0],
+                "casual_total": totals[1],
+                "serious_total": totals[2],
+                "project_total": totals[3],
+            }]
+        ))
+        await db.execute(self._upsert(
+            UserMonthlyRollup,
+            [UserMonthlyRollup.user_id, UserMonthlyRollup.month],
+            [
+                {
+                    "user_id": user_id,
+                    "month": month,
+                    "entry_count": bucket[0],
+                    "casual_total": bucket[1],
+                    "serious_total": bucket[2],
+                    "project_total": bucket[3],
+                }
+                for month, bucket in sorted(months.items())
+            ]
+        ))
+
+    @staticmethod
+    def _upsert(model, index_elements, rows):
+        """INSERT rows, adding to the existing counters on conflict."""
+        stmt = pg_insert(model).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={
+                "entry_count": model.entry_count + stmt.excluded.entry_count,
+                "casual_total": model.casual_total + stmt.excluded.casual_total,
+                "serious_total": model.serious_total + stmt.excluded.serious_total,
+                "project_total": model.project_total + stmt.excluded.project_total,
+                "updated_at": func.now(),
+            }
+        )
+
+    async def reset_user(self, db: AsyncSession, user_id: UUID) -> None:
+        """
+        Clear a user's rollups. Must run in the same transaction as the entry DELETE.
+
+        Args:
+            db: Database session (not committed here)
+            user_id: User whose entries were deleted
+        """
+        await db.execute(delete(UserRollup).where(UserRollup.user_id == user_id))
+        await db.execute(delete(UserMonthlyRollup).where(UserMonthlyRollup.user_id == user_id))
+
+    async def get_user_rollup(self, db: AsyncSession, user_id: UUID) -> Optional[UserRollup]:
+        """Get the all-time rollup row for a user (None if the user has no entries)."""
+        result = await db.execute(select(UserRollup).where(UserRollup.user_id == user_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _aggregate_columns():
+        """Count and per-category sums over daily_entries, named like the rollup columns."""
+        return (
+            func.count().label("entry_count"),
+            func.coalesce(func.sum(DailyEntry.casual_leisure_hours), 0.0).label("casual_total"),
+            func.coalesce(func.sum(DailyEntry.serious_leisure_hours), 0.0).label("serious_total"),
+            func.coalesce(func.sum(DailyEntry.project_leisure_hours), 0.0).label("project_total"),
+        )
+
+    async def rebuild(self, db: AsyncSession, user_id: Optional[UUID] = None) -> None:
+        """
+        Recompute rollups from daily_entries (backfill or repair).
+
+        Args:
+            db: Database session (not committed here)
+            user_id: Rebuild one user only; None rebuilds everyone
+        """
+        month = cast(func.date_trunc("month", DailyEntry.entry_date), Date)
+
+        # Entries hidden by a reset (awaiting purge) are not counted
+        live = all_live_entries()
+        all_time = select(DailyEntry.user_id, *self._aggregate_columns()).where(live).group_by(DailyEntry.user_id)
+        monthly = (
+            select(DailyEntry.user_id, month, *self._aggregate_columns())
+            .where(live)
+            .group_by(DailyEntry.user_id, month)
+        )
+        delete_all_time = delete(UserRollup)
+        delete_monthly = delete(UserMonthlyRollup)
+        if user_id is not None:
+            all_time = all_time.where(DailyEntry.user_id == user_id)
+            monthly = monthly.where(DailyEntry.user_id == user_id)
+            delete_all_time = delete_all_time.where(UserRollup.user_id == user_id)
+            delete_monthly = delete_monthly.where(UserMonthlyRollup.user_id == user_id)
+
+        counters = ["entry_count", "casual_total", "serious_total", "project_total"]
+        await db.execute(delete_all_time)
+        await db.execute(delete_monthly)
+        await db.execute(insert(UserRollup).from_select(["user_id", *counters], all_time))
+        await db.execute(insert(UserMonthlyRollup).from_select(["user_id", "month", *counters], monthly))
+
+    async def find_inconsistencies(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """
+        Compare all-time and monthly rollups with daily_entries.
+
+        Returns:
+            One dict per mismatching (user, month) with expected and stored counters;
+            month is None for the all-time rollup
+        """
+        month = cast(func.date_trunc("month", DailyEntry.entry_date), Date).label("month")
+        checks = [
+            (
+                UserRollup,
+                select(DailyEntry.user_id, *self._aggregate_columns())
+                .where(all_live_entries())
+                .group_by(DailyEntry.user_id).subquery(),
+                [UserRollup.user_id],
+            ),
+            (
+                UserMonthlyRollup,
+                select(DailyEntry.user_id, month, *self._aggregate_columns())
+                .where(all_live_entries())
+                .group_by(DailyEntry.user_id, month).subquery(),
+                [UserMonthlyRollup.user_id, UserMonthlyRollup.month],
+            ),
+        ]
+
+        problems = []
+        for model, expected, keys in checks:
+            join_on = and_(*(expected.c[key.key] == key for key in keys))
+            mismatch = or_(
+                expected.c.user_id.is_(None),
+                model.user_id.is_(None),
+                expected.c.entry_count != model.entry_count,
+                *(
+                    func.abs(expected.c[name] - getattr(model, name)) > SUM_TOLERANCE
+                    for name in ("casual_total", "serious_total", "project_total")
+                ),
+            )
+            if model is UserMonthlyRollup:
+                month_column = func.coalesce(expected.c.month, model.month)
+            else:
+                month_column = null()
+            query = (
+                select(
+                    func.coalesce(expected.c.user_id, model.user_id).label("user_id"),
+                    month_column.label("month"),
+                    expected.c.entry_count.label("expected_count"),
+                    model.entry_count.label("stored_count"),
+                    (expected.c.casual_total + expected.c.serious_total + expected.c.project_total).label("expected_hours"),
+                    (model.casual_total + model.serious_total + model.project_total).label("stored_hours"),
+                )
+                .select_from(expected)
+                .join(model, join_on, full=True)
+                .where(mismatch)
+            )
+            result = await db.execute(query)
+            for row in result.all():
+                problems.append({
+                    "user_id": row.user_id,
+                    "month": row.month,
+                    "expected_count": row.expected_count or 0,
+                    "stored_count": row.stored_count or 0,
+                    "expected_hours": row.expected_hours or 0.0,
+                    "stored_hours": row.stored_hours or 0.0,
+                })
+        return problems
+
+
+# Global service instance
+rollup_service = RollupService()
@@ -0,0 +1,128 @@
+"""
+Response cache for the statistics endpoints (and the entries calendar).
+Entries are keyed by (user, endpoint, params) plus the user's data-version
+ETag, so a write or reset makes older entries unreachable everywhere;
+invalidate_user also deletes them eagerly.
+"""
+import json
+from typing import Any, Dict, Optional, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.utils.cache import CacheBackend, MemoryBackend
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class StatisticsCache:
+    """Caches serialized statistics responses in a pluggable backend."""
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def use_backend(self, backend: CacheBackend) -> None:
+        """Swap the storage backend (e.g. KeyValueBackend for a shared store)."""
+        self.backend = backend
+
+    @staticmethod
+    def key(user_id: UUID, endpoint: str, etag: str, params: Dict[str, Any]) -> str:
+        """Build the cache key; params are sorted so argument order doesn't matter."""
+        return f"stats:{user_id}:{endpoint}:{etag}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    async def get(
+        self,
+        user_id: UUID,
+        endpoint: str,
+        etag: str,
+        params: Dict[str, Any],
+        model: Type[ModelT]
+    ) -> Optional[ModelT]:
+        """
+        Look up a cached response.
+
+        Args:
+            user_id: Owner of the data
+            endpoint: Endpoint name (e.g. "overview")
+            etag: Current data-version ETag of the user (see check_not_modified)
+            params: Query parameters that affect the response
+            model: Response model used to deserialize the entry
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        value = await self.get_raw(user_id, endpoint, etag, params)
+        return model.model_validate_json(value) if value is not None else None
+
+    async def get_raw(
+        self,
+        user_id: UUID,
+        endpoint: str,
+        etag: str,
+        params: Dict[str, Any]
+    ) -> Optional[str]:
+        """Look up a cached response as its JSON document (same arguments as get)."""
+        if not self.enabled:
+            return None
+        value = await self.backend.get(self.key(user_id, endpoint, etag, params))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(
+        self,
+        user_id: UUID,
+        endpoint: str,
+        etag: str,
+        params: Dict[str, Any],
+        response: BaseModel
+    ) -> None:
+        """Store a response (same arguments as get)."""
+        await self.set_raw(user_id, endpoint, etag, params, response.model_dump_json())
+
+    async def set_raw(
+        self,
+        user_id: UUID,
+        endpoint: str,
+        etag: str,
+        params: Dict[str, Any],
+        value: str
+    ) -> None:
+        """Store a response already serialized to JSON; readable by get and get_raw."""
+        if not self.enabled:
+            return
+        await self.backend.set(self.key(user_id, endpoint, etag, params), value, tag=str(user_id))
+
+    async def invalidate_user(self, user_id: UUID) -> None:
+        """Drop a user's entries (call after their entries are written or reset)."""
+        if self.enabled:
+            await self.backend.invalidate_tag(str(user_id))
+
+    async def clear(self) -> None:
+        """Drop all entries."""
+        await self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and backend size/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+
+# Global cache instance
+stats_cache = StatisticsCache(
+    MemoryBackend(maxsize=settings.stats_cache_size, ttl=settings.stats_cache_ttl_seconds),
+    enabled=settings.stats_cache_enabled
+)
@@ -0,0 +1,231 @@
+"""
+System stats service - maintains system-wide daily aggregates and weekly
+signup-cohort retention for the admin dashboard.
+
+Entry writes and purges mark the affected entry dates in
+system_stats_dirty_days (in their own transaction, usually in the same
+statement). The periodic "system_stats_refresh" job drains that table and
+recomputes only those days, the retention cells of their weeks, and the
+current day's signups, so the admin endpoints read small precomputed tables.
+Entries hidden by a reset are not counted.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Set
+
+from sqlalchemy import select, delete, insert, func, cast, any_, bindparam, Date, Integer, Select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert, Insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.daily_entry import DailyEntry
+from app.models.system_stats import SystemDailyStats, SystemStatsDirtyDay, SignupCohort, CohortRetention
+from app.models.user import User
+from app.services.job_runner import job_runner
+from app.services.live_entries import all_live_entries
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+def _monday(day):
+    """SQL: Monday of the week containing a date expression."""
+    return day - cast(func.extract("isodow", day), Integer) + 1
+
+
+# Signup date of a user in UTC, independent of the session time zone
+SIGNUP_DAY = cast(func.timezone("UTC", User.created_at), Date)
+
+
+def _dates(name: str, days: Iterable[date]):
+    """Bind a list of dates as one array parameter."""
+    return bindparam(name, sorted(days), type_=ARRAY(Date))
+
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+class SystemStatsService:
+    """Keeps system_daily_stats, signup_cohorts and cohort_retention up to date."""
+
+    @staticmethod
+    def mark_days_statement(days: Select) -> Insert:
+        """
+        INSERT marking the dates selected by `days` (one date column) as dirty;
+        usable as a CTE next to the entry write.
+        """
+        return pg_insert(SystemStatsDirtyDay).from_select(["day"], days).on_conflict_do_nothing()
+
+    async def mark_days(self, db: AsyncSession, days: Iterable[date]) -> None:
+        """
+        Mark entry dates for recomputation. Must run in the transaction that changed them.
+
+        Args:
+            db: Database session (not committed here)
+            days: Entry dates written or deleted
+        """
+        days = set(days)
+        if days:
+            await db.execute(
+                pg_insert(SystemStatsDirtyDay).values([{"day": day} for day in sorted(days)]).on_conflict_do_nothing()
+            )
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Recompute everything affected since the last refresh: the dirty days,
+        today's and yesterday's signups (UTC), their cohort sizes, and the
+        retention cells of the dirty days' weeks. The dirty marks are removed
+        in the same transaction, so a failed refresh leaves them for the next.
+
+        Args:
+            db: Database session (not committed here)
+
+        Returns:
+            Number of entry dates recomputed
+        """
+        result = await db.execute(delete(SystemStatsDirtyDay).returning(SystemStatsDirtyDay.day))
+        entry_days = set(result.scalars().all())
+
+        # Signups only ever land on the current UTC day; yesterday covers a refresh across midnight
+        today = utc_today()
+        signup_days = {today, today - timedelta(days=1)}
+
+        await self._refresh_days(db, entry_days | signup_days)
+        await self._refresh_cohorts(db, {week_start(day) for day in signup_days})
+        await self._refresh_retention(db, {week_start(day) for day in entry_days})
+        return len(entry_days)
+
+    async def refresh_pending(self) -> None:
+        """Job handler: run refresh in its own transaction."""
+        async with AsyncSessionLocal() as db:
+            await self.refresh(db)
+            await db.commit()
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """
+        Recompute all tables from daily_entries and users (backfill or repair).
+
+        Args:
+            db: Database session (not committed here)
+
+        Returns:
+            Number of days written
+        """
+        for model in (SystemStatsDirtyDay, SystemDailyStats, SignupCohort, CohortRetention):
+            await db.execute(delete(model))
+
+        entry_days = set((await db.execute(select(DailyEntry.entry_date).where(all_live_entries()).distinct())).scalars())
+        signup_days = set((await db.execute(select(SIGNUP_DAY).distinct())).scalars())
+        days = entry_days | signup_days
+        if not days:
+            return 0
+
+        await self._refresh_days(db, days)
+        await self._refresh_cohorts(db, {week_start(day) for day in signup_days})
+        await self._refresh_retention(db, {week_start(day) for day in entry_days})
+        return len(days)
+
+    async def _refresh_days(self, db: AsyncSession, days: Set[date]) -> None:
+        """Upsert system_daily_stats for the given days (zeros where nothing happened)."""
+        entries = (
+            select(
+                DailyEntry.entry_date.label("day"),
+                func.count(DailyEntry.user_id.distinct()).label("active_users"),
+                func.count().label("entry_count"),
+                func.sum(DailyEntry.casual_leisure_hours).label("casual_total"),
+                func.sum(DailyEntry.serious_leisure_hours).label("serious_total"),
+                func.sum(DailyEntry.project_leisure_hours).label("project_total"),
+            )
+            .where(DailyEntry.entry_date == any_(_dates("entry_days", days)), all_live_entries())
+            .group_by(DailyEntry.entry_date)
+            .subquery("entries")
+        )
+        signups = (
+            select(SIGNUP_DAY.label("day"), func.count().label("new_users"))
+            .where(User.created_at >= _utc_midnight(min(days)))
+            .group_by(SIGNUP_DAY)
+            .subquery("signups")
+        )
+        day_list = select(func.unnest(_dates("days", days)).label("day")).subquery("day_list")
+
+        rows = (
+            select(
+                day_list.c.day,
+                func.coalesce(entries.c.active_users, 0),
+                func.coalesce(entries.c.entry_count, 0),
+                func.coalesce(entries.c.casual_total, 0.0),
+                func.coalesce(entries.c.serious_total, 0.0),
+                func.coalesce(entries.c.project_total, 0.0),
+                func.coalesce(signups.c.new_users, 0),
+            )
+            .select_from(day_list)
+            .outerjoin(entries, entries.c.day == day_list.c.day)
+            .outerjoin(signups, signups.c.day == day_list.c.day)
+        )
+        counters = ["active_users", "entry_count", "casual_total", "serious_total", "project_total", "new_users"]
+        stmt = pg_insert(SystemDailyStats).from_select(["day", *counters], rows)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[SystemDailyStats.day],
+            set_={**{name: stmt.excluded[name] for name in counters}, "updated_at": func.now()}
+        ))
+
+    async def _refresh_cohorts(self, db: AsyncSession, weeks: Set[date]) -> None:
+        """Upsert signup_cohorts sizes for the given signup weeks."""
+        if not weeks:
+            return
+        cohort_week = _monday(SIGNUP_DAY)
+        sizes = (
+            select(cohort_week.label("cohort_week"), func.count().label("users"))
+            .where(User.created_at >= _utc_midnight(min(weeks)), cohort_week == any_(_dates("weeks", weeks)))
+            .group_by(cohort_week)
+        )
+        stmt = pg_insert(SignupCohort).from_select(["cohort_week", "users"], sizes)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[SignupCohort.cohort_week],
+            set_={"users": stmt.excluded.users, "updated_at": func.now()}
+        ))
+
+    async def _refresh_retention(self, db: AsyncSession, weeks: Set[date]) -> None:
+        """Recompute the cohort_retention cells of every cohort for the given calendar weeks."""
+        if not weeks:
+            return
+        cohort_week = _monday(SIGNUP_DAY)
+        entry_week = _monday(DailyEntry.entry_date)
+        week_offset = (entry_week - cohort_week) // 7
+        cells = (
+            select(
+                cohort_week.label("cohort_week"),
+                week_offset.label("week_offset"),
+                func.count(DailyEntry.user_id.distinct()).label("active_users"),
+            )
+            .select_from(DailyEntry)
+            .join(User, User.id == DailyEntry.user_id)
+            .where(
+                DailyEntry.entry_date >= min(weeks),
+                DailyEntry.entry_date < max(weeks) + timedelta(days=7),
+                entry_week == any_(_dates("weeks", weeks)),
+                entry_week >= cohort_week,  # Entries backdated before signup don't count
+                DailyEntry.reset_generation == User.reset_generation,  # Live entries (users is joined already)
+            )
+            .group_by(cohort_week, week_offset)
+        )
+        await db.execute(
+            delete(CohortRetention).where(
+                CohortRetention.cohort_week + CohortRetention.week_offset * 7 == any_(_dates("weeks", weeks))
+            )
+        )
+        await db.execute(insert(CohortRetention).from_select(["cohort_week", "week_offset", "active_users"], cells))
+
+
+# Global instance
+system_stats_service = SystemStatsService()
+
+job_runner.register("system_stats_refresh", system_stats_service.refresh_pending, queue="maintenance")
+job_runner.every("system_stats_refresh", settings.system_stats_interval_seconds)
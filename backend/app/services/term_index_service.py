@@ -0,0 +1,253 @@
+"""
+Term index service - maintains term frequencies of entry notes per category.
+Counts are added when entries are inserted and subtracted when a user's
+entries are reset, so the word cloud never has to read raw notes. Only
+visible entries are counted (see live_entries), like the word cloud's text
+mode.
+"""
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, delete, update, func, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.daily_entry import DailyEntry
+from app.models.note_term import NoteTerm, NoteTermDaily
+from app.services.live_entries import live_entries, all_live_entries
+from app.utils.text import tokenize
+
+# Leisure category -> note attribute on DailyEntry
+CATEGORY_NOTES = {
+    "casual": "casual_leisure_note",
+    "serious": "serious_leisure_note",
+    "project": "project_leisure_note",
+}
+
+# Rows fetched per round trip when rebuilding the index
+BATCH_SIZE = 1000
+
+
+class TermIndexService:
+    """Keeps note_terms and note_term_daily in step with entry notes."""
+
+    @staticmethod
+    def _count(
+        entries: Iterable[Any],
+        all_time: Optional[Dict[Tuple[str, str], List[Any]]] = None,
+        daily: Optional[Counter] = None
+    ) -> Tuple[Dict[Tuple[str, str], List[Any]], Counter]:
+        """
+        Tokenize the notes of entries, optionally adding to existing tallies.
+
+        Returns:
+            (all-time {(category, term): [count, last_seen]},
+             daily Counter {(category, day, term): count})
+        """
+        if all_time is None:
+            all_time = defaultdict(lambda: [0, None])
+        if daily is None:
+            daily = Counter()
+        for entry in entries:
+            for category, attribute in CATEGORY_NOTES.items():
+                for term, count in Counter(tokenize(getattr(entry, attribute))).items():
+                    bucket = all_time[(category, term)]
+                    bucket[0] += count
+                    if bucket[1] is None or entry.entry_date > bucket[1]:
+                        bucket[1] = entry.entry_date
+                    daily[(category, entry.entry_date, term)] += count
+        return all_time, daily
+
+    async def apply_entries(self, db: AsyncSession, entries: Iterable[Any]) -> None:
+        """
+        Add the terms of newly inserted entries to the index.
+        Must run in the same transaction as the entry INSERT.
+
+        Args:
+            db: Database session (not committed here)
+            entries: Objects with entry_date and the three *_leisure_note attributes
+        """
+        all_time, daily = self._count(entries)
+        await self._add_counts(db, all_time, daily)
+
+    async def _add_counts(
+        self,
+        db: AsyncSession,
+        all_time: Dict[Tuple[str, str], List[Any]],
+        daily: Counter
+    ) -> None:
+        """Upsert tallies from _count, adding to existing counts."""
+        if not all_time:
+            return
+
+        # Core executemany: rows are sent in insertmanyvalues batches from one
+        # compiled statement instead of compiling a large VALUES list per batch
+        terms = NoteTerm.__table__
+        term_rows = [
+            {"category": category, "term": term, "count": count, "last_seen": last_seen}
+            for (category, term), (count, last_seen) in sorted(all_time.items())
+        ]
+        stmt = pg_insert(terms)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[terms.c.category, terms.c.term],
+                set_={
+                    "count": terms.c.count + stmt.excluded.count,
+                    "last_seen": func.greatest(terms.c.last_seen, stmt.excluded.last_seen),
+                }
+            ),
+            term_rows
+        )
+
+        daily_terms = NoteTermDaily.__table__
+        daily_rows = [
+            {"category": category, "day": day, "term": term, "count": count}
+            for (category, day, term), count in sorted(daily.items())
+        ]
+        stmt = pg_insert(daily_terms)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[daily_terms.c.category, daily_terms.c.day, daily_terms.c.term],
+                set_={"count": daily_terms.c.count + stmt.excluded.count}
+            ),
+            daily_rows
+        )
+
+    async def remove_entries(self, db: AsyncSession, entries: Iterable[Any]) -> None:
+        """
+        Subtract the terms of entries that are being deleted.
+        Must run in the same transaction as the entry DELETE.
+
+        Args:
+            db: Database session (not committed here)
+            entries: Objects with entry_date and the three *_leisure_note attributes
+        """
+        all_time, daily = self._count(entries)
+        if not all_time:
+            return
+
+        terms = NoteTerm.__table__
+        term_rows = [
+            {"b_category": category, "b_term": term, "b_count": count}
+            for (category, term), (count, _) in sorted(all_time.items())
+        ]
+        await db.execute(
+            update(terms)
+            .where(terms.c.category == bindparam("b_category"), terms.c.term == bindparam("b_term"))
+            .values(count=terms.c.count - bindparam("b_count")),
+            term_rows
+        )
+
+        daily_terms = NoteTermDaily.__table__
+        daily_rows = [
+            {"b_category": category, "b_day": day, "b_term": term, "b_count": count}
+            for (category, day, term), count in sorted(daily.items())
+        ]
+        await db.execute(
+            update(daily_terms)
+            .where(
+                daily_terms.c.category == bindparam("b_category"),
+                daily_terms.c.day == bindparam("b_day"),
+                daily_terms.c.term == bindparam("b_term"),
+            )
+            .values(count=daily_terms.c.count - bindparam("b_count")),
+            daily_rows
+        )
+
+        categories = sorted({category for category, _ in all_time})
+        await db.execute(delete(NoteTerm).where(NoteTerm.category.in_(categories), NoteTerm.count <= 0))
+        days = sorted({day for _, day, _ in daily})
+        await db.execute(delete(NoteTermDaily).where(NoteTermDaily.day.in_(days), NoteTermDaily.count <= 0))
+
+    async def remove_user(self, db: AsyncSession, user_id: UUID) -> None:
+        """
+        Subtract all of a user's visible notes from the index (before their
+        entries are hidden by a reset or deleted).
+
+        Args:
+            db: Database session (not committed here)
+            user_id: User whose entries are being reset
+        """
+        result = await db.execute(
+            select(
+                DailyEntry.entry_date,
+                DailyEntry.casual_leisure_note,
+                DailyEntry.serious_leisure_note,
+                DailyEntry.project_leisure_note,
+            ).where(live_entries(user_id))
+        )
+        await self.remove_entries(db, result.all())
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Recompute the whole index from visible daily_entries (backfill or repair).
+
+        Args:
+            db: Database session (not committed here)
+        """
+        await db.execute(delete(NoteTerm))
+        await db.execute(delete(NoteTermDaily))
+
+        # Tally everything first; the cursor must be closed before writing
+        all_time, daily = None, None
+        result = await db.stream(
+            select(
+                DailyEntry.entry_date,
+                DailyEntry.casual_leisure_note,
+                DailyEntry.serious_leisure_note,
+                DailyEntry.project_leisure_note,
+            )
+            .where(all_live_entries())
+            .execution_options(yield_per=BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            all_time, daily = self._count(rows, all_time, daily)
+
+        if all_time is not None:
+            await self._add_counts(db, all_time, daily)
+
+    async def top_terms(
+        self,
+        db: AsyncSession,
+        category: str,
+        limit: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Get the most frequent terms of a category.
+
+        Args:
+            db: Database session
+            category: "casual", "serious" or "project"
+            limit: Number of terms to return
+            start_date: Only count entries on or after this date
+            end_date: Only count entries on or before this date
+
+        Returns:
+            (term, count) pairs, most frequent first
+        """
+        if start_date is None and end_date is None:
+            query = (
+                select(NoteTerm.term, NoteTerm.count)
+                .where(NoteTerm.category == category)
+                .order_by(NoteTerm.count.desc(), NoteTerm.term)
+                .limit(limit)
+            )
+        else:
+            total = func.sum(NoteTermDaily.count)
+            query = select(NoteTermDaily.term, total).where(NoteTermDaily.category == category)
+            if start_date is not None:
+                query = query.where(NoteTermDaily.day >= start_date)
+            if end_date is not None:
+                query = query.where(NoteTermDaily.day <= end_date)
+            query = query.group_by(NoteTermDaily.term).order_by(total.desc(), NoteTermDaily.term).limit(limit)
+
+        result = await db.execute(query)
+        return [(term, int(count)) for term, count in result.all()]
+
+
+# Global service instance
+term_index_service = TermIndexService()
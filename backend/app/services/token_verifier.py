@@ -0,0 +1,170 @@
+"""
+Local verification of Supabase access tokens.
+Checks JWT signature, expiry and audience against cached signing keys
+(project JWKS or the shared JWT secret) without calling Supabase per request.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Any, Optional
+
+import httpx
+import jwt
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Asymmetric algorithms Supabase may sign with when JWT signing keys are enabled
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+# Minimum delay between forced JWKS refreshes triggered by an unknown key id
+MIN_FORCED_REFRESH_SECONDS = 30
+
+
+class TokenNotVerifiable(Exception):
+    """Raised when a token cannot be checked locally (no matching key, unsupported alg)."""
+
+
+class SupabaseTokenVerifier:
+    """Verifies Supabase JWTs with a cached JWKS and/or the project JWT secret."""
+
+    def __init__(self, fetch_jwks: Callable[[], Awaitable[Dict[str, Any]]]):
+        """
+        Args:
+            fetch_jwks: Coroutine function returning the project JWKS document
+        """
+        self.fetch_jwks = fetch_jwks
+        self.jwt_secret = settings.supabase_jwt_secret
+        self.audience = settings.supabase_jwt_audience
+        self.refresh_interval = settings.auth_jwks_refresh_seconds
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at: float = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _is_stale(self) -> bool:
+        """Check if the cached JWKS is older than the refresh interval."""
+        return time.monotonic() - self._fetched_at > self.refresh_interval
+
+    async def refresh_keys(self, force: bool = False) -> None:
+        """
+        Fetch the project JWKS and replace the cached signing keys.
+
+        Args:
+            force: Refresh even if the cache is fresh (used on unknown key ids)
+        """
+        async with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if force and age < MIN_FORCED_REFRESH_SECONDS:
+                return
+            if not force and age <= self.refresh_interval:
+                return
+
+            try:
+                jwks = await self.fetch_jwks()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Failed to refresh Supabase JWKS: %s", e)
+                # Back off before retrying so a Supabase outage doesn't add latency per request
+                self._fetched_at = time.monotonic() - self.refresh_interval + MIN_FORCED_REFRESH_SECONDS
+                return
+
+            keys = {}
+            for key_data in jwks.get("keys", []):
+                try:
+                    key = jwt.PyJWK(key_data)
+                except jwt.PyJWTError:
+                    continue
+                if key.key_id:
+                    keys[key.key_id] = key
+
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+    def _schedule_refresh(self) -> None:
+        """Refresh the JWKS in the background without blocking the current request."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh_keys())
+
+    async def _get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        """Return the cached key for kid, refreshing the JWKS on rotation."""
+        if not self._keys:
+            await self.refresh_keys()
+        elif self._is_stale():
+            self._schedule_refresh()
+
+        key = self._keys.get(kid) if kid else None
+        if key is None and kid:
+            # Unknown kid usually means the signing key was rotated
+            await self.refresh_keys(force=True)
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise TokenNotVerifiable(f"No signing key for kid={kid}")
+        return key
+
+    async def verify(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify an access token locally.
+
+        Args:
+            access_token: JWT access token
+
+        Returns:
+            User info built from the token claims if valid, None if the token is
+            invalid or expired
+
+        Raises:
+            TokenNotVerifiable: If no local key can check this token
+        """
+        try:
+            header = jwt.get_unverified_header(access_token)
+        except jwt.PyJWTError:
+            return None
+
+        alg = header.get("alg")
+        if alg == "HS256":
+            if not self.jwt_secret:
+                raise TokenNotVerifiable("HS256 token but no JWT secret configured")
+            key = self.jwt_secret
+        elif alg in ASYMMETRIC_ALGORITHMS:
+            key = await self._get_signing_key(header.get("kid"))
+        else:
+            raise TokenNotVerifiable(f"Unsupported algorithm: {alg}")
+
+        try:
+            claims = jwt.decode(
+                access_token,
+                key,
+                algorithms=[alg],
+                audience=self.audience,
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.PyJWTError:
+            return None
+
+        # Shape the claims like the Supabase /auth/v1/user response
+        return {
+            "id": claims["sub"],
+            "email": claims.get("email"),
+            "role": claims.get("role"),
+            "aud": claims.get("aud"),
+        }
+
+
+def get_token_expiry(access_token: str) -> Optional[float]:
+    """
+    Read the exp claim of an already-validated token without re-checking it.
+
+    Args:
+        access_token: JWT access token
+
+    Returns:
+        Expiry as unix time, or None if the token has no readable exp claim
+    """
+    try:
+        claims = jwt.decode(access_token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return None
+    exp = claims.get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else None
@@ -0,0 +1,67 @@
+"""
+Cache of authenticated users keyed by access token.
+Lets get_current_user skip token validation and the users-table lookup
+for tokens seen recently.
+"""
+import time
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import make_transient_to_detached
+from app.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+
+class UserCache:
+    """LRU+TTL cache mapping access tokens to detached User snapshots."""
+
+    def __init__(self):
+        self.enabled = settings.user_cache_enabled
+        self._cache = TTLCache(
+            maxsize=settings.user_cache_size,
+            ttl=settings.user_cache_ttl_seconds
+        )
+
+    def get(self, token: str) -> Optional[User]:
+        """Return the cached snapshot for a token, or None on a miss."""
+        if not self.enabled:
+            return None
+        return self._cache.get(token)
+
+    def set(self, token: str, user: User, expires_at: Optional[float] = None) -> None:
+        """
+        Cache a detached copy of user for this token.
+
+        Args:
+            token: Access token the user was resolved from
+            user: Loaded User instance (not modified by caching)
+            expires_at: Token expiry (unix time); the entry never outlives the token
+        """
+        if not self.enabled:
+            return
+
+        ttl = self._cache.ttl
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+
+        self._cache.set(token, _snapshot(user), tag=user.id, ttl=ttl)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Evict every cached token for a user (call after the user row changes)."""
+        self._cache.invalidate_tag(user_id)
+
+    def stats(self):
+        """Return cache size and hit/miss counters."""
+        return self._cache.stats()
+
+
+def _snapshot(user: User) -> User:
+    """Copy the user's column values into a new detached instance."""
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+
+# Global cache instance
+user_cache = UserCache()
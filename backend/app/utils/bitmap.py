@@ -0,0 +1,44 @@
+"""
+Compact encodings for per-day calendar data.
+Presence is a bitmap (bit i, least significant bit first within each byte,
+is day i of the range); per-day values are a little-endian float32 array
+that browsers read directly as a Float32Array. Both travel as base64.
+"""
+import base64
+import struct
+from typing import Iterable, List, Tuple
+
+
+def encode_presence(offsets: Iterable[int], size: int) -> str:
+    """
+    Pack day offsets into a base64 bitmap.
+
+    Args:
+        offsets: Day indexes (0-based) that are set
+        size: Number of days covered
+
+    Returns:
+        base64 of ceil(size / 8) bytes
+    """
+    bitmap = bytearray((size + 7) // 8)
+    for offset in offsets:
+        bitmap[offset >> 3] |= 1 << (offset & 7)
+    return base64.b64encode(bytes(bitmap)).decode("ascii")
+
+
+def decode_presence(encoded: str, size: int) -> List[int]:
+    """Return the day offsets set in a bitmap from encode_presence."""
+    bitmap = base64.b64decode(encoded)
+    return [offset for offset in range(size) if bitmap[offset >> 3] & (1 << (offset & 7))]
+
+
+def encode_float32(values: Iterable[float]) -> str:
+    """Pack values as base64 of a little-endian float32 array."""
+    values = list(values)
+    return base64.b64encode(struct.pack(f"<{len(values)}f", *values)).decode("ascii")
+
+
+def decode_float32(encoded: str) -> Tuple[float, ...]:
+    """Unpack an array from encode_float32."""
+    data = base64.b64decode(encoded)
+    return struct.unpack(f"<{len(data) // 4}f", data)
@@ -0,0 +1,280 @@
+"""
+Caching utilities.
+Provides a bounded LRU cache with per-entry TTL and tag-based invalidation,
+and pluggable string-valued backends for response caches.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a TTL.
+
+    Entries can be grouped under a tag (e.g. a user id) so that every entry
+    belonging to that tag is evicted at once when the underlying data changes.
+    Not thread-safe; intended for use from a single asyncio event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, Optional[Hashable]]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value, refreshing its LRU position.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or expired entry
+
+        Returns:
+            Cached value or default
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value, _ = item
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        tag: Optional[Hashable] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            tag: Optional group the entry belongs to (see invalidate_tag)
+            ttl: Override the default TTL in seconds for this entry
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (time.monotonic() + ttl, value, tag)
+        if tag is not None:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._data) > self.maxsize:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a single entry. Returns True if it was present."""
+        if key not in self._data:
+            return False
+        self._remove(key)
+        return True
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """
+        Remove every entry stored under a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries removed
+        """
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            self._data.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._data.clear()
+        self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        """Drop an entry and its tag index reference."""
+        _, _, tag = self._data.pop(key)
+        if tag is not None:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class CacheBackend:
+    """
+    Storage interface for response caches.
+
+    Values are strings (serialized responses) so any key-value store can hold
+    them. Methods are async so network-backed stores fit the same interface.
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the stored value, or None on a miss."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, tag: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        """Store a value under key, optionally grouped under tag."""
+        raise NotImplementedError
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """Remove the entries stored under tag where supported; returns the number removed."""
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend counters (size, evictions, ...) where available."""
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """In-process backend on top of TTLCache (bounded by size and TTL)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, tag: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, tag=tag, ttl=ttl)
+
+    async def invalidate_tag(self, tag: str) -> int:
+        return self._cache.invalidate_tag(tag)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        return {"size": stats["size"], "maxsize": stats["maxsize"], "evictions": stats["evictions"]}
+
+
+class KeyValueBackend(CacheBackend):
+    """
+    Backend for an external key-value store shared between processes.
+
+    The client needs async get(key), set(key, value, ex=seconds) and
+    delete(*keys), a subset of the redis.asyncio client API. The keys of
+    each tag are listed in an index entry so invalidate_tag can delete them.
+    The index is updated read-modify-write, so concurrent writers can lose
+    a key from it; callers must also put a data version in the key so such
+    an entry is never read again and only waits for its TTL.
+    """
+
+    def __init__(self, client: Any, ttl: float = 60.0, prefix: str = ""):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._get(self.prefix + key)
+
+    async def set(self, key: str, value: str, tag: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        expires = max(1, int(ttl))
+        await self.client.set(self.prefix + key, value, ex=expires)
+        if tag is not None:
+            index = self._tag_key(tag)
+            keys = await self._tag_members(index)
+            if key not in keys:
+                # Outlives every entry it lists (entries may use shorter TTLs)
+                await self.client.set(index, "\n".join([*keys, key]), ex=max(expires, int(self.ttl)))
+
+    async def invalidate_tag(self, tag: str) -> int:
+        index = self._tag_key(tag)
+        keys = await self._tag_members(index)
+        if not keys:
+            return 0
+        removed = await self.client.delete(*(self.prefix + key for key in keys))
+        await self.client.delete(index)
+        return removed
+
+    async def clear(self) -> None:
+        # Shared stores are left alone; versioned keys make old entries unreachable
+        return None
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def _tag_members(self, index: str) -> List[str]:
+        value = await self._get(index)
+        return value.split("\n") if value else []
+
+    async def _get(self, key: str) -> Optional[str]:
+        value = await self.client.get(key)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+
+class LocalKeyValueStore:
+    """
+    In-process stand-in for an external key-value client (see KeyValueBackend).
+    For tests and local development; expiry is checked on read.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ex if ex else float("inf")
+        self._data[key] = (expires_at, value)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,62 @@
+"""
+Opt-in fast JSON path for list-heavy responses.
+With FAST_JSON_ENABLED set (and orjson installed), endpoints that return many
+rows select plain columns, serialize them in a single orjson call and send the
+bytes as-is, skipping per-row Pydantic models and FastAPI's encoder pass.
+The output matches the standard path (same keys, ISO dates, UTC as 'Z').
+"""
+from typing import Any, Iterable, List, Mapping, Optional
+from uuid import UUID
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: without it every endpoint uses the standard path
+    orjson = None
+
+
+def fast_json_enabled() -> bool:
+    """Check if the fast path is configured and orjson is available."""
+    return settings.fast_json_enabled and orjson is not None
+
+
+def default_response_class() -> type:
+    """Response class for the app: ORJSONResponse on the fast path, JSONResponse otherwise."""
+    return ORJSONResponse if fast_json_enabled() else JSONResponse
+
+
+def _default(value: Any) -> Any:
+    """Serialize types orjson doesn't handle natively."""
+    # asyncpg returns its own UUID subclass, which orjson only accepts as exact uuid.UUID
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content (dicts, lists, UUIDs, dates, datetimes) to JSON bytes."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> List[dict]:
+    """Convert SQLAlchemy column rows to plain dicts keyed by column label."""
+    return [row._asdict() for row in rows]
+
+
+def json_bytes_response(body: bytes, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Send already-serialized JSON.
+
+    Args:
+        body: JSON document (from dumps() or a cache)
+        headers: Headers to send, e.g. the ones dependencies set on the
+            injected Response (ETag, X-Next-Cursor), which are otherwise
+            dropped when an endpoint returns a Response itself
+
+    Returns:
+        application/json Response
+    """
+    return Response(content=body, media_type="application/json", headers=dict(headers or {}))
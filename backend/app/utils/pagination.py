@@ -0,0 +1,61 @@
+"""
+Keyset pagination helpers.
+Encodes the sort key of the last row of a page into an opaque cursor string.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List
+from uuid import UUID
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor string can't be decoded."""
+
+
+def _to_json(value: Any) -> Any:
+    """Convert cursor values to JSON-serializable primitives."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of a row as an opaque, URL-safe cursor.
+
+    Args:
+        values: Sort key values in ORDER BY order (dates, datetimes, UUIDs, numbers)
+
+    Returns:
+        Base64url cursor string
+    """
+    payload = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous response
+        length: Expected number of sort key values
+
+    Returns:
+        List of raw JSON values (callers convert to dates/UUIDs)
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor("Invalid cursor")
+    return values
@@ -0,0 +1,59 @@
+"""
+Text utilities for note analysis.
+Tokenizes free-text activity notes (Hebrew and English) for term counting.
+"""
+import re
+from typing import List, Optional
+
+# Longest term stored in the term index
+MAX_TERM_LENGTH = 64
+
+# Hebrew points and cantillation marks (niqqud), removed before tokenizing
+_HEBREW_MARKS = re.compile(r"[\u0591-\u05BD\u05BF-\u05C7]")
+
+# Geresh/gershayim (and ASCII quotes) inside Hebrew abbreviations, e.g. צה"ל, ג'ים
+_HEBREW_INNER_QUOTES = re.compile(r"(?<=[\u05D0-\u05EA])[\"'\u05F3\u05F4](?=[\u05D0-\u05EA])")
+
+# A token is a run of letters/digits; maqaf, punctuation and whitespace separate tokens
+_TOKEN = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset({
+    # Hebrew
+    "של", "את", "על", "עם", "או", "גם", "כי", "אם", "זה", "זו", "זאת", "היה", "היא", "הוא",
+    "הם", "הן", "אני", "אנחנו", "אתה", "אתם", "לא", "כן", "יש", "אין", "מה", "מי",
+    "איך", "למה", "כמו", "רק", "עוד", "כל", "אבל", "אז", "שם", "פה", "כאן", "אל", "מן",
+    "בין", "אחרי", "לפני", "תוך", "עד", "היו", "להיות", "קצת", "הרבה", "מאוד", "שלי", "שלו",
+    "שלה", "לי", "לו", "לה", "לנו", "לך", "בו", "בה", "וגם", "ועם", "ואז", "שעה", "שעות",
+    # English
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "at", "for", "with", "by", "from",
+    "is", "are", "was", "were", "be", "been", "it", "this", "that", "i", "me", "my", "we",
+    "our", "you", "he", "she", "they", "them", "some", "bit", "lot", "very", "just", "also",
+    "hour", "hours", "min", "mins", "minutes",
+})
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split a note into normalized terms.
+
+    Lowercases, strips niqqud, keeps Hebrew abbreviations together, and drops
+    stopwords, single characters and pure numbers.
+
+    Args:
+        text: Note text (may be None)
+
+    Returns:
+        Terms in order of appearance (duplicates kept)
+    """
+    if not text:
+        return []
+
+    text = _HEBREW_MARKS.sub("", text.lower())
+    text = _HEBREW_INNER_QUOTES.sub("", text)
+
+    terms = []
+    for token in _TOKEN.findall(text):
+        if len(token) < 2 or token.isdigit() or token in STOPWORDS:
+            continue
+        terms.append(token[:MAX_TERM_LENGTH])
+    return terms
@@ -0,0 +1,146 @@
+"""
+Benchmark for the fast JSON path (FAST_JSON_ENABLED) on list-heavy endpoints.
+
+Runs the app in-process and measures the CPU time of this process per request
+(time.process_time, so database time spent in Postgres is excluded) for:
+
+    GET /entries/history?page_size=100                    (100 entries)
+    GET /admin/users-stats?limit=100                      (100 users)
+    GET /statistics/trends?days=365&rolling=30            (366 points)
+
+once with the standard path (per-row Pydantic models + FastAPI encoder) and
+once with the fast path (column rows serialized in one orjson call). Token
+checks are stubbed out and the response caches are disabled so both paths do
+the same work apart from serialization. Seeded users are deleted afterwards.
+
+Run from the backend directory against a development database:
+    python benchmarks/bench_serialization.py --requests 300
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import AsyncSessionLocal, engine, Base  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User, DailyEntry  # noqa: E402
+from app.services.auth_service import auth_service  # noqa: E402
+from app.services.rollup_service import rollup_service  # noqa: E402
+from app.services.stats_cache import stats_cache  # noqa: E402
+from app.services.user_cache import user_cache  # noqa: E402
+from app.utils.fast_json import orjson  # noqa: E402
+
+SEED_USERS = 100
+SEED_ENTRIES = 400
+
+
+async def seed():
+    """Create SEED_USERS users; the first one gets SEED_ENTRIES entries. Returns (ids, token)."""
+    note = "benchmark note with some words "
+    user_ids = []
+    async with AsyncSessionLocal() as db:
+        for index in range(SEED_USERS):
+            supabase_user_id = uuid.uuid4()
+            user = User(supabase_user_id=supabase_user_id, email=f"bench-{supabase_user_id.hex[:12]}@example.com")
+            db.add(user)
+            await db.flush()
+            user_ids.append(user.id)
+            if index == 0:
+                token = str(supabase_user_id)
+                today = date.today()
+                rows = [
+                    {
+                        "user_id": user.id,
+                        "entry_date": today - timedelta(days=day),
+                        "casual_leisure_hours": 1.5,
+                        "casual_leisure_note": note,
+                        "serious_leisure_hours": 2.0,
+                        "serious_leisure_note": note,
+                        "project_leisure_hours": 0.5,
+                        "project_leisure_note": None,
+                    }
+                    for day in range(1, SEED_ENTRIES + 1)
+                ]
+                await db.execute(insert(DailyEntry), rows)
+            await rollup_service.rebuild(db, user.id)
+        await db.commit()
+    return user_ids, token
+
+
+async def cleanup(user_ids) -> None:
+    """Remove the benchmark users and their entries."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(DailyEntry).where(DailyEntry.user_id.in_(user_ids)))
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+
+async def cpu_per_request(client, url, headers, requests: int):
+    """Return (median CPU ms, response body) over `requests` sequential calls."""
+    samples = []
+    body = None
+    for _ in range(requests):
+        start = time.process_time()
+        response = await client.get(url, headers=headers)
+        samples.append((time.process_time() - start) * 1000)
+        response.raise_for_status()
+        body = response.json()
+    return statistics.median(samples), body
+
+
+async def main(requests: int) -> None:
+    if orjson is None:
+        sys.exit("orjson is not installed; the fast path is unavailable")
+
+    async def verify_token(token: str):
+        return {"id": token, "email": None, "role": "authenticated", "aud": "authenticated"}
+
+    auth_service.verify_token = verify_token
+    user_cache.enabled = False
+    stats_cache.enabled = False
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_ids, token = await seed()
+
+    user_headers = {"Authorization": f"Bearer {token}"}
+    admin_headers = {"X-Admin-Password": settings.admin_password}
+    scenarios = [
+        ("history (100 entries)", "/entries/history?page_size=100", user_headers),
+        ("users-stats (100 users)", "/admin/users-stats?limit=100", admin_headers),
+        ("trends (366 days, rolling)", "/statistics/trends?days=365&rolling=30", user_headers),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1") as client:
+            print(f"{'endpoint':<28} {'standard_ms':>12} {'fast_ms':>9} {'speedup':>8} {'same':>5}")
+            for name, url, headers in scenarios:
+                results = {}
+                for fast in (False, True):
+                    settings.fast_json_enabled = fast
+                    await cpu_per_request(client, url, headers, max(requests // 10, 1))  # warm up
+                    results[fast] = await cpu_per_request(client, url, headers, requests)
+                (standard_ms, standard_body), (fast_ms, fast_body) = results[False], results[True]
+                same = "yes" if standard_body == fast_body else "NO"
+                print(f"{name:<28} {standard_ms:>12.3f} {fast_ms:>9.3f} {standard_ms / fast_ms:>7.2f}x {same:>5}")
+    finally:
+        await cleanup(user_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint and path")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
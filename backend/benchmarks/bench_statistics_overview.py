@@ -0,0 +1,111 @@
+"""
+Benchmark for GET /statistics/overview as a user's history grows.
+
+Seeds a throwaway user with N entries in the configured database, then times
+the endpoint's query (all-time totals are read from user_rollups; the response
+cache is bypassed) against the original approach (load every DailyEntry row
+and sum in Python). The benchmark user is deleted afterwards.
+
+Run from the backend directory against a development database:
+    python benchmarks/bench_statistics_overview.py --counts 100 1000 10000 50000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete, insert  # noqa: E402
+from app.database import AsyncSessionLocal  # noqa: E402
+from app.models import User, DailyEntry  # noqa: E402
+from app.api.statistics import _query_overview  # noqa: E402
+from app.services.rollup_service import rollup_service  # noqa: E402
+
+
+async def legacy_overview(db, user):
+    """Previous implementation: load full ORM rows and aggregate in Python."""
+    result = await db.execute(select(DailyEntry).where(DailyEntry.user_id == user.id))
+    entries = result.scalars().all()
+    entry_count = len(entries)
+    if not entry_count:
+        return None
+    casual_total = sum(e.casual_leisure_hours for e in entries)
+    serious_total = sum(e.serious_leisure_hours for e in entries)
+    project_total = sum(e.project_leisure_hours for e in entries)
+    total_hours = sum(e.total_hours for e in entries)
+    return (casual_total, serious_total, project_total, total_hours, entry_count)
+
+
+async def seed_user(count: int) -> User:
+    """Create a benchmark user with `count` consecutive daily entries."""
+    async with AsyncSessionLocal() as db:
+        user = User(supabase_user_id=uuid.uuid4(), email=f"bench-{uuid.uuid4().hex[:12]}@example.com")
+        db.add(user)
+        await db.flush()
+
+        today = date.today()
+        note = "benchmark note " * 10
+        rows = [
+            {
+                "user_id": user.id,
+                "entry_date": today - timedelta(days=i),
+                "casual_leisure_hours": 1.5,
+                "casual_leisure_note": note,
+                "serious_leisure_hours": 2.0,
+                "serious_leisure_note": note,
+                "project_leisure_hours": 0.5,
+                "project_leisure_note": note,
+            }
+            for i in range(count)
+        ]
+        for start in range(0, len(rows), 5000):
+            await db.execute(insert(DailyEntry), rows[start:start + 5000])
+        await rollup_service.rebuild(db, user.id)
+        await db.commit()
+        return user
+
+
+async def delete_user(user: User) -> None:
+    """Remove the benchmark user and (via cascade) its entries."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(DailyEntry).where(DailyEntry.user_id == user.id))
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
+
+
+async def time_call(func, repeat: int) -> float:
+    """Return the median latency in milliseconds of `repeat` calls, each with a fresh session."""
+    samples = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await func(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(counts, repeat: int) -> None:
+    print(f"{'entries':>10} {'overview_ms':>12} {'legacy_ms':>12} {'speedup':>9}")
+    for count in counts:
+        user = await seed_user(count)
+        try:
+            new_ms = await time_call(
+                lambda db: _query_overview(db, user.id, None), repeat
+            )
+            old_ms = await time_call(lambda db: legacy_overview(db, user), repeat)
+        finally:
+            await delete_user(user)
+        print(f"{count:>10} {new_ms:>12.2f} {old_ms:>12.2f} {old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+    asyncio.run(main(args.counts, args.repeat))
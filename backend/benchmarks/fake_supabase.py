@@ -0,0 +1,106 @@
+"""
+Local stand-in for the Supabase Auth API used by the benchmarks.
+
+Issues ES256 access tokens for seeded users and serves the two endpoints the
+backend calls on the request path:
+
+    GET /auth/v1/user                     (remote token validation)
+    GET /auth/v1/.well-known/jwks.json    (keys for local verification)
+
+The app is plain ASGI; install() points the backend's shared Supabase client
+at it through httpx.ASGITransport, so no port or network is involved.
+"""
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from jwt.algorithms import ECAlgorithm
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.config import settings
+
+
+class FakeSupabase:
+    """Token issuer plus a minimal Supabase Auth HTTP API."""
+
+    def __init__(self, latency_ms: float = 0.0, token_ttl: int = 3600):
+        """
+        Args:
+            latency_ms: Delay added to every auth call (simulates the Supabase round trip)
+            token_ttl: Lifetime of issued access tokens in seconds
+        """
+        self.latency = latency_ms / 1000
+        self.token_ttl = token_ttl
+        self.kid = f"bench-{uuid.uuid4().hex[:8]}"
+        self._private_key = ec.generate_private_key(ec.SECP256R1())
+        self._public_key = self._private_key.public_key()
+        self.calls: Dict[str, int] = {"user": 0, "jwks": 0}
+
+        self.app = Starlette(routes=[
+            Route("/auth/v1/user", self._user, methods=["GET"]),
+            Route("/auth/v1/.well-known/jwks.json", self._jwks, methods=["GET"]),
+        ])
+
+    def issue_token(self, supabase_user_id: uuid.UUID, email: str) -> str:
+        """Sign an access token shaped like the ones Supabase issues."""
+        now = int(time.time())
+        claims = {
+            "sub": str(supabase_user_id),
+            "email": email,
+            "role": "authenticated",
+            "aud": settings.supabase_jwt_audience,
+            "iat": now,
+            "exp": now + self.token_ttl,
+        }
+        return jwt.encode(claims, self._private_key, algorithm="ES256", headers={"kid": self.kid})
+
+    def _decode(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            return jwt.decode(
+                token,
+                self._public_key,
+                algorithms=["ES256"],
+                audience=settings.supabase_jwt_audience
+            )
+        except jwt.PyJWTError:
+            return None
+
+    async def _user(self, request: Request) -> JSONResponse:
+        self.calls["user"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        claims = self._decode(token) if scheme.lower() == "bearer" else None
+        if claims is None:
+            return JSONResponse({"msg": "invalid JWT"}, status_code=401)
+        return JSONResponse({
+            "id": claims["sub"],
+            "email": claims["email"],
+            "role": claims["role"],
+            "aud": claims["aud"],
+        })
+
+    async def _jwks(self, request: Request) -> JSONResponse:
+        self.calls["jwks"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        key = ECAlgorithm.to_jwk(self._public_key, as_dict=True)
+        key.update({"kid": self.kid, "alg": "ES256", "use": "sig"})
+        return JSONResponse({"keys": [key]})
+
+    async def install(self, auth_service) -> None:
+        """Replace the auth service's Supabase client with one routed to this app."""
+        await auth_service.close()
+        auth_service._client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app),
+            base_url=auth_service.supabase_url
+        )
@@ -0,0 +1,425 @@
+"""
+Load test for the API endpoints.
+
+Starts the app in-process (lifespan included) against the configured
+database, replaces Supabase with benchmarks/fake_supabase.py, seeds
+throwaway users with entries, then drives each endpoint at a fixed
+concurrency. Reports p50/p95/p99 latency, throughput and SQL statements per
+request for every endpoint, and can save the results as JSON and compare
+them with an earlier run.
+
+Requires a PostgreSQL database in DATABASE_URL (the docker compose service
+works; tables are created if missing). Seeded users are deleted afterwards
+unless --keep is given.
+
+Run from the backend directory:
+    python benchmarks/load_test.py --users 20 --entries 365 --requests 300 --concurrency 10
+    python benchmarks/load_test.py --output results/baseline.json
+    python benchmarks/load_test.py --compare results/baseline.json --threshold 15
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, event, insert  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User, DailyEntry  # noqa: E402
+from app.services.auth_service import auth_service  # noqa: E402
+from app.services.rollup_service import rollup_service  # noqa: E402
+from app.services.stats_cache import stats_cache  # noqa: E402
+from app.services.term_index_service import term_index_service  # noqa: E402
+from app.services.user_cache import user_cache  # noqa: E402
+from app.utils.pagination import encode_cursor  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+
+API_PREFIX = "/api/v1"
+NOTES = [
+    "קריאה ספר", "ריצה בפארק", "גיטרה", "נטפליקס", "בישול", "פרויקט קוד",
+    "reading", "running", "guitar practice", "side project", "tv series", None,
+]
+
+# SQL statements executed by the request currently being measured
+_query_count: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@dataclass
+class BenchUser:
+    """A seeded user and its access token."""
+    id: uuid.UUID
+    token: str
+
+
+@dataclass
+class Scenario:
+    """One endpoint call shape: build(i, user) returns (method, path, request kwargs)."""
+    name: str
+    build: Callable[[int, BenchUser], Tuple[str, str, Dict[str, Any]]]
+    write: bool = False
+    admin: bool = False
+
+
+@dataclass
+class Result:
+    """Samples collected for one scenario."""
+    latencies_ms: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _entry_row(user_id: uuid.UUID, day: date, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "entry_date": day,
+        "casual_leisure_hours": round(rng.uniform(0.5, 3), 1),
+        "casual_leisure_note": rng.choice(NOTES),
+        "serious_leisure_hours": round(rng.uniform(0, 2), 1),
+        "serious_leisure_note": rng.choice(NOTES),
+        "project_leisure_hours": round(rng.uniform(0, 2), 1),
+        "project_leisure_note": rng.choice(NOTES),
+    }
+
+
+async def seed(fake: FakeSupabase, users: int, entries: int, run_id: str) -> List[BenchUser]:
+    """Create users with `entries` consecutive past entries each (today is left free)."""
+    rng = random.Random(run_id)
+    seeded = []
+    today = date.today()
+    async with AsyncSessionLocal() as db:
+        for n in range(users):
+            supabase_user_id = uuid.uuid4()
+            email = f"loadtest-{run_id}-{n}@example.com"
+            user = User(supabase_user_id=supabase_user_id, email=email)
+            db.add(user)
+            await db.flush()
+
+            rows = [_entry_row(user.id, today - timedelta(days=day), rng) for day in range(1, entries + 1)]
+            for start in range(0, len(rows), 5000):
+                await db.execute(insert(DailyEntry), rows[start:start + 5000])
+            await rollup_service.rebuild(db, user.id)
+            await term_index_service.apply_entries(db, [SimpleNamespace(**row) for row in rows])
+
+            seeded.append(BenchUser(id=user.id, token=fake.issue_token(supabase_user_id, email)))
+        await db.commit()
+    return seeded
+
+
+async def cleanup(users: List[BenchUser]) -> None:
+    """Delete seeded users, their entries and their index/rollup rows."""
+    async with AsyncSessionLocal() as db:
+        for user in users:
+            await term_index_service.remove_user(db, user.id)
+            await rollup_service.reset_user(db, user.id)
+            await db.execute(delete(DailyEntry).where(DailyEntry.user_id == user.id))
+            await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
+
+
+def build_scenarios(users: int, entries: int, requests: int, bulk_size: int) -> List[Scenario]:
+    """All endpoints, reads first; writes use dates older than the seeded history."""
+    today = date.today()
+    deep_cursor = encode_cursor(today - timedelta(days=max(1, entries // 2)), uuid.UUID(int=2**128 - 1))
+    single_offset = entries + 1
+    bulk_offset = single_offset + math.ceil(requests / users) + 1
+
+    def get(path: str) -> Callable[[int, BenchUser], Tuple[str, str, Dict[str, Any]]]:
+        return lambda i, user: ("GET", path, {})
+
+    def submit(i: int, user: BenchUser):
+        day = today - timedelta(days=single_offset + i // users)
+        body = {
+            "entry_date": day.isoformat(),
+            "casual_leisure_hours": 1.5,
+            "casual_leisure_note": "benchmark reading",
+            "serious_leisure_hours": 1.0,
+            "project_leisure_hours": 0.5,
+        }
+        return "POST", "/entries/today", {"json": body}
+
+    def bulk(i: int, user: BenchUser):
+        first = bulk_offset + (i // users) * bulk_size
+        body = {"entries": [
+            {
+                "entry_date": (today - timedelta(days=first + k)).isoformat(),
+                "casual_leisure_hours": 1.0,
+                "serious_leisure_hours": 1.0,
+                "project_leisure_hours": 1.0,
+                "serious_leisure_note": "benchmark import",
+            }
+            for k in range(bulk_size)
+        ]}
+        return "POST", "/entries/bulk", {"json": body}
+
+    return [
+        Scenario("GET /auth/me", get("/auth/me")),
+        Scenario("GET /entries/can-submit", get("/entries/can-submit")),
+        Scenario("GET /entries/history?page=1", get("/entries/history?page=1&page_size=10")),
+        Scenario("GET /entries/history?page=deep", get(f"/entries/history?page={max(1, entries // 20)}&page_size=10")),
+        Scenario("GET /entries/history?cursor=deep", get(f"/entries/history?cursor={deep_cursor}&page_size=10&include_total=false")),
+        Scenario("GET /entries/export?format=ndjson", get("/entries/export?format=ndjson")),
+        Scenario("GET /entries/calendar", get("/entries/calendar?totals=true")),
+        Scenario("GET /statistics/overview", get("/statistics/overview")),
+        Scenario("GET /statistics/overview?period=month", get("/statistics/overview?period=month")),
+        Scenario("GET /statistics/trends?days=30", get("/statistics/trends?days=30")),
+        Scenario("GET /statistics/trends?days=365&rolling=30", get("/statistics/trends?days=365&rolling=30")),
+        Scenario("GET /statistics/trends?days=365&granularity=month", get("/statistics/trends?days=365&granularity=month")),
+        Scenario("GET /admin/users-stats?limit=100", get("/admin/users-stats?limit=100"), admin=True),
+        Scenario("GET /admin/word-cloud-data?mode=terms", get("/admin/word-cloud-data?mode=terms"), admin=True),
+        Scenario("GET /admin/word-cloud-data", get("/admin/word-cloud-data"), admin=True),
+        Scenario("POST /entries/today", submit, write=True),
+        Scenario("POST /entries/bulk", bulk, write=True),
+    ]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    users: List[BenchUser],
+    requests: int,
+    concurrency: int,
+    warmup: int
+) -> Result:
+    """Send `requests` calls (after `warmup` unmeasured ones) from `concurrency` workers."""
+    result = Result()
+    next_index = iter(range(warmup + requests))
+
+    async def call(i: int, measure: bool) -> None:
+        user = users[i % len(users)]
+        method, path, kwargs = scenario.build(i, user)
+        headers = {"Authorization": f"Bearer {user.token}"}
+        if scenario.admin:
+            headers = {"X-Admin-Password": settings.admin_password}
+
+        counter = [0]
+        token = _query_count.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, API_PREFIX + path, headers=headers, **kwargs)
+            status_code = response.status_code
+        except Exception:
+            status_code = 0
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _query_count.reset(token)
+
+        if not measure:
+            return
+        result.latencies_ms.append(elapsed_ms)
+        result.queries.append(counter[0])
+        result.statuses[status_code] = result.statuses.get(status_code, 0) + 1
+        if not 200 <= status_code < 400:
+            result.errors += 1
+
+    # Warm-up requests (connections, caches) are sent sequentially and not measured
+    for _ in range(warmup):
+        await call(next(next_index), measure=False)
+
+    async def worker() -> None:
+        for i in next_index:
+            await call(i, measure=True)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+def summarize(result: Result) -> Dict[str, Any]:
+    """Latency percentiles, throughput and query counts for one scenario."""
+    latencies = sorted(result.latencies_ms)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": result.errors,
+        "statuses": {str(code): n for code, n in sorted(result.statuses.items())},
+        "throughput_rps": round(count / result.wall_seconds, 1) if result.wall_seconds else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / count, 2) if count else 0.0,
+            "max": round(latencies[-1], 2) if count else 0.0,
+        },
+        "queries_per_request": {
+            "mean": round(sum(result.queries) / count, 2) if count else 0.0,
+            "max": max(result.queries) if count else 0,
+        },
+    }
+
+
+def print_table(endpoints: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'endpoint':<52} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'errors':>7}")
+    for name, stats in endpoints.items():
+        latency = stats["latency_ms"]
+        print(
+            f"{name:<52} {stats['throughput_rps']:>8.1f} {latency['p50']:>8.2f} {latency['p95']:>8.2f} "
+            f"{latency['p99']:>8.2f} {stats['queries_per_request']['mean']:>8.2f} {stats['errors']:>7}"
+        )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """
+    Print per-endpoint changes against a baseline run.
+
+    Returns:
+        True if any endpoint's p95 latency or query count regressed by more than threshold percent
+    """
+    regressed = False
+    print(f"\nCompared with {baseline['meta'].get('timestamp')} ({baseline['meta'].get('git_commit')}):")
+    print(f"{'endpoint':<52} {'p95 base':>9} {'p95 now':>9} {'change':>8} {'queries':>10}")
+    for name, stats in current["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base is None:
+            print(f"{name:<52} {'(new)':>9}")
+            continue
+        before, after = base["latency_ms"]["p95"], stats["latency_ms"]["p95"]
+        change = (after - before) / before * 100 if before else 0.0
+        queries_before = base["queries_per_request"]["mean"]
+        queries_after = stats["queries_per_request"]["mean"]
+        flag = ""
+        if change > threshold or queries_after > queries_before * (1 + threshold / 100):
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{name:<52} {before:>9.2f} {after:>9.2f} {change:>+7.1f}% "
+            f"{queries_before:>4.1f}->{queries_after:<4.1f}{flag}"
+        )
+    return regressed
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings.auth_verification_mode = args.auth
+    user_cache.enabled = not args.no_user_cache
+    stats_cache.enabled = not args.no_stats_cache
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+
+    fake = FakeSupabase(latency_ms=args.auth_latency_ms)
+    run_id = uuid.uuid4().hex[:8]
+    print(f"Seeding {args.users} users x {args.entries} entries (run {run_id})...")
+    seed_start = time.perf_counter()
+    users = await seed(fake, args.users, args.entries, run_id)
+    print(f"Seeded in {time.perf_counter() - seed_start:.1f}s\n")
+
+    scenarios = build_scenarios(args.users, args.entries, args.requests + args.warmup, args.bulk_size)
+    if args.endpoints:
+        scenarios = [s for s in scenarios if any(pattern in s.name for pattern in args.endpoints)]
+    if args.skip_writes:
+        scenarios = [s for s in scenarios if not s.write]
+
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    try:
+        async with app.router.lifespan_context(app):
+            await fake.install(auth_service)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                for scenario in scenarios:
+                    result = await run_scenario(
+                        client, scenario, users, args.requests, args.concurrency, args.warmup
+                    )
+                    endpoints[scenario.name] = summarize(result)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _count_query)
+        if not args.keep:
+            await cleanup(users)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "users": args.users,
+            "entries_per_user": args.entries,
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "auth_verification_mode": args.auth,
+            "auth_latency_ms": args.auth_latency_ms,
+            "user_cache": user_cache.enabled,
+            "stats_cache": stats_cache.enabled,
+            "db_pool_strategy": settings.db_pool_strategy,
+            "fake_supabase_calls": fake.calls,
+        },
+        "endpoints": endpoints,
+    }
+
+    print_table(endpoints)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Users to seed")
+    parser.add_argument("--entries", type=int, default=365, help="Entries per seeded user")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint before timing")
+    parser.add_argument("--bulk-size", type=int, default=30, help="Entries per POST /entries/bulk request")
+    parser.add_argument("--auth", choices=["remote", "local"], default="local",
+                        help="Token verification mode (fake Supabase call per token, or local JWKS check)")
+    parser.add_argument("--auth-latency-ms", type=float, default=0.0, help="Simulated Supabase round trip")
+    parser.add_argument("--no-user-cache", action="store_true", help="Disable the authenticated user cache")
+    parser.add_argument("--no-stats-cache", action="store_true", help="Disable the statistics response cache")
+    parser.add_argument("--endpoints", nargs="+", help="Only run scenarios whose name contains one of these")
+    parser.add_argument("--skip-writes", action="store_true", help="Only run read endpoints")
+    parser.add_argument("--keep", action="store_true", help="Keep seeded users and entries")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="Regression threshold in percent for --compare (exit code 1)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
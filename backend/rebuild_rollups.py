@@ -0,0 +1,54 @@
+"""
+Script to backfill or verify the per-user rollup tables.
+Rebuilds user_rollups and user_monthly_rollups from daily_entries.
+
+Usage:
+    python rebuild_rollups.py            # rebuild all users
+    python rebuild_rollups.py --user ID  # rebuild one user (users.id)
+    python rebuild_rollups.py --check    # report mismatches without changing anything
+"""
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+from app.database import AsyncSessionLocal
+from app.services.rollup_service import rollup_service
+
+
+async def rebuild(user_id=None):
+    """Recompute rollups in a single transaction."""
+    async with AsyncSessionLocal() as db:
+        await rollup_service.rebuild(db, user_id)
+        await db.commit()
+    print("✅ Rollups rebuilt" + (f" for user {user_id}" if user_id else " for all users"))
+
+
+async def check() -> int:
+    """Print rollup rows that don't match daily_entries. Returns the mismatch count."""
+    async with AsyncSessionLocal() as db:
+        problems = await rollup_service.find_inconsistencies(db)
+
+    if not problems:
+        print("✅ Rollups are consistent with daily_entries")
+        return 0
+
+    print(f"❌ {len(problems)} inconsistent rollup rows:")
+    for problem in problems:
+        scope = problem["month"].isoformat() if problem["month"] else "all-time"
+        print(
+            f"  user={problem['user_id']} {scope}: "
+            f"count {problem['stored_count']} (expected {problem['expected_count']}), "
+            f"hours {problem['stored_hours']} (expected {problem['expected_hours']})"
+        )
+    return len(problems)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill or verify rollup tables")
+    parser.add_argument("--user", type=UUID, help="Rebuild only this user (users.id)")
+    parser.add_argument("--check", action="store_true", help="Only report inconsistencies")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if asyncio.run(check()) else 0)
+    asyncio.run(rebuild(args.user))
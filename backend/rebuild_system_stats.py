@@ -0,0 +1,20 @@
+"""
+Script to backfill the admin dashboard's system-wide stats.
+Rebuilds system_daily_stats, signup_cohorts and cohort_retention from
+daily_entries and users; afterwards the periodic refresh keeps them current.
+"""
+import asyncio
+from app.database import AsyncSessionLocal
+from app.services.system_stats_service import system_stats_service
+
+
+async def rebuild():
+    """Recompute the system stats tables in a single transaction."""
+    async with AsyncSessionLocal() as db:
+        days = await system_stats_service.rebuild(db)
+        await db.commit()
+    print(f"✅ System stats rebuilt ({days} days)")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
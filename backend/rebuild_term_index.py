@@ -0,0 +1,19 @@
+"""
+Script to backfill the note term index used by the admin word cloud.
+Rebuilds note_terms and note_term_daily from all entry notes.
+"""
+import asyncio
+from app.database import AsyncSessionLocal
+from app.services.term_index_service import term_index_service
+
+
+async def rebuild():
+    """Recompute the term index in a single transaction."""
+    async with AsyncSessionLocal() as db:
+        await term_index_service.rebuild(db)
+        await db.commit()
+    print("✅ Note term index rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
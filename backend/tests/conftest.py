@@ -0,0 +1,133 @@
+"""
+Shared fixtures for API tests.
+
+Tests run the app in-process against the PostgreSQL database in DATABASE_URL
+(use a dedicated test database: tables are created if missing and
+background_jobs is emptied after each test). Supabase is not called: token
+validation is replaced so that the bearer token is the user's
+supabase_user_id. Tests are skipped when the settings can't be loaded or no
+database is reachable.
+"""
+import asyncio
+import random
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+@pytest.fixture(scope="session")
+def app_settings():
+    """The app's settings, or skip tests that need them when they can't be loaded."""
+    try:
+        from app.config import settings
+    except Exception as e:  # Missing settings (.env)
+        pytest.skip(f"App settings not available: {e}")
+    return settings
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The app's engine, or skip the test session when the database is unavailable."""
+    try:
+        from app.database import engine, Base
+        import app.models  # noqa: F401 - register all tables
+    except Exception as e:  # Missing settings (.env) or driver
+        pytest.skip(f"App settings not available: {e}")
+
+    async def prepare():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # Pooled connections belong to this event loop; tests run on their own loops
+        await engine.dispose()
+
+    try:
+        asyncio.run(prepare())
+    except Exception as e:
+        pytest.skip(f"Database not available: {e}")
+    return engine
+
+
+@pytest_asyncio.fixture
+async def api(database, monkeypatch):
+    """
+    HTTP client for the app plus a factory for users with seeded entries.
+
+    Caches are disabled so each request shows its full (worst-case) query count.
+    """
+    from app.main import app
+    from app.config import settings
+    from app.database import AsyncSessionLocal
+    from app.models import User, DailyEntry, BackgroundJob
+    from sqlalchemy import delete, insert
+    from app.services.auth_service import auth_service
+    from app.services.rollup_service import rollup_service
+    from app.services.stats_cache import stats_cache
+    from app.services.term_index_service import term_index_service
+    from app.services.user_cache import user_cache
+
+    async def verify_token(token: str):
+        return {"id": token, "email": None, "role": "authenticated", "aud": "authenticated"}
+
+    monkeypatch.setattr(auth_service, "verify_token", verify_token)
+    monkeypatch.setattr(user_cache, "enabled", False)
+    monkeypatch.setattr(stats_cache, "enabled", False)
+
+    created: List[uuid.UUID] = []
+
+    async def make_user(entries: int = 0) -> SimpleNamespace:
+        """Create a user with `entries` consecutive past entries (today left free)."""
+        rng = random.Random(entries)
+        supabase_user_id = uuid.uuid4()
+        async with AsyncSessionLocal() as db:
+            user = User(supabase_user_id=supabase_user_id, email=f"test-{supabase_user_id.hex}@example.com")
+            db.add(user)
+            await db.flush()
+            rows: List[Dict[str, Any]] = [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user.id,
+                    "entry_date": date.today() - timedelta(days=day),
+                    "casual_leisure_hours": 1.0,
+                    "casual_leisure_note": rng.choice(["reading", "tv", "ספר", None]),
+                    "serious_leisure_hours": 0.5,
+                    "serious_leisure_note": rng.choice(["running", "guitar", None]),
+                    "project_leisure_hours": 0.5,
+                    "project_leisure_note": None,
+                }
+                for day in range(1, entries + 1)
+            ]
+            if rows:
+                await db.execute(insert(DailyEntry), rows)
+                await rollup_service.apply_entries(db, user.id, [SimpleNamespace(**row) for row in rows])
+                await term_index_service.apply_entries(db, [SimpleNamespace(**row) for row in rows])
+            await db.commit()
+            created.append(user.id)
+            return SimpleNamespace(
+                id=user.id,
+                supabase_user_id=supabase_user_id,
+                headers={"Authorization": f"Bearer {supabase_user_id}"},
+            )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield SimpleNamespace(
+            client=client,
+            engine=database,
+            make_user=make_user,
+            created_users=created,
+            admin_headers={"X-Admin-Password": settings.admin_password},
+        )
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(BackgroundJob))
+        for user_id in created:
+            await term_index_service.remove_user(db, user_id)
+            await db.execute(delete(DailyEntry).where(DailyEntry.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+    await database.dispose()
@@ -0,0 +1,73 @@
+"""
+Query budget helpers for tests.
+Capture the SQL statements issued while a block runs (e.g. one request
+through the ASGI app) and fail when more than a budgeted number are sent,
+so N+1 patterns show up as test failures instead of slow endpoints.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCapture:
+    """Statements executed while capture_queries() was active, in order."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def __str__(self) -> str:
+        return "\n".join(
+            f"{number}. {' '.join(statement.split())}"
+            for number, statement in enumerate(self.statements, start=1)
+        )
+
+
+@contextmanager
+def capture_queries(engine: AsyncEngine) -> Iterator[QueryCapture]:
+    """
+    Record every statement sent to the database through engine.
+
+    Each cursor execution counts once; an executemany (including batched
+    insertmanyvalues) counts once per round trip.
+
+    Args:
+        engine: Async engine to listen on
+
+    Yields:
+        QueryCapture filled in as statements run
+    """
+    capture = QueryCapture()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        capture.statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield capture
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(engine: AsyncEngine, limit: int) -> Iterator[QueryCapture]:
+    """
+    Fail if the block issues more than limit statements.
+
+    Args:
+        engine: Async engine to listen on
+        limit: Maximum number of statements allowed
+
+    Raises:
+        AssertionError: With the captured statements listed, when over budget
+    """
+    with capture_queries(engine) as capture:
+        yield capture
+    if len(capture) > limit:
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {len(capture)}:\n{capture}"
+        )
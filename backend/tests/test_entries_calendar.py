@@ -0,0 +1,81 @@
+"""
+GET /entries/calendar: presence bitmap and per-day totals for one year.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.utils.bitmap import decode_float32, decode_presence
+from tests.query_budget import assert_max_queries
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_calendar_marks_entry_days(api):
+    user = await api.make_user(entries=30)
+    year = date.today().year
+    first_day = date(year, 1, 1)
+    expected = sorted(
+        (day - first_day).days
+        for day in (date.today() - timedelta(days=n) for n in range(1, 31))
+        if day.year == year
+    )
+
+    response = await api.client.get(f"/entries/calendar?year={year}&totals=true", headers=user.headers)
+    assert response.status_code == 200
+    calendar = response.json()
+
+    assert calendar["days"] == (date(year + 1, 1, 1) - first_day).days
+    assert calendar["entry_count"] == len(expected)
+    assert decode_presence(calendar["presence"], calendar["days"]) == expected
+    assert len(calendar["presence"]) <= 64  # 46 bytes of bitmap
+
+    totals = decode_float32(calendar["totals"])
+    assert len(totals) == calendar["days"]
+    assert [offset for offset, hours in enumerate(totals) if hours] == expected
+    assert all(totals[offset] == 2.0 for offset in expected)
+
+
+async def test_calendar_without_totals_and_empty_year(api):
+    user = await api.make_user(entries=5)
+
+    calendar = (await api.client.get("/entries/calendar?year=2001", headers=user.headers)).json()
+    assert calendar == {
+        "year": 2001,
+        "days": 365,
+        "entry_count": 0,
+        "presence": calendar["presence"],
+        "totals": None,
+    }
+    assert decode_presence(calendar["presence"], 365) == []
+
+
+async def test_calendar_cached_until_next_write(api, monkeypatch):
+    from app.services.stats_cache import stats_cache
+
+    monkeypatch.setattr(stats_cache, "enabled", True)
+    user = await api.make_user(entries=3)
+
+    first = await api.client.get("/entries/calendar", headers=user.headers)
+    # Cached: only the user and data_version lookups run
+    with assert_max_queries(api.engine, 2):
+        cached = await api.client.get("/entries/calendar", headers=user.headers)
+    assert cached.json() == first.json()
+
+    # Conditional request with the current ETag
+    not_modified = await api.client.get(
+        "/entries/calendar", headers={**user.headers, "If-None-Match": first.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+
+    body = {
+        "casual_leisure_hours": 1.0,
+        "serious_leisure_hours": 0.0,
+        "project_leisure_hours": 0.0,
+    }
+    assert (await api.client.post("/entries/today", json=body, headers=user.headers)).status_code == 201
+
+    updated = (await api.client.get("/entries/calendar", headers=user.headers)).json()
+    assert updated["entry_count"] == first.json()["entry_count"] + 1
+    today_offset = (date.today() - date(date.today().year, 1, 1)).days
+    assert today_offset in decode_presence(updated["presence"], updated["days"])
@@ -0,0 +1,67 @@
+"""
+Entry submission: one INSERT ... ON CONFLICT DO NOTHING RETURNING decides
+duplicates, so repeated and concurrent submissions for a date give 409.
+"""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_submit_returns_entry_and_updates_user(api):
+    user = await api.make_user(entries=3)
+
+    response = await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert response.status_code == 201
+    entry = response.json()
+    assert entry["entry_date"] == date.today().isoformat()
+    assert entry["total_hours"] == 3.0
+    assert entry["created_at"]
+
+    me = (await api.client.get("/auth/me", headers=user.headers)).json()
+    assert me["last_entry_date"].startswith(date.today().isoformat())
+
+    overview = (await api.client.get("/statistics/overview", headers=user.headers)).json()
+    assert overview["total_entries"] == 4
+
+
+async def test_retroactive_submit_keeps_last_entry_date(api):
+    user = await api.make_user()
+    past = date.today() - timedelta(days=30)
+
+    response = await api.client.post("/entries/today", json=entry_payload(past), headers=user.headers)
+    assert response.status_code == 201
+
+    me = (await api.client.get("/auth/me", headers=user.headers)).json()
+    assert me["last_entry_date"] is None
+
+
+async def test_duplicate_submit_conflicts_without_side_effects(api):
+    user = await api.make_user()
+    first = await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    etag = (await api.client.get("/entries/today", headers=user.headers)).headers["etag"]
+
+    response = await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert response.status_code == 409
+
+    # Data version untouched and the stored entry is the first one
+    today = await api.client.get("/entries/today", headers=user.headers)
+    assert today.headers["etag"] == etag
+    assert today.json()["id"] == first.json()["id"]
+
+
+async def test_concurrent_submits_one_wins(api):
+    user = await api.make_user()
+
+    responses = await asyncio.gather(*(
+        api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+        for _ in range(5)
+    ))
+
+    assert sorted(r.status_code for r in responses) == [201, 409, 409, 409, 409]
+    overview = (await api.client.get("/statistics/overview", headers=user.headers)).json()
+    assert overview["total_entries"] == 1
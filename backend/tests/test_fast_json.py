@@ -0,0 +1,52 @@
+"""
+The fast JSON path (FAST_JSON_ENABLED) must return the same documents and
+headers as the standard path, without extra queries.
+"""
+import pytest
+
+from tests.query_budget import capture_queries
+
+pytestmark = pytest.mark.asyncio
+
+
+async def fetch(api, monkeypatch, fast, url, headers):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "fast_json_enabled", fast)
+    with capture_queries(api.engine) as capture:
+        response = await api.client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return response, len(capture)
+
+
+@pytest.mark.parametrize("url", [
+    "/entries/history?page_size=100",
+    "/entries/history?period=month&include_total=false",
+    "/statistics/trends?days=90",
+    "/statistics/trends?days=365&rolling=7",
+    "/statistics/trends?days=365&granularity=month",
+])
+async def test_user_endpoints_match(api, monkeypatch, url):
+    pytest.importorskip("orjson")
+    user = await api.make_user(entries=120)
+
+    standard, standard_queries = await fetch(api, monkeypatch, False, url, user.headers)
+    fast, fast_queries = await fetch(api, monkeypatch, True, url, user.headers)
+
+    assert fast.json() == standard.json()
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.headers["etag"] == standard.headers["etag"]
+    assert fast_queries == standard_queries
+
+
+async def test_users_stats_match(api, monkeypatch):
+    pytest.importorskip("orjson")
+    for _ in range(3):
+        await api.make_user(entries=2)
+    url = "/admin/users-stats?limit=2"
+
+    standard, _ = await fetch(api, monkeypatch, False, url, api.admin_headers)
+    fast, _ = await fetch(api, monkeypatch, True, url, api.admin_headers)
+
+    assert fast.json() == standard.json()
+    assert fast.headers["x-next-cursor"] == standard.headers["x-next-cursor"]
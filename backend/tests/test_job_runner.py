@@ -0,0 +1,206 @@
+"""
+Background job runner: durable enqueueing, retries with backoff, periodic
+deduplication, lease recovery and the admin queue endpoints. Each test uses
+its own runner and queue; run_next stands in for the workers except in
+the last test.
+"""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def runner():
+    from app.services.job_runner import JobRunner
+
+    runner = JobRunner()
+    runner.queue = f"test-{uuid.uuid4().hex[:8]}"
+    runner.calls = []
+    return runner
+
+
+async def enqueue(runner, name, **kwargs):
+    from app.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        job_id = await runner.enqueue(db, name, **kwargs)
+        await db.commit()
+    return job_id
+
+
+async def load(job_id):
+    from app.database import AsyncSessionLocal
+    from app.models import BackgroundJob
+
+    async with AsyncSessionLocal() as db:
+        return await db.get(BackgroundJob, job_id)
+
+
+async def test_job_runs_with_payload(api, runner):
+    async def record(**payload):
+        runner.calls.append(payload)
+
+    runner.register("record", record, queue=runner.queue)
+    job_id = await enqueue(runner, "record", payload={"value": 3})
+
+    assert await runner.run_next(runner.queue) is True
+    assert await runner.run_next(runner.queue) is False
+    assert runner.calls == [{"value": 3}]
+
+    job = await load(job_id)
+    assert job.status == "done"
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+async def test_failed_job_retries_with_backoff_then_fails(api, runner, monkeypatch):
+    from app.config import settings
+    from app.database import AsyncSessionLocal
+    from app.models import BackgroundJob
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(settings, "job_retry_base_seconds", 60.0)
+    runner.register("broken", broken, queue=runner.queue, max_attempts=2)
+    job_id = await enqueue(runner, "broken")
+
+    assert await runner.run_next(runner.queue) is True
+    job = await load(job_id)
+    assert (job.status, job.attempts, job.error) == ("queued", 1, "boom")
+    assert (job.run_at - job.started_at).total_seconds() >= 59
+
+    # Not due until the backoff has passed
+    assert await runner.run_next(runner.queue) is False
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(BackgroundJob).where(BackgroundJob.id == job_id).values(run_at=job.started_at))
+        await db.commit()
+
+    assert await runner.run_next(runner.queue) is True
+    job = await load(job_id)
+    assert (job.status, job.attempts) == ("failed", 2)
+
+
+async def test_dedupe_key_allows_one_active_job(api, runner):
+    async def noop():
+        pass
+
+    runner.register("noop", noop, queue=runner.queue)
+    first = await enqueue(runner, "noop", dedupe_key=f"{runner.queue}:key")
+    assert first is not None
+    assert await enqueue(runner, "noop", dedupe_key=f"{runner.queue}:key") is None
+
+    await runner.run_next(runner.queue)
+    assert await enqueue(runner, "noop", dedupe_key=f"{runner.queue}:key") is not None
+
+
+async def test_periodic_job_enqueued_once_per_interval(api, runner):
+    from app.database import AsyncSessionLocal
+    from app.models import BackgroundJob
+    from app.services.job_runner import JobRunner
+
+    async def noop():
+        pass
+
+    runner.register("tick", noop, queue=runner.queue)
+    runner.every("tick", 3600)
+    # A second process with the same schedule
+    other = JobRunner()
+    other.register("tick", noop, queue=runner.queue)
+    other.every("tick", 3600)
+
+    assert await runner.enqueue_periodic() == 1
+    assert await runner.enqueue_periodic() == 0
+    await runner.run_next(runner.queue)
+    assert await other.enqueue_periodic() == 0
+
+    async with AsyncSessionLocal() as db:
+        jobs = (await db.execute(select(BackgroundJob).where(BackgroundJob.queue == runner.queue))).scalars().all()
+    assert len(jobs) == 1
+
+
+async def test_expired_lease_is_requeued(api, runner, monkeypatch):
+    from app.config import settings
+    from app.database import AsyncSessionLocal
+    from app.models import BackgroundJob
+
+    async def noop():
+        pass
+
+    runner.register("lost", noop, queue=runner.queue)
+    job_id = await enqueue(runner, "lost")
+    # Claimed by a worker that then died
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .values(status="running", attempts=1, started_at=BackgroundJob.created_at)
+        )
+        await db.commit()
+
+    monkeypatch.setattr(settings, "job_lease_seconds", 0)
+    assert await runner.recover_expired() >= 1
+    assert (await load(job_id)).status == "queued"
+    assert await runner.run_next(runner.queue) is True
+    assert (await load(job_id)).status == "done"
+
+
+async def test_reset_enqueues_purge_job(api):
+    from app.services.job_runner import job_runner
+
+    user = await api.make_user(entries=3)
+    await api.client.delete("/statistics/reset", headers=user.headers)
+
+    jobs = (await api.client.get("/admin/jobs?queue=maintenance&status=queued", headers=api.admin_headers)).json()
+    assert [job["name"] for job in jobs] == ["reset_purge"]
+
+    assert await job_runner.run_next("maintenance") is True
+    reset_jobs = (await api.client.get("/admin/jobs?status=done", headers=api.admin_headers)).json()
+    assert reset_jobs[0]["name"] == "reset_purge"
+
+
+async def test_queue_stats(api, runner):
+    async def noop():
+        pass
+
+    # The admin endpoint reports from the table, so jobs of any runner show up
+    runner.register("noop", noop, queue=runner.queue)
+    await enqueue(runner, "noop")
+    await enqueue(runner, "noop")
+    await runner.run_next(runner.queue)
+
+    response = await api.client.get("/admin/jobs/queues", headers=api.admin_headers)
+    assert response.status_code == 200
+    stats = response.json()["queues"][runner.queue]
+    assert stats["queued"] == 1
+    assert stats["due"] == 1
+    assert stats["done_last_hour"] == 1
+    assert stats["run_p50_ms"] is not None
+    assert "maintenance" in response.json()["queues"]
+    assert "reset_purge" in response.json()["local"]["jobs"]
+
+
+async def test_started_workers_pick_up_committed_jobs(api, runner, monkeypatch):
+    from app.config import settings
+
+    done = asyncio.Event()
+
+    async def signal():
+        done.set()
+
+    # Long poll interval: only the wake-up on commit can get the job run in time
+    monkeypatch.setattr(settings, "job_queues", f"{runner.queue}:1")
+    monkeypatch.setattr(settings, "job_poll_interval_seconds", 30.0)
+    runner.register("signal", signal, queue=runner.queue)
+    runner.start()
+    try:
+        await asyncio.sleep(0.2)  # Let the worker reach its idle wait
+        job_id = await enqueue(runner, "signal")
+        await asyncio.wait_for(done.wait(), timeout=5)
+    finally:
+        await runner.stop()
+    assert (await load(job_id)).status in ("running", "done")
@@ -0,0 +1,207 @@
+"""
+Query budgets for every router in app/api/.
+
+Budgets are the worst case with the user and statistics caches disabled and
+include the per-request user lookup (and the data_version read behind ETags).
+A budget that starts failing usually means a query moved into a loop; raise
+it only when an extra round trip is intended.
+"""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from tests.query_budget import assert_max_queries, capture_queries
+
+pytestmark = pytest.mark.asyncio
+
+
+def entry_payload(entry_date=None):
+    payload = {
+        "casual_leisure_hours": 1.5,
+        "casual_leisure_note": "reading",
+        "serious_leisure_hours": 1.0,
+        "serious_leisure_note": "guitar practice",
+        "project_leisure_hours": 0.5,
+        "project_leisure_note": None,
+    }
+    if entry_date is not None:
+        payload["entry_date"] = entry_date.isoformat()
+    return payload
+
+
+async def count_queries(api, method, url, **kwargs):
+    """Issue one request and return the number of statements it ran."""
+    with capture_queries(api.engine) as capture:
+        response = await api.client.request(method, url, **kwargs)
+    assert response.status_code < 500, response.text
+    return len(capture)
+
+
+# --- Auth ---
+
+async def test_auth_me(api):
+    user = await api.make_user()
+    with assert_max_queries(api.engine, 1):
+        response = await api.client.get("/auth/me", headers=user.headers)
+    assert response.status_code == 200
+
+
+async def test_auth_verify_otp(api, monkeypatch):
+    from app.services.auth_service import auth_service
+
+    supabase_user_id = uuid.uuid4()
+
+    async def verify_otp(email, otp):
+        return {"access_token": "token", "user": {"id": str(supabase_user_id), "email": email}}
+
+    monkeypatch.setattr(auth_service, "verify_otp", verify_otp)
+    body = {"email": f"otp-{supabase_user_id.hex}@example.com", "otp": "123456"}
+
+    # New user: lookup, insert, refresh
+    with assert_max_queries(api.engine, 3):
+        response = await api.client.post("/auth/verify-otp", json=body)
+    assert response.status_code == 200
+    api.created_users.append(uuid.UUID(response.json()["user"]["id"]))
+
+    # Returning user: lookup only
+    with assert_max_queries(api.engine, 1):
+        response = await api.client.post("/auth/verify-otp", json=body)
+    assert response.status_code == 200
+
+
+# --- Entries ---
+
+@pytest.mark.parametrize("url, budget", [
+    ("/entries/can-submit", 3),
+    ("/entries/today", 3),
+    ("/entries/history", 4),
+    ("/entries/history?period=week", 4),
+    ("/entries/history?include_total=false", 3),
+    ("/entries/export", 3),
+    ("/entries/export?format=csv", 3),
+    ("/entries/calendar", 3),
+    ("/entries/calendar?totals=true", 3),
+])
+async def test_entries_reads(api, url, budget):
+    user = await api.make_user(entries=40)
+    with assert_max_queries(api.engine, budget):
+        response = await api.client.get(url, headers=user.headers)
+    assert response.status_code in (200, 404)
+
+
+async def test_history_independent_of_page_size(api):
+    user = await api.make_user(entries=150)
+    small = await count_queries(api, "GET", "/entries/history?page_size=1", headers=user.headers)
+    large = await count_queries(api, "GET", "/entries/history?page_size=100", headers=user.headers)
+    assert small == large
+
+    response = await api.client.get("/entries/history?page_size=100&include_total=false", headers=user.headers)
+    cursor = response.json()["next_cursor"]
+    with assert_max_queries(api.engine, 3):
+        response = await api.client.get(
+            f"/entries/history?page_size=100&include_total=false&cursor={cursor}", headers=user.headers
+        )
+    assert response.status_code == 200
+
+
+async def test_export_independent_of_entry_count(api):
+    few = await api.make_user(entries=5)
+    many = await api.make_user(entries=400)
+    assert (
+        await count_queries(api, "GET", "/entries/export", headers=few.headers)
+        == await count_queries(api, "GET", "/entries/export", headers=many.headers)
+    )
+
+
+async def test_submit_today(api):
+    user = await api.make_user(entries=10)
+    # User lookup, INSERT ... RETURNING with the users UPDATE, rollups (2), term index (2)
+    with assert_max_queries(api.engine, 6):
+        response = await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert response.status_code == 201
+
+    # A duplicate is detected by the INSERT itself (plus a check for a reset-hidden entry on that date)
+    with assert_max_queries(api.engine, 3):
+        response = await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert response.status_code == 409
+
+
+@pytest.mark.parametrize("items", [1, 28, 500])
+async def test_bulk_independent_of_batch_size(api, items):
+    user = await api.make_user()
+    body = {"entries": [entry_payload(date.today() - timedelta(days=day)) for day in range(1, items + 1)]}
+    with assert_max_queries(api.engine, 8):
+        response = await api.client.post("/entries/bulk", json=body, headers=user.headers)
+    assert response.status_code == 200
+    assert response.json()["accepted"] == items
+
+
+# --- Statistics ---
+
+@pytest.mark.parametrize("url, budget", [
+    ("/statistics/overview", 3),
+    ("/statistics/overview?period=month", 3),
+    ("/statistics/trends", 3),
+    ("/statistics/trends?days=365&granularity=week", 3),
+    ("/statistics/trends?days=365&rolling=30", 3),
+])
+async def test_statistics_reads(api, url, budget):
+    user = await api.make_user(entries=60)
+    with assert_max_queries(api.engine, budget):
+        response = await api.client.get(url, headers=user.headers)
+    assert response.status_code == 200
+
+
+async def test_trends_independent_of_entry_count(api):
+    few = await api.make_user(entries=3)
+    many = await api.make_user(entries=365)
+    url = "/statistics/trends?days=365&rolling=7"
+    assert (
+        await count_queries(api, "GET", url, headers=few.headers)
+        == await count_queries(api, "GET", url, headers=many.headers)
+    )
+
+
+async def test_statistics_reset(api):
+    user = await api.make_user(entries=30)
+    # Entries are hidden by one UPDATE and deleted later by a background job;
+    # their notes leave the term index at once (one SELECT, two executemany
+    # UPDATEs and two DELETEs, independent of the entry count) and their
+    # dates are marked for the system stats refresh (one INSERT ... SELECT)
+    with assert_max_queries(api.engine, 13):
+        response = await api.client.delete("/statistics/reset", headers=user.headers)
+    assert response.status_code == 202
+
+
+# --- Admin ---
+
+@pytest.mark.parametrize("url, budget", [
+    ("/admin/users-stats", 1),
+    ("/admin/users-stats?limit=10", 1),
+    ("/admin/users-stats?limit=10&sort=total_hours", 1),
+    ("/admin/word-cloud-data", 1),
+    ("/admin/word-cloud-data?mode=terms", 3),
+    ("/admin/pool-stats", 0),
+    ("/admin/cache-stats", 0),
+    ("/admin/jobs/queues", 1),
+    ("/admin/jobs?status=failed", 1),
+    ("/admin/daily-stats", 1),
+    ("/admin/daily-stats?start_date=2025-01-01&end_date=2026-12-31", 1),
+    ("/admin/cohorts", 2),
+    ("/admin/cohorts?weeks=104", 2),
+])
+async def test_admin_reads(api, url, budget):
+    await api.make_user(entries=5)
+    with assert_max_queries(api.engine, budget):
+        response = await api.client.get(url, headers=api.admin_headers)
+    assert response.status_code == 200
+
+
+async def test_users_stats_independent_of_user_count(api):
+    await api.make_user(entries=2)
+    before = await count_queries(api, "GET", "/admin/users-stats", headers=api.admin_headers)
+    for _ in range(5):
+        await api.make_user(entries=3)
+    after = await count_queries(api, "GET", "/admin/users-stats", headers=api.admin_headers)
+    assert after == before
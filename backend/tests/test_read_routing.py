@@ -0,0 +1,139 @@
+"""
+Read replica routing: without a replica every read uses the primary; with
+one, per-user reads use it only after it has replayed the user's last write
+and only while it is within the lag limit, and can-submit stays on the
+primary. A second engine on the test database stands in for the replica
+(it is not in recovery, so it always counts as caught up at check time).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from tests.query_budget import capture_queries
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def replica(api, monkeypatch):
+    """The global read router with a replica engine and fresh counters."""
+    from app.config import settings
+    from app.database import read_router
+
+    replica_engine = create_async_engine(settings.async_database_url, poolclass=NullPool)
+    monkeypatch.setattr(read_router, "replica_engine", replica_engine)
+    monkeypatch.setattr(
+        read_router, "replica_sessions", async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    monkeypatch.setattr(read_router, "decisions", {})
+    monkeypatch.setattr(read_router, "replayed_until", None)
+    yield replica_engine
+    await replica_engine.dispose()
+
+
+async def backdate_last_write(user_id, minutes=5):
+    """Make the user's last write older than the replica position."""
+    from app.database import AsyncSessionLocal
+    from app.models import User
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User).where(User.id == user_id).values(updated_at=User.updated_at - timedelta(minutes=minutes))
+        )
+        await db.commit()
+
+
+async def test_reads_use_primary_without_replica(api, monkeypatch):
+    from app.database import read_router
+
+    monkeypatch.setattr(read_router, "decisions", {})
+    user = await api.make_user(entries=3)
+    assert (await api.client.get("/statistics/overview", headers=user.headers)).status_code == 200
+    assert (await api.client.get("/admin/daily-stats", headers=api.admin_headers)).status_code == 200
+
+    stats = (await api.client.get("/admin/pool-stats", headers=api.admin_headers)).json()["replica"]
+    assert stats["configured"] is False
+    assert stats["decisions"] == {"primary:no_replica": 2}
+
+
+async def test_replica_serves_reads_after_replaying_last_write(api, replica):
+    from app.database import read_router
+
+    user = await api.make_user(entries=5)
+    await backdate_last_write(user.id)
+    await read_router.check()
+    assert read_router.lag_seconds() is not None
+
+    with capture_queries(replica) as replica_queries:
+        response = await api.client.get("/entries/history?page_size=3", headers=user.headers)
+    assert response.status_code == 200
+    assert len(response.json()["entries"]) == 3
+    assert any("daily_entries" in statement for statement in replica_queries.statements)
+    assert read_router.decisions == {("replica", "fresh"): 1}
+
+    # Admin reads have no user write to wait for
+    with capture_queries(replica) as replica_queries:
+        assert (await api.client.get("/admin/cohorts?weeks=2", headers=api.admin_headers)).status_code == 200
+    assert len(replica_queries) == 2
+
+    # Job status must not lag behind the purge it reports on
+    with capture_queries(replica) as replica_queries:
+        assert (await api.client.get("/admin/jobs/queues", headers=api.admin_headers)).status_code == 200
+        assert (await api.client.get("/admin/jobs", headers=api.admin_headers)).status_code == 200
+    assert len(replica_queries) == 0
+
+
+async def test_reads_after_a_write_stay_on_primary(api, replica):
+    from app.database import read_router
+
+    user = await api.make_user(entries=2)
+    await backdate_last_write(user.id)
+    await read_router.check()
+
+    assert (await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)).status_code == 201
+    with capture_queries(replica) as replica_queries:
+        can_submit = await api.client.get("/entries/can-submit", headers=user.headers)
+        history = await api.client.get("/entries/history", headers=user.headers)
+        export = await api.client.get("/entries/export", headers=user.headers)
+    assert can_submit.json()["can_submit"] is False
+    assert history.json()["total"] == 3
+    assert len(export.text.splitlines()) == 3
+    assert len(replica_queries) == 0
+    assert read_router.decisions == {("primary", "recent_write"): 2}
+
+    # Once the replica position passes the write, reads move over
+    await backdate_last_write(user.id)
+    with capture_queries(replica) as replica_queries:
+        assert (await api.client.get("/statistics/trends?days=7", headers=user.headers)).status_code == 200
+    assert len(replica_queries) >= 1
+
+
+async def test_lagging_or_unreachable_replica_falls_back(api, replica, monkeypatch):
+    from app.config import settings
+    from app.database import read_router
+
+    user = await api.make_user(entries=1)
+    await backdate_last_write(user.id, minutes=120)
+
+    monkeypatch.setattr(read_router, "replayed_until", datetime.now(timezone.utc) - timedelta(minutes=60))
+    monkeypatch.setattr(settings, "db_replica_max_lag_seconds", 30.0)
+    assert (await api.client.get("/entries/calendar", headers=user.headers)).status_code == 200
+
+    unreachable = create_async_engine(
+        "postgresql+asyncpg://postgres@127.0.0.1:1/none", poolclass=NullPool, connect_args={"timeout": 2}
+    )
+    monkeypatch.setattr(read_router, "replica_engine", unreachable)
+    await read_router.check()
+    assert read_router.last_error is not None
+    assert (await api.client.get("/admin/users-stats", headers=api.admin_headers)).status_code == 200
+    await unreachable.dispose()
+
+    assert read_router.decisions == {("primary", "replica_lagging"): 1, ("primary", "replica_unavailable"): 1}
+    stats = (await api.client.get("/admin/pool-stats", headers=api.admin_headers)).json()["replica"]
+    assert stats["lag_seconds"] is None
+    assert stats["decisions"] == {"primary:replica_lagging": 1, "primary:replica_unavailable": 1}
@@ -0,0 +1,136 @@
+"""
+Data reset: entries disappear as soon as DELETE /statistics/reset returns,
+and the purger deletes the hidden rows in batches while the job reports
+progress. The purger isn't started in tests; they run its batches directly.
+"""
+import random
+import string
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+async def stored_entries(user_id) -> int:
+    """Rows in daily_entries for the user, hidden ones included."""
+    from app.database import AsyncSessionLocal
+    from app.models import DailyEntry
+
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).where(DailyEntry.user_id == user_id))
+
+
+async def term_count(term: str) -> int:
+    from app.database import AsyncSessionLocal
+    from app.models import NoteTerm
+
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.coalesce(func.sum(NoteTerm.count), 0)).where(NoteTerm.term == term)) or 0
+
+
+async def test_reset_hides_entries_immediately(api):
+    user = await api.make_user(entries=30)
+
+    response = await api.client.delete("/statistics/reset", headers=user.headers)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "pending"
+    assert job["total_entries"] == 30
+    assert job["progress"] == 0.0
+    assert response.headers["location"].endswith(f"/statistics/reset/{job['id']}")
+
+    overview = (await api.client.get("/statistics/overview", headers=user.headers)).json()
+    assert overview["total_entries"] == 0
+    history = (await api.client.get("/entries/history", headers=user.headers)).json()
+    assert history["entries"] == []
+    calendar = (await api.client.get("/entries/calendar", headers=user.headers)).json()
+    assert calendar["entry_count"] == 0
+
+    # Still stored until the purger runs
+    assert await stored_entries(user.id) == 30
+
+
+async def test_purge_in_batches_with_progress(api):
+    from app.services.reset_service import reset_service
+
+    user = await api.make_user(entries=25)
+    job_id = (await api.client.delete("/statistics/reset", headers=user.headers)).json()["id"]
+
+    assert await reset_service.purge_pending(batch_size=10) >= 3
+    assert await stored_entries(user.id) == 0
+
+    job = (await api.client.get(f"/statistics/reset/{job_id}", headers=user.headers)).json()
+    assert job["status"] == "done"
+    assert job["deleted_entries"] == 25
+    assert job["progress"] == 1.0
+    assert job["finished_at"]
+
+
+async def test_reset_is_idempotent_while_purging(api):
+    user = await api.make_user(entries=5)
+
+    first = (await api.client.delete("/statistics/reset", headers=user.headers)).json()
+    second = (await api.client.delete("/statistics/reset", headers=user.headers)).json()
+    assert second["id"] == first["id"]
+
+
+async def test_job_of_another_user_is_not_found(api):
+    owner = await api.make_user(entries=2)
+    other = await api.make_user()
+    job_id = (await api.client.delete("/statistics/reset", headers=owner.headers)).json()["id"]
+
+    response = await api.client.get(f"/statistics/reset/{job_id}", headers=other.headers)
+    assert response.status_code == 404
+
+
+async def test_resubmit_dates_before_purge(api):
+    user = await api.make_user(entries=3)
+    yesterday = date.today() - timedelta(days=1)
+    await api.client.delete("/statistics/reset", headers=user.headers)
+
+    response = await api.client.post("/entries/today", json=entry_payload(yesterday), headers=user.headers)
+    assert response.status_code == 201
+
+    body = {"entries": [entry_payload(date.today() - timedelta(days=day)) for day in (2, 3, 4)]}
+    response = await api.client.post("/entries/bulk", json=body, headers=user.headers)
+    assert response.json()["accepted"] == 3
+
+    overview = (await api.client.get("/statistics/overview", headers=user.headers)).json()
+    assert overview["total_entries"] == 4
+
+    # The purge leaves the new entries alone
+    from app.services.reset_service import reset_service
+
+    await reset_service.purge_pending()
+    assert await stored_entries(user.id) == 4
+
+
+async def test_reset_removes_notes_from_term_index(api):
+    from app.database import AsyncSessionLocal
+    from app.services.reset_service import reset_service
+    from app.services.term_index_service import term_index_service
+
+    term = "".join(random.choices(string.ascii_lowercase, k=12))
+    user = await api.make_user()
+    payload = entry_payload(date.today() - timedelta(days=1))
+    payload["project_leisure_note"] = term
+    await api.client.post("/entries/today", json=payload, headers=user.headers)
+    assert await term_count(term) == 1
+
+    # Hidden notes leave the index with the reset, like they leave the text-mode word cloud
+    await api.client.delete("/statistics/reset", headers=user.headers)
+    assert await term_count(term) == 0
+    text_mode = await api.client.get("/admin/word-cloud-data", headers=api.admin_headers)
+    assert term not in text_mode.text
+
+    # A rebuild before the purge agrees, and the purge doesn't subtract again
+    async with AsyncSessionLocal() as db:
+        await term_index_service.rebuild(db)
+        await db.commit()
+    assert await term_count(term) == 0
+    await reset_service.purge_pending()
+    assert await term_count(term) == 0
@@ -0,0 +1,74 @@
+"""
+Trends: the series is dense (one bucket per day/week/month from the start
+of the range to today, zeros where nothing was entered) and rolling
+averages look back before the range start.
+"""
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+ENTRY_HOURS = 3.0  # Total hours of entry_payload()
+DAYS_AGO = (3, 8, 9, 10)
+
+
+@pytest_asyncio.fixture
+async def user(api):
+    user = await api.make_user()
+    body = {"entries": [entry_payload(date.today() - timedelta(days=days)) for days in DAYS_AGO]}
+    assert (await api.client.post("/entries/bulk", json=body, headers=user.headers)).status_code == 200
+    return user
+
+
+async def trends(api, user, query):
+    response = await api.client.get(f"/statistics/trends?{query}", headers=user.headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_daily_series_is_dense(api, user):
+    today = date.today()
+    body = await trends(api, user, "days=14")
+
+    expected_dates = [today - timedelta(days=days) for days in range(14, -1, -1)]
+    assert body["dates"] == [day.isoformat() for day in expected_dates]
+    expected_totals = [ENTRY_HOURS if (today - day).days in DAYS_AGO else 0.0 for day in expected_dates]
+    assert body["total_hours"] == expected_totals
+    assert body["entry_counts"] == [1 if total else 0 for total in expected_totals]
+    assert body["rolling"] is None
+
+
+@pytest.mark.parametrize("granularity", ["week", "month"])
+async def test_bucket_count_per_granularity(api, user, granularity):
+    today = date.today()
+    start = today - timedelta(days=60)
+    if granularity == "week":
+        first = start - timedelta(days=start.weekday())
+        buckets = (today - timedelta(days=today.weekday()) - first).days // 7 + 1
+    else:
+        first = start.replace(day=1)
+        buckets = (today.year - first.year) * 12 + today.month - first.month + 1
+
+    body = await trends(api, user, f"days=60&granularity={granularity}")
+    assert len(body["dates"]) == buckets
+    assert body["dates"][0] == first.isoformat()
+    assert sum(body["entry_counts"]) == len(DAYS_AGO)
+    assert sum(body["total_hours"]) == pytest.approx(ENTRY_HOURS * len(DAYS_AGO))
+    assert body["total_hours"][0] == 0.0  # The entries are all in the last 10 days
+
+
+async def test_rolling_average_uses_days_before_range(api, user):
+    body = await trends(api, user, "days=7&rolling=7")
+
+    assert len(body["dates"]) == 8
+    assert body["dates"][0] == (date.today() - timedelta(days=7)).isoformat()
+    # Nothing on the first day itself; its window (days 13..7 ago) holds the entries 8-10 days ago
+    assert body["total_hours"][0] == 0.0
+    assert body["rolling"]["window"] == 7
+    assert body["rolling"]["total_hours"][0] == round(3 * ENTRY_HOURS / 7, 2)
+    # Today's window (days 6..0 ago) only holds the entry 3 days ago
+    assert body["rolling"]["total_hours"][-1] == round(ENTRY_HOURS / 7, 2)
@@ -0,0 +1,89 @@
+"""
+Statistics response cache on the shared key-value backend, with
+LocalKeyValueStore standing in for the external store: entries round-trip,
+a changed ETag misses, and invalidation removes exactly one user's entries,
+both directly and through the API after a submit.
+"""
+import uuid
+
+import pytest
+
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def shared_cache(app_settings):
+    from app.schemas.statistics import CategoryStats
+    from app.services.stats_cache import StatisticsCache
+    from app.utils.cache import KeyValueBackend, LocalKeyValueStore
+
+    store = LocalKeyValueStore()
+    cache = StatisticsCache(KeyValueBackend(store, ttl=60, prefix="test:"))
+    response = CategoryStats(total_hours=3.0, average_hours=1.5, entry_count=2)
+    return cache, store, response
+
+
+async def test_round_trip(shared_cache):
+    from app.schemas.statistics import CategoryStats
+
+    cache, _, response = shared_cache
+    user_id = uuid.uuid4()
+    await cache.set(user_id, "overview", 'W/"v1"', {"period": None}, response)
+
+    assert await cache.get(user_id, "overview", 'W/"v1"', {"period": None}, CategoryStats) == response
+    assert await cache.get_raw(user_id, "overview", 'W/"v1"', {"period": None}) == response.model_dump_json()
+    assert await cache.get(user_id, "overview", 'W/"v1"', {"period": "week"}, CategoryStats) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+async def test_stale_etag_misses(shared_cache):
+    from app.schemas.statistics import CategoryStats
+
+    cache, _, response = shared_cache
+    user_id = uuid.uuid4()
+    await cache.set(user_id, "trends", 'W/"v1"', {"days": 30}, response)
+
+    assert await cache.get(user_id, "trends", 'W/"v2"', {"days": 30}, CategoryStats) is None
+
+
+async def test_invalidate_user_drops_only_that_user(shared_cache):
+    from app.schemas.statistics import CategoryStats
+
+    cache, store, response = shared_cache
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    for owner in (user_id, other_id):
+        await cache.set(owner, "overview", 'W/"v1"', {"period": None}, response)
+        await cache.set(owner, "trends", 'W/"v1"', {"days": 30}, response)
+    assert len(store) == 6  # Four entries plus one tag index per user
+
+    await cache.invalidate_user(user_id)
+
+    assert len(store) == 3
+    assert await cache.get(user_id, "overview", 'W/"v1"', {"period": None}, CategoryStats) is None
+    assert await cache.get(user_id, "trends", 'W/"v1"', {"days": 30}, CategoryStats) is None
+    assert await cache.get(other_id, "overview", 'W/"v1"', {"period": None}, CategoryStats) == response
+    assert await cache.get(other_id, "trends", 'W/"v1"', {"days": 30}, CategoryStats) == response
+
+
+async def test_submit_invalidates_shared_entries(api, monkeypatch):
+    from app.services.stats_cache import stats_cache
+    from app.utils.cache import KeyValueBackend, LocalKeyValueStore
+
+    store = LocalKeyValueStore()
+    monkeypatch.setattr(stats_cache, "backend", stats_cache.backend)  # Restored after the test
+    monkeypatch.setattr(stats_cache, "enabled", True)
+    stats_cache.use_backend(KeyValueBackend(store, ttl=60))
+
+    user, other = await api.make_user(entries=3), await api.make_user(entries=2)
+    hits = stats_cache.hits
+    for owner in (user, other):
+        assert (await api.client.get("/statistics/overview", headers=owner.headers)).status_code == 200
+    assert (await api.client.get("/statistics/overview", headers=user.headers)).json()["total_entries"] == 3
+    assert stats_cache.hits == hits + 1
+    assert len(store) == 4
+
+    await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert len(store) == 2  # Only the other user's entry and index are left
+    assert (await api.client.get("/statistics/overview", headers=user.headers)).json()["total_entries"] == 4
@@ -0,0 +1,180 @@
+"""
+System daily stats and cohort retention: after entry writes, resets and
+purges, an incremental refresh must leave the tables equal to aggregating
+daily_entries and users from scratch. The tests share one database, so each
+starts from a rebuild and compares whole tables against the expected values.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+async def run(method):
+    from app.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        await method(db)
+        await db.commit()
+
+
+@pytest_asyncio.fixture
+async def stats(api):
+    from app.services.system_stats_service import system_stats_service
+
+    await run(system_stats_service.rebuild)
+    return system_stats_service
+
+
+async def expected_tables():
+    """Daily stats and retention cells computed directly from live entries and users."""
+    from app.database import AsyncSessionLocal
+    from app.models import DailyEntry, User
+    from app.services.live_entries import all_live_entries
+    from app.services.system_stats_service import week_start
+
+    async with AsyncSessionLocal() as db:
+        entries = (await db.execute(
+            select(
+                DailyEntry.user_id, DailyEntry.entry_date, DailyEntry.casual_leisure_hours,
+                DailyEntry.serious_leisure_hours, DailyEntry.project_leisure_hours
+            ).where(all_live_entries())
+        )).all()
+        signups = {row.id: row.created_at for row in (await db.execute(select(User.id, User.created_at))).all()}
+
+    daily = defaultdict(lambda: [set(), 0, 0.0, 0.0, 0.0, 0])
+    active = defaultdict(set)
+    for entry in entries:
+        day = daily[entry.entry_date]
+        day[0].add(entry.user_id)
+        day[1] += 1
+        day[2] += entry.casual_leisure_hours
+        day[3] += entry.serious_leisure_hours
+        day[4] += entry.project_leisure_hours
+        cohort = week_start(signups[entry.user_id].date())
+        offset = (week_start(entry.entry_date) - cohort).days // 7
+        if offset >= 0:
+            active[(cohort, offset)].add(entry.user_id)
+    for created_at in signups.values():
+        daily[created_at.date()][5] += 1
+
+    cohorts = defaultdict(int)
+    for created_at in signups.values():
+        cohorts[week_start(created_at.date())] += 1
+
+    return (
+        {day: (len(v[0]), v[1], round(v[2], 6), round(v[3], 6), round(v[4], 6), v[5]) for day, v in daily.items()},
+        dict(cohorts),
+        {cell: len(users) for cell, users in active.items()},
+    )
+
+
+async def stored_tables():
+    from app.database import AsyncSessionLocal
+    from app.models import SystemDailyStats, SignupCohort, CohortRetention
+
+    async with AsyncSessionLocal() as db:
+        daily = (await db.execute(select(SystemDailyStats))).scalars().all()
+        cohorts = (await db.execute(select(SignupCohort))).scalars().all()
+        cells = (await db.execute(select(CohortRetention))).scalars().all()
+    return (
+        {
+            row.day: (row.active_users, row.entry_count, round(row.casual_total, 6), round(row.serious_total, 6),
+                      round(row.project_total, 6), row.new_users)
+            for row in daily
+            if row.entry_count or row.new_users
+        },
+        {row.cohort_week: row.users for row in cohorts if row.users},
+        {(row.cohort_week, row.week_offset): row.active_users for row in cells if row.active_users},
+    )
+
+
+async def test_rebuild_matches_entries(api, stats):
+    await api.make_user(entries=20)
+    await run(stats.rebuild)
+    assert await stored_tables() == await expected_tables()
+
+
+async def test_refresh_after_writes(api, stats):
+    user = await api.make_user(entries=10)
+    await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    body = {"entries": [entry_payload(date.today() - timedelta(days=day)) for day in (40, 41, 90)]}
+    await api.client.post("/entries/bulk", json=body, headers=user.headers)
+    # make_user bypasses the API, so its days are marked here
+    await run(lambda db: stats.mark_days(db, (date.today() - timedelta(days=day) for day in range(1, 11))))
+
+    await run(stats.refresh)
+    assert await stored_tables() == await expected_tables()
+
+
+async def test_refresh_after_reset_and_purge(api, stats):
+    from app.services.reset_service import reset_service
+
+    user = await api.make_user()
+    body = {"entries": [entry_payload(date.today() - timedelta(days=day)) for day in range(1, 15)]}
+    await api.client.post("/entries/bulk", json=body, headers=user.headers)
+    await run(stats.refresh)
+
+    await api.client.delete("/statistics/reset", headers=user.headers)
+    # Hidden entries drop out before the purge deletes them
+    await run(stats.refresh)
+    assert await stored_tables() == await expected_tables()
+
+    await reset_service.purge_pending()
+    await run(stats.refresh)
+    assert await stored_tables() == await expected_tables()
+
+
+async def test_retention_of_older_cohort(api, stats):
+    from app.database import AsyncSessionLocal
+    from app.models import User
+
+    user = await api.make_user()
+    # Signed up three weeks ago, active in the signup week and the current week
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(User).where(User.id == user.id).values(created_at=User.created_at - timedelta(weeks=3)))
+        await db.commit()
+    await run(stats.rebuild)
+    signup = date.today() - timedelta(weeks=3)
+    for day in (signup, date.today()):
+        await api.client.post("/entries/today", json=entry_payload(day), headers=user.headers)
+
+    await run(stats.refresh)
+    assert await stored_tables() == await expected_tables()
+
+    response = await api.client.get("/admin/cohorts?weeks=5", headers=api.admin_headers)
+    assert response.status_code == 200
+    cohorts = {cohort["cohort_week"]: cohort for cohort in response.json()}
+    from app.services.system_stats_service import week_start
+
+    cohort = cohorts[week_start(signup).isoformat()]
+    assert len(cohort["active_users"]) == 4
+    assert cohort["active_users"][0] >= 1 and cohort["active_users"][3] >= 1
+    assert cohort["retention"][0] == round(cohort["active_users"][0] / cohort["users"], 4)
+
+
+async def test_daily_stats_endpoint(api, stats):
+    user = await api.make_user()
+    await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    await run(stats.refresh)
+
+    response = await api.client.get("/admin/daily-stats", headers=api.admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["days"]) == 30
+    assert body["end_date"] == date.today().isoformat()
+    today = body["days"][-1]
+    assert today["entry_count"] >= 1
+    assert today["new_users"] >= 1
+    assert today["total_hours"] == round(today["casual_total"] + today["serious_total"] + today["project_total"], 2)
+
+    response = await api.client.get(
+        "/admin/daily-stats?start_date=2026-02-01&end_date=2026-01-01", headers=api.admin_headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,93 @@
+"""
+Local token verification: HS256 tokens are checked in-process and expired,
+wrong-audience or badly signed tokens get 401 without calling Supabase;
+asymmetric keys come from a cached JWKS that is refetched when a token
+names an unknown key id (rotation).
+"""
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+pytestmark = pytest.mark.asyncio
+
+SECRET = "test-jwt-secret-with-enough-bytes-for-hs256"
+
+
+def make_token(sub, key=SECRET, algorithm="HS256", expires_in=3600, audience="authenticated", kid=None):
+    claims = {"sub": str(sub), "aud": audience, "exp": int(time.time()) + expires_in, "role": "authenticated"}
+    return jwt.encode(claims, key, algorithm=algorithm, headers={"kid": kid} if kid else None)
+
+
+@pytest.fixture
+def local_auth(api, monkeypatch):
+    """The real verify_token in local mode with a JWT secret and no remote fallback."""
+    from app.config import settings
+    from app.services.auth_service import auth_service
+
+    async def no_remote_calls(access_token):
+        raise AssertionError("Supabase must not be called")
+
+    monkeypatch.delattr(auth_service, "verify_token")  # Undo the api fixture's stub
+    monkeypatch.setattr(settings, "auth_verification_mode", "local")
+    monkeypatch.setattr(settings, "auth_remote_fallback", False)
+    monkeypatch.setattr(auth_service.token_verifier, "jwt_secret", SECRET)
+    monkeypatch.setattr(auth_service, "get_user_from_token", no_remote_calls)
+    return api
+
+
+async def test_valid_hs256_token(local_auth):
+    user = await local_auth.make_user()
+    token = make_token(user.supabase_user_id)
+
+    response = await local_auth.client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["id"] == str(user.id)
+
+
+@pytest.mark.parametrize("token_kwargs", [
+    {"expires_in": -60},
+    {"audience": "anon"},
+    {"key": "another-secret-with-enough-bytes-for-hs256"},
+], ids=["expired", "wrong-audience", "bad-signature"])
+async def test_invalid_tokens_are_rejected(local_auth, token_kwargs):
+    user = await local_auth.make_user()
+    token = make_token(user.supabase_user_id, **token_kwargs)
+
+    response = await local_auth.client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid or expired token"
+
+
+async def test_unknown_kid_refreshes_jwks(app_settings):
+    from app.services.token_verifier import SupabaseTokenVerifier, TokenNotVerifiable, MIN_FORCED_REFRESH_SECONDS
+
+    old_key, new_key = ec.generate_private_key(ec.SECP256R1()), ec.generate_private_key(ec.SECP256R1())
+
+    def jwk(private_key, kid):
+        return {**jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True), "kid": kid, "alg": "ES256"}
+
+    published = [jwk(old_key, "old")]
+    fetches = []
+
+    async def fetch_jwks():
+        fetches.append(time.monotonic())
+        return {"keys": list(published)}
+
+    verifier = SupabaseTokenVerifier(fetch_jwks=fetch_jwks)
+    claims = await verifier.verify(make_token("user-1", key=old_key, algorithm="ES256", kid="old"))
+    assert claims["id"] == "user-1"
+    assert len(fetches) == 1
+
+    # Keys rotate; the cached JWKS is fresh, but old enough to allow a forced refresh
+    published.append(jwk(new_key, "new"))
+    verifier._fetched_at -= MIN_FORCED_REFRESH_SECONDS + 1
+    claims = await verifier.verify(make_token("user-2", key=new_key, algorithm="ES256", kid="new"))
+    assert claims["id"] == "user-2"
+    assert len(fetches) == 2
+
+    # Forced refreshes are rate limited: another unknown kid right away is not refetched
+    with pytest.raises(TokenNotVerifiable):
+        await verifier.verify(make_token("user-3", key=new_key, algorithm="ES256", kid="unknown"))
+    assert len(fetches) == 2
@@ -0,0 +1,54 @@
+"""
+Authenticated user cache: repeated requests with the same token are served
+from the cache, and submitting today's entry or resetting evicts the user so
+the next request sees the new last_entry_date instead of the snapshot.
+"""
+from datetime import date
+
+import pytest
+
+from tests.test_query_budgets import entry_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def cached_users(api, monkeypatch):
+    from app.services.user_cache import user_cache
+
+    monkeypatch.setattr(user_cache, "enabled", True)
+    return user_cache
+
+
+async def me(api, user):
+    response = await api.client.get("/auth/me", headers=user.headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_submit_today_evicts_cached_user(api, cached_users):
+    user = await api.make_user()
+    assert (await me(api, user))["last_entry_date"] is None
+    hits = cached_users.stats()["hits"]
+    assert (await me(api, user))["last_entry_date"] is None
+    assert cached_users.stats()["hits"] == hits + 1
+
+    response = await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert response.status_code == 201
+    assert (await me(api, user))["last_entry_date"][:10] == date.today().isoformat()
+
+    can_submit = await api.client.get("/entries/can-submit", headers=user.headers)
+    assert can_submit.json()["can_submit"] is False
+
+
+async def test_reset_evicts_cached_user(api, cached_users):
+    user = await api.make_user(entries=2)
+    await api.client.post("/entries/today", json=entry_payload(), headers=user.headers)
+    assert (await me(api, user))["last_entry_date"][:10] == date.today().isoformat()
+
+    response = await api.client.delete("/statistics/reset", headers=user.headers)
+    assert response.status_code == 202
+    assert (await me(api, user))["last_entry_date"] is None
+
+    can_submit = await api.client.get("/entries/can-submit", headers=user.headers)
+    assert can_submit.json()["can_submit"] is True